@@ -0,0 +1,24 @@
+"""Writes files so that concurrent readers never see partial files"""
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Generator
+
+
+@contextmanager
+def atomic_write(path: str) -> Generator[BinaryIO, None, None]:
+    """
+    Open a temporary file next to the given path for binary writing, and replace the file at the path with it once
+    the block completes. If the block raises, the temporary file is deleted and the file at the path is unchanged.
+    Raises OSError if the temporary file cannot be created, e.g., in a read-only directory.
+    """
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
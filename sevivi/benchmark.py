@@ -0,0 +1,425 @@
+"""
+Measures the render throughput of sevivi on synthetic inputs.
+
+Generates a video with a camera IMU recording and a sensor recording of configurable length, resolution,
+sampling rate and graph count, renders them and reports the frames per second, the time spent in each
+render stage and the one-time setup cost. Run ``python -m sevivi.benchmark --help`` for all options.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Callable, Generator, Tuple
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from sevivi.config import (
+    Config,
+    RenderConfig,
+    CameraImuVideoConfig,
+    ImuSynchronizedSensorConfig,
+    StackingDirection,
+    PlottingMethod,
+    VideoWriterBackend,
+)
+from sevivi.log import logger
+from sevivi.video_renderer import VideoRenderer
+from sevivi.video_renderer.instantiation_helpers import (
+    instantiate_video_provider,
+    instantiate_graph_providers,
+)
+from sevivi.video_renderer.video_writer import VideoWriter
+
+logger = logger.getChild("benchmark")
+
+SENSOR_LEAD_SECONDS = 2.0
+"""The synthetic sensor recording starts this many seconds before the video and ends as much after it"""
+
+
+@dataclass
+class BenchmarkConfig:
+    """Describes the synthetic inputs and the render settings of a benchmark run"""
+
+    duration_seconds: float = 20.0
+    """Length of the synthetic video"""
+    width: int = 1280
+    """Width of the synthetic video in pixels"""
+    height: int = 720
+    """Height of the synthetic video in pixels"""
+    fps: float = 30.0
+    """Frame rate of the synthetic video"""
+    sensor_rate: float = 100.0
+    """Sampling rate of the synthetic camera IMU and sensor recordings in Hz"""
+    graph_count: int = 6
+    """Number of sensor columns, each of which is shown in its own graph"""
+    stacking_direction: StackingDirection = StackingDirection.HORIZONTAL
+    """Should the plots be next to or below the input video?"""
+    plotting_method: PlottingMethod = PlottingMethod.MOVING_VERTICAL_LINE
+    """The plotting method to benchmark"""
+    video_writer_backend: VideoWriterBackend = VideoWriterBackend.OPENCV
+    """How the resulting video is encoded"""
+    pipeline_queue_size: int = 0
+    """If larger than 0, decoding and encoding run in separate threads, see RenderConfig.pipeline_queue_size"""
+    seed: int = 0
+    """Seed of the random sensor data"""
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of a benchmark run. All durations are in seconds."""
+
+    config: Dict
+    """The BenchmarkConfig of the run"""
+    frame_count: int = 0
+    """Number of rendered frames"""
+    render_seconds: float = 0.0
+    """Duration of VideoRenderer.render_video"""
+    frames_per_second: float = 0.0
+    """Rendered frames per second of render_seconds"""
+    load_seconds: float = 0.0
+    """Time spent reading the CSV files into the video and graph providers"""
+    setup_seconds: float = 0.0
+    """Time spent constructing the VideoRenderer"""
+    graph_provider_setup_seconds: float = 0.0
+    """Part of setup_seconds spent in VideoRenderer._prepare_graph_providers, i.e., synchronization and plotting"""
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    """
+    Time spent in the decode, plot, composite and encode stages of the render.
+    With pipeline_queue_size > 0 the stages run concurrently, so their sum may exceed render_seconds.
+    """
+
+
+class _TimedVideoWriter(VideoWriter):
+    """Measures the time spent encoding frames with another VideoWriter"""
+
+    def __init__(self, writer: VideoWriter, stage_seconds: Dict[str, float]):
+        self.__writer = writer
+        self.__stage_seconds = stage_seconds
+
+    def write(self, image: np.ndarray):
+        """Append a BGR image with the dimensions given on creation to the video"""
+        start = time.perf_counter()
+        self.__writer.write(image)
+        self.__stage_seconds["encode"] += time.perf_counter() - start
+
+    def release(self):
+        """Finish the video file. No images may be written afterwards."""
+        start = time.perf_counter()
+        self.__writer.release()
+        self.__stage_seconds["encode"] += time.perf_counter() - start
+
+
+class _TimedVideoRenderer(VideoRenderer):
+    """A VideoRenderer that measures the time spent in its setup and render stages"""
+
+    def __init__(self, *args, **kwargs):
+        self.graph_provider_setup_seconds = 0.0
+        self.stage_seconds = {
+            "decode": 0.0,
+            "plot": 0.0,
+            "composite": 0.0,
+            "encode": 0.0,
+        }
+        super().__init__(*args, **kwargs)
+        self.video_provider.images = self.__timed_images(self.video_provider.images)
+
+    def _prepare_graph_providers(self):
+        start = time.perf_counter()
+        super()._prepare_graph_providers()
+        self.graph_provider_setup_seconds = time.perf_counter() - start
+
+    def _render_plot_image(self, ts: pd.Timestamp) -> np.ndarray:
+        start = time.perf_counter()
+        plot_image = super()._render_plot_image(ts)
+        self.stage_seconds["plot"] += time.perf_counter() - start
+        return plot_image
+
+    def _compose_frame(
+        self, image: np.ndarray, ts: pd.Timestamp, src_image: np.ndarray
+    ):
+        start = time.perf_counter()
+        plot_seconds = self.stage_seconds["plot"]
+        super()._compose_frame(image, ts, src_image)
+        plot_seconds = self.stage_seconds["plot"] - plot_seconds
+        self.stage_seconds["composite"] += time.perf_counter() - start - plot_seconds
+
+    def _create_writer(self, path: str) -> VideoWriter:
+        return _TimedVideoWriter(super()._create_writer(path), self.stage_seconds)
+
+    def __timed_images(
+        self,
+        images: Callable[[], Generator[Tuple[pd.Timestamp, np.ndarray], None, None]],
+    ) -> Callable[[], Generator[Tuple[pd.Timestamp, np.ndarray], None, None]]:
+        """Wrap the images generator of the video provider to measure the time spent decoding"""
+
+        def timed_images():
+            generator = images()
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    return
+                finally:
+                    self.stage_seconds["decode"] += time.perf_counter() - start
+                yield item
+
+        return timed_images
+
+
+def _motion_signal(
+    rng: np.random.Generator, sample_count: int, sensor_rate: float
+) -> np.ndarray:
+    """Generate three axes of smooth random motion with occasional bursts, which can be synchronized"""
+    noise = rng.normal(size=(sample_count, 3))
+    kernel_size = max(1, int(sensor_rate / 5))
+    kernel = np.hanning(kernel_size + 2)[1:-1]
+    kernel /= kernel.sum()
+    smooth = np.stack(
+        [np.convolve(noise[:, i], kernel, mode="same") for i in range(3)], axis=1
+    )
+    bursts = rng.random(sample_count) < 2 / sensor_rate
+    envelope = np.convolve(bursts.astype(float), np.ones(int(sensor_rate)), "same")
+    return smooth * (1 + 5 * envelope[:, None])
+
+
+def generate_inputs(config: BenchmarkConfig, directory: str) -> Config:
+    """
+    Write a synthetic video, camera IMU recording and sensor recording into the directory.
+    Returns the sevivi Config to render them. The sensor recording starts SENSOR_LEAD_SECONDS before the video.
+    """
+    rng = np.random.default_rng(config.seed)
+
+    sensor_duration = config.duration_seconds + 2 * SENSOR_LEAD_SECONDS
+    sample_count = int(sensor_duration * config.sensor_rate)
+    sensor_seconds = np.arange(sample_count) / config.sensor_rate
+    motion = _motion_signal(rng, sample_count, config.sensor_rate)
+
+    # the camera IMU records the same motion in video time
+    in_video = (sensor_seconds >= SENSOR_LEAD_SECONDS) & (
+        sensor_seconds < SENSOR_LEAD_SECONDS + config.duration_seconds
+    )
+    camera_imu = pd.DataFrame(
+        motion[in_video],
+        index=pd.to_datetime(sensor_seconds[in_video] - SENSOR_LEAD_SECONDS, unit="s"),
+        columns=["ACCELERATION_X", "ACCELERATION_Y", "ACCELERATION_Z"],
+    )
+    camera_imu_path = os.path.join(directory, "camera_imu.csv")
+    camera_imu.to_csv(camera_imu_path)
+
+    # the acceleration columns are always needed for synchronization, but only graph_count columns are shown
+    signal_count = max(0, config.graph_count - 3)
+    columns = ["ACCELERATION_X", "ACCELERATION_Y", "ACCELERATION_Z"]
+    columns += [f"SIGNAL_{i}" for i in range(signal_count)]
+    sensor_data = np.concatenate(
+        [motion, rng.normal(size=(sample_count, signal_count)).cumsum(axis=0)], axis=1
+    )
+    sensor = pd.DataFrame(
+        sensor_data,
+        index=pd.Timestamp("2021-10-21 09:00:00")
+        + pd.to_timedelta(sensor_seconds, unit="s"),
+        columns=columns,
+    )
+    sensor_path = os.path.join(directory, "sensor.csv")
+    sensor.to_csv(sensor_path)
+
+    video_path = os.path.join(directory, "video.avi")
+    _write_video(video_path, config)
+
+    render_config = RenderConfig(
+        stacking_direction=config.stacking_direction,
+        plotting_method=config.plotting_method,
+        target_file_path=os.path.join(directory, "sevivi.avi"),
+        video_writer_backend=config.video_writer_backend,
+        pipeline_queue_size=config.pipeline_queue_size,
+    )
+    return Config(
+        render_config=render_config,
+        video_config=CameraImuVideoConfig(path=video_path, imu_path=camera_imu_path),
+        sensor_configs={
+            "sensor": ImuSynchronizedSensorConfig(
+                path=sensor_path,
+                name="sensor",
+                sensor_sync_column_selection="ACCELERATION",
+                camera_imu_sync_column_selection="ACCELERATION",
+                graph_groups=columns[: config.graph_count],
+            )
+        },
+    )
+
+
+def _write_video(path: str, config: BenchmarkConfig):
+    """Write a video of a colored gradient that moves across the image"""
+    x = np.linspace(0, 255, config.width, dtype=np.float32)
+    y = np.linspace(0, 255, config.height, dtype=np.float32)
+    base = np.empty((config.height, 2 * config.width, 3), dtype=np.uint8)
+    base[:, : config.width, 0] = x[None, :]
+    base[:, : config.width, 1] = y[:, None]
+    base[:, : config.width, 2] = 128
+    base[:, config.width :] = base[:, config.width - 1 :: -1]
+
+    writer = cv2.VideoWriter(
+        path,
+        cv2.VideoWriter_fourcc(*"MJPG"),
+        config.fps,
+        (config.width, config.height),
+    )
+    for i in range(int(config.duration_seconds * config.fps)):
+        shift = (i * 8) % config.width
+        writer.write(base[:, shift : shift + config.width])
+    writer.release()
+
+
+def run_benchmark(
+    config: BenchmarkConfig, directory: Optional[str] = None
+) -> BenchmarkResult:
+    """
+    Generate the synthetic inputs, render them and measure the timings.
+
+    :param config: description of the inputs and render settings
+    :param directory: directory where the inputs and the rendered video are stored.
+                      If None, a temporary directory is used and deleted afterwards.
+    """
+    if directory is None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            return run_benchmark(config, tmp_dir)
+
+    sevivi_config = generate_inputs(config, directory)
+    result = BenchmarkResult(config=_to_json_dict(asdict(config)))
+
+    start = time.perf_counter()
+    video_provider = instantiate_video_provider(sevivi_config.video_config)
+    graph_providers = instantiate_graph_providers(
+        sevivi_config.sensor_configs, sevivi_config.render_config
+    )
+    result.load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    renderer = _TimedVideoRenderer(
+        sevivi_config.render_config, video_provider, graph_providers
+    )
+    result.setup_seconds = time.perf_counter() - start
+    result.graph_provider_setup_seconds = renderer.graph_provider_setup_seconds
+
+    start = time.perf_counter()
+    renderer.render_video()
+    result.render_seconds = time.perf_counter() - start
+
+    rendered = cv2.VideoCapture(sevivi_config.render_config.target_file_path)
+    result.frame_count = int(rendered.get(cv2.CAP_PROP_FRAME_COUNT))
+    rendered.release()
+    result.frames_per_second = result.frame_count / result.render_seconds
+    result.stage_seconds = dict(renderer.stage_seconds)
+    return result
+
+
+def _to_json_dict(values: Dict) -> Dict:
+    """Replace enums by their names so the dict can be serialized to JSON"""
+    return {k: getattr(v, "name", v) for k, v in values.items()}
+
+
+def format_result(result: BenchmarkResult) -> str:
+    """Format the timings of a benchmark run for humans"""
+    lines = [
+        f"{result.frame_count} frames in {result.render_seconds:.2f}s "
+        f"({result.frames_per_second:.1f} fps)",
+        f"load {result.load_seconds:.2f}s, setup {result.setup_seconds:.2f}s "
+        f"(graph providers {result.graph_provider_setup_seconds:.2f}s)",
+    ]
+    for stage, seconds in result.stage_seconds.items():
+        per_frame_ms = 1000 * seconds / max(1, result.frame_count)
+        lines.append(f"{stage:>10}: {seconds:.2f}s ({per_frame_ms:.2f}ms per frame)")
+    return "\n".join(lines)
+
+
+def parse_arguments(args: List[str]) -> Tuple[BenchmarkConfig, Optional[str], int]:
+    """Parse the benchmark configuration, the JSON output path and the repetition count from input args"""
+    defaults = BenchmarkConfig()
+    parser = ArgumentParser(
+        prog="python -m sevivi.benchmark",
+        description="Measure the render throughput of sevivi on synthetic inputs.",
+    )
+    parser.add_argument("--duration", type=float, default=defaults.duration_seconds)
+    parser.add_argument("--width", type=int, default=defaults.width)
+    parser.add_argument("--height", type=int, default=defaults.height)
+    parser.add_argument("--fps", type=float, default=defaults.fps)
+    parser.add_argument(
+        "--sensor-rate", dest="sensor_rate", type=float, default=defaults.sensor_rate
+    )
+    parser.add_argument(
+        "--graphs", dest="graph_count", type=int, default=defaults.graph_count
+    )
+    parser.add_argument(
+        "--stacking-direction",
+        dest="stacking_direction",
+        choices=[d.name.lower() for d in StackingDirection],
+        default=defaults.stacking_direction.name.lower(),
+    )
+    parser.add_argument(
+        "--plotting-method",
+        dest="plotting_method",
+        choices=[m.name.lower() for m in PlottingMethod],
+        default=defaults.plotting_method.name.lower(),
+    )
+    parser.add_argument(
+        "--video-writer",
+        dest="video_writer_backend",
+        choices=[b.name.lower() for b in VideoWriterBackend],
+        default=defaults.video_writer_backend.name.lower(),
+    )
+    parser.add_argument(
+        "--pipeline-queue-size",
+        dest="pipeline_queue_size",
+        type=int,
+        default=defaults.pipeline_queue_size,
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Number of benchmark runs."
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Write the results of all runs to this JSON file.",
+        required=False,
+    )
+    args = parser.parse_args(args)
+
+    config = BenchmarkConfig(
+        duration_seconds=args.duration,
+        width=args.width,
+        height=args.height,
+        fps=args.fps,
+        sensor_rate=args.sensor_rate,
+        graph_count=args.graph_count,
+        stacking_direction=StackingDirection[args.stacking_direction.upper()],
+        plotting_method=PlottingMethod[args.plotting_method.upper()],
+        video_writer_backend=VideoWriterBackend[args.video_writer_backend.upper()],
+        pipeline_queue_size=args.pipeline_queue_size,
+        seed=args.seed,
+    )
+    return config, args.output, args.repeat
+
+
+def run(args: List[str]):
+    config, output_path, repeat = parse_arguments(args)
+    results = []
+    for i in range(repeat):
+        logger.info(f"Benchmark run {i + 1}/{repeat}")
+        result = run_benchmark(config)
+        print(format_result(result))
+        results.append(asdict(result))
+
+    if output_path is not None:
+        with open(output_path, "w") as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Wrote results to {output_path}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:])
@@ -1,6 +1,14 @@
 from .config_types.plotting_method import PlottingMethod
+from .config_types.panel_type import PanelType
+from .config_types.derived_operation import DerivedOperation
+from .config_types.derived_channel_config import DerivedChannelConfig
 from .config_types.stacking_direction import StackingDirection
+from .config_types.video_writer_backend import VideoWriterBackend
+from .config_types.plot_backend import PlotBackend
+from .config_types.ffmpeg_config import FfmpegConfig
+from .config_types.skeleton_panel_config import SkeletonPanelConfig
 from .config_types.video_config import VideoConfig
+from .config_types.annotation_config import AnnotationConfig
 from .config_types.config import Config, RenderConfig
 from .column_matching import find_matching_columns, get_graph_groups
 
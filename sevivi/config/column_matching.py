@@ -4,9 +4,15 @@ import pandas as pd
 
 
 def get_graph_groups(
-    df: pd.DataFrame, patterns: Optional[List[str]]
+    df: pd.DataFrame, patterns: Optional[List[str]], single_group: bool = False
 ) -> Dict[str, List[str]]:
+    """
+    Map the title of each graph group to its columns. Each pattern selects a group, see find_matching_columns.
+    Without patterns, each column gets its own group, or all columns share a single group if single_group is True.
+    """
     if patterns is None:
+        if single_group:
+            return {"all columns": list(df.columns)}
         return {col: [col] for col in df.columns}
     else:
         return {pattern: find_matching_columns(df, pattern) for pattern in patterns}
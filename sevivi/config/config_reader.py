@@ -1,6 +1,6 @@
 import os
 from pprint import pformat
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List, Any
 
 import pandas as pd
 import toml
@@ -16,10 +16,18 @@ from sevivi.config import (
     OpenPoseVideoConfig,
     StackingDirection,
     PlottingMethod,
+    PanelType,
+    DerivedOperation,
+    DerivedChannelConfig,
+    VideoWriterBackend,
+    PlotBackend,
+    FfmpegConfig,
+    SkeletonPanelConfig,
     Config,
     VideoConfig,
     RenderConfig,
     VideoImuCaptureAppVideoConfig,
+    AnnotationConfig,
 )
 from sevivi.log import logger
 
@@ -60,9 +68,49 @@ def read_configs(config_file_paths: Tuple[str, ...]) -> Config:
         render_config.target_file_path = config_dict["target_file_path"]
     if "fourcc_codec" in config_dict:
         render_config.fourcc_codec = config_dict["fourcc_codec"]
+    if "video_writer" in config_dict:
+        render_config.video_writer_backend = get_video_writer_backend(config_dict)
+    if "ffmpeg" in config_dict:
+        render_config.ffmpeg_config = get_ffmpeg_config(config_dict)
+    if "target_fps" in config_dict:
+        render_config.target_fps = get_target_fps(config_dict)
+    if "time_ranges" in config_dict:
+        render_config.time_ranges = get_time_ranges(config_dict)
+    if "split_time_ranges" in config_dict:
+        render_config.split_time_ranges = bool(config_dict["split_time_ranges"])
+    if "preview" in config_dict:
+        render_config.preview = bool(config_dict["preview"])
+    if "preview_scale" in config_dict:
+        render_config.preview_scale = get_preview_scale(config_dict)
+    if "preview_frame_step" in config_dict:
+        render_config.preview_frame_step = get_preview_frame_step(config_dict)
+    if "process_count" in config_dict:
+        render_config.process_count = get_process_count(config_dict)
+    if "pipeline_queue_size" in config_dict:
+        render_config.pipeline_queue_size = get_pipeline_queue_size(config_dict)
 
     if "plotting_method" in config_dict:
         render_config.plotting_method = get_plotting_method(config_dict)
+    if "push_in_window_seconds" in config_dict:
+        render_config.push_in_window_seconds = get_push_in_window_seconds(config_dict)
+    if "scrolling_window_seconds" in config_dict:
+        render_config.scrolling_window_seconds = get_scrolling_window_seconds(
+            config_dict
+        )
+    if "spectrogram_window_seconds" in config_dict:
+        render_config.spectrogram_window_seconds = get_spectrogram_window_seconds(
+            config_dict
+        )
+    if "value_readout" in config_dict:
+        render_config.value_readout = bool(config_dict["value_readout"])
+    if "plot_backend" in config_dict:
+        render_config.plot_backend = get_plot_backend(config_dict)
+    if "background_cache_dir" in config_dict:
+        render_config.background_cache_dir = config_dict["background_cache_dir"]
+    if "background_cache_max_mb" in config_dict:
+        render_config.background_cache_max_mb = get_background_cache_max_mb(config_dict)
+    if "skeleton_panel" in config_dict:
+        render_config.skeleton_panel_config = get_skeleton_panel_config(config_dict)
     if "stacking_direction" in config_dict:
         render_config.stacking_direction = get_stacking_direction(config_dict)
 
@@ -85,6 +133,9 @@ def read_configs(config_file_paths: Tuple[str, ...]) -> Config:
             "You need to supply at least one sensor to render next to the video."
         )
 
+    if "annotation" in config_dict:
+        config.annotation_configs = get_annotation_configs(config_dict)
+
     return config
 
 
@@ -164,6 +215,14 @@ def get_sensor_configs(config_dict: Dict) -> Dict[str, SensorConfig]:
                 result.end_time = pd.to_datetime(cfg["end_time"])
             if "graph_groups" in cfg:
                 result.graph_groups = cfg["graph_groups"]
+            if "plotting_method" in cfg:
+                result.plotting_method = get_plotting_method(cfg)
+            if "panel_type" in cfg:
+                result.panel_type = get_panel_type(cfg)
+            if "derived" in cfg:
+                result.derived = get_derived_channels(cfg)
+            if "derived_cache" in cfg:
+                result.derived_cache = bool(cfg["derived_cache"])
 
             if "name" in cfg:
                 result.name = cfg["name"]
@@ -177,6 +236,18 @@ def get_sensor_configs(config_dict: Dict) -> Dict[str, SensorConfig]:
     return result_dict
 
 
+def get_annotation_configs(config_dict: Dict) -> List[AnnotationConfig]:
+    result = []
+    for i, cfg in enumerate(config_dict["annotation"]):
+        try:
+            result.append(AnnotationConfig(path=cfg["path"], name=cfg.get("name", "")))
+        except KeyError as e:
+            raise KeyError(
+                f"Missing key '{e.args[0]}' in annotation config {i}: {pformat(cfg)}"
+            )
+    return result
+
+
 def get_plotting_method(config_dict: Dict) -> PlottingMethod:
     config_plotting_method = config_dict.get("plotting_method", "N/A")
     try:
@@ -185,6 +256,91 @@ def get_plotting_method(config_dict: Dict) -> PlottingMethod:
         raise KeyError(f"Could not parse plotting_method {config_plotting_method}")
 
 
+def get_panel_type(config_dict: Dict) -> PanelType:
+    config_panel_type = config_dict.get("panel_type", "N/A")
+    try:
+        return PanelType[config_panel_type.upper()]
+    except KeyError:
+        raise KeyError(f"Could not parse panel_type {config_panel_type}")
+
+
+def get_derived_channels(config_dict: Dict) -> List[DerivedChannelConfig]:
+    result = []
+    for derived in config_dict.get("derived", []):
+        cfg = derived.copy()
+        operation = cfg.pop("operation", "N/A")
+        try:
+            cfg["operation"] = DerivedOperation[operation.upper()]
+        except (KeyError, AttributeError):
+            raise KeyError(f"Could not parse derived channel operation {operation}")
+        try:
+            channel = DerivedChannelConfig(**cfg)
+        except TypeError:
+            raise KeyError(
+                f"Missing or unknown keys in derived channel: {pformat(derived)}"
+            )
+
+        if channel.operation == DerivedOperation.LOWPASS:
+            if (
+                not isinstance(channel.cutoff_hz, (int, float))
+                or not channel.cutoff_hz > 0
+            ):
+                raise ValueError(
+                    f"cutoff_hz of derived channel {channel.name} must be a positive number, not {channel.cutoff_hz}"
+                )
+            if not isinstance(channel.order, int) or channel.order < 1:
+                raise ValueError(
+                    f"order of derived channel {channel.name} must be a positive integer, not {channel.order}"
+                )
+        if channel.operation == DerivedOperation.RMS:
+            if (
+                not isinstance(channel.window_seconds, (int, float))
+                or not channel.window_seconds > 0
+            ):
+                raise ValueError(
+                    f"window_seconds of derived channel {channel.name} must be a positive number, "
+                    f"not {channel.window_seconds}"
+                )
+        result.append(channel)
+    return result
+
+
+def get_push_in_window_seconds(config_dict: Dict) -> float:
+    window = config_dict.get("push_in_window_seconds", "N/A")
+    if not isinstance(window, (int, float)) or not window > 0:
+        raise ValueError(
+            f"push_in_window_seconds must be a positive number, not {window}"
+        )
+    return float(window)
+
+
+def get_scrolling_window_seconds(config_dict: Dict) -> float:
+    window = config_dict.get("scrolling_window_seconds", "N/A")
+    if not isinstance(window, (int, float)) or not window > 0:
+        raise ValueError(
+            f"scrolling_window_seconds must be a positive number, not {window}"
+        )
+    return float(window)
+
+
+def get_spectrogram_window_seconds(config_dict: Dict) -> float:
+    window = config_dict.get("spectrogram_window_seconds", "N/A")
+    if not isinstance(window, (int, float)) or not window > 0:
+        raise ValueError(
+            f"spectrogram_window_seconds must be a positive number, not {window}"
+        )
+    return float(window)
+
+
+def get_background_cache_max_mb(config_dict: Dict) -> float:
+    max_mb = config_dict.get("background_cache_max_mb", "N/A")
+    if not isinstance(max_mb, (int, float)) or not max_mb > 0:
+        raise ValueError(
+            f"background_cache_max_mb must be a positive number, not {max_mb}"
+        )
+    return float(max_mb)
+
+
 def get_stacking_direction(config_dict: Dict) -> StackingDirection:
     config_stacking_direction = config_dict.get("stacking_direction", "N/A")
     try:
@@ -193,3 +349,111 @@ def get_stacking_direction(config_dict: Dict) -> StackingDirection:
         raise KeyError(
             f"Could not parse stacking_direction {config_stacking_direction}"
         )
+
+
+def get_process_count(config_dict: Dict) -> int:
+    process_count = config_dict.get("process_count", 1)
+    if not isinstance(process_count, int) or process_count < 1:
+        raise ValueError(
+            f"process_count must be a positive integer, not {process_count}"
+        )
+    return process_count
+
+
+def get_pipeline_queue_size(config_dict: Dict) -> int:
+    queue_size = config_dict.get("pipeline_queue_size", 0)
+    if not isinstance(queue_size, int) or queue_size < 0:
+        raise ValueError(
+            f"pipeline_queue_size must be a non-negative integer, not {queue_size}"
+        )
+    return queue_size
+
+
+def get_plot_backend(config_dict: Dict) -> PlotBackend:
+    config_plot_backend = config_dict.get("plot_backend", "N/A")
+    try:
+        return PlotBackend[config_plot_backend.upper()]
+    except KeyError:
+        raise KeyError(f"Could not parse plot_backend {config_plot_backend}")
+
+
+def get_video_writer_backend(config_dict: Dict) -> VideoWriterBackend:
+    config_video_writer = config_dict.get("video_writer", "N/A")
+    try:
+        return VideoWriterBackend[config_video_writer.upper()]
+    except KeyError:
+        raise KeyError(f"Could not parse video_writer {config_video_writer}")
+
+
+def get_ffmpeg_config(config_dict: Dict) -> FfmpegConfig:
+    cfg = config_dict.get("ffmpeg", {})
+    try:
+        return FfmpegConfig(**cfg)
+    except TypeError:
+        raise KeyError(f"Unknown keys in ffmpeg config: {pformat(cfg)}")
+
+
+def get_skeleton_panel_config(config_dict: Dict) -> SkeletonPanelConfig:
+    cfg = config_dict.get("skeleton_panel", {})
+    try:
+        skeleton_panel_config = SkeletonPanelConfig(**cfg)
+    except TypeError:
+        raise KeyError(f"Unknown keys in skeleton_panel config: {pformat(cfg)}")
+    for key, value in vars(skeleton_panel_config).items():
+        if not isinstance(value, (int, float)):
+            raise ValueError(
+                f"{key} of the skeleton panel must be a number, not {value}"
+            )
+    return skeleton_panel_config
+
+
+def get_target_fps(config_dict: Dict) -> float:
+    target_fps = config_dict.get("target_fps", "N/A")
+    if not isinstance(target_fps, (int, float)) or not target_fps > 0:
+        raise ValueError(f"target_fps must be a positive number, not {target_fps}")
+    return float(target_fps)
+
+
+def get_preview_scale(config_dict: Dict) -> float:
+    preview_scale = config_dict.get("preview_scale", "N/A")
+    if not isinstance(preview_scale, (int, float)) or not 0 < preview_scale <= 1:
+        raise ValueError(
+            f"preview_scale must be a number in (0, 1], not {preview_scale}"
+        )
+    return float(preview_scale)
+
+
+def get_preview_frame_step(config_dict: Dict) -> int:
+    preview_frame_step = config_dict.get("preview_frame_step", "N/A")
+    if not isinstance(preview_frame_step, int) or preview_frame_step < 1:
+        raise ValueError(
+            f"preview_frame_step must be a positive integer, not {preview_frame_step}"
+        )
+    return preview_frame_step
+
+
+def get_time_ranges(config_dict: Dict) -> List[Tuple[float, float]]:
+    time_ranges = config_dict.get("time_ranges", [])
+    if not isinstance(time_ranges, list):
+        raise ValueError(
+            f"time_ranges must be a list of [start, end], not {time_ranges}"
+        )
+    return [get_time_range(time_range) for time_range in time_ranges]
+
+
+def get_time_range(time_range: Any) -> Tuple[float, float]:
+    """Check that the given time range is a valid [start, end] pair of seconds"""
+    if (
+        not isinstance(time_range, (list, tuple))
+        or len(time_range) != 2
+        or not all(isinstance(t, (int, float)) for t in time_range)
+    ):
+        raise ValueError(
+            f"A time range must be [start, end] in seconds, not {time_range}"
+        )
+    start, end = time_range
+    if start < 0 or end <= start:
+        raise ValueError(
+            f"A time range must satisfy 0 <= start < end, not {time_range}"
+        )
+    return float(start), float(end)
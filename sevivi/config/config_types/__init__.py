@@ -1,5 +1,13 @@
 from .plotting_method import PlottingMethod
 from .stacking_direction import StackingDirection
+from .panel_type import PanelType
+from .plot_backend import PlotBackend
+from .derived_operation import DerivedOperation
+from .derived_channel_config import DerivedChannelConfig
+from .skeleton_panel_config import SkeletonPanelConfig
+from .annotation_config import AnnotationConfig
 from .video_config import VideoConfig
 from .config import Config
 from .render_config import RenderConfig
+from .video_writer_backend import VideoWriterBackend
+from .ffmpeg_config import FfmpegConfig
@@ -0,0 +1,29 @@
+import os
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass
+class AnnotationConfig:
+    """
+    AnnotationConfig instances specify a track of labeled intervals, e.g., exercise repetitions, activities or
+    artefacts. The intervals are shaded in the graphs and their labels are shown in a strip above the video.
+
+    :Example:
+    path: /tmp/activities.csv
+    name: activity
+    """
+
+    path: str = None
+    """
+    Path to the annotation csv with the columns start, end and label.
+    Start and end are seconds of video time, and the end is not part of the interval.
+    """
+    name: str = ""
+    """Human readable name of the track for display purposes"""
+
+    def get_missing_files(self) -> List[str]:
+        """Returns a list of all missing files for this config"""
+        if not os.path.isfile(self.path):
+            return [self.path]
+        return []
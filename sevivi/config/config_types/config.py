@@ -4,6 +4,7 @@ from typing import List, Dict
 from .video_config import VideoConfig
 from .render_config import RenderConfig
 from .sensor_config import SensorConfig
+from .annotation_config import AnnotationConfig
 
 
 @dataclass
@@ -13,6 +14,7 @@ class Config:
     video_config: VideoConfig = None
     sensor_configs: Dict[str, SensorConfig] = field(default_factory=dict)
     render_config: RenderConfig = None
+    annotation_configs: List[AnnotationConfig] = field(default_factory=list)
 
     def get_missing_files(self) -> List[str]:
         """
@@ -22,4 +24,6 @@ class Config:
         missing_files = self.video_config.get_missing_files()
         for sensor_config in self.sensor_configs.values():
             missing_files.extend(sensor_config.get_missing_files())
+        for annotation_config in self.annotation_configs:
+            missing_files.extend(annotation_config.get_missing_files())
         return missing_files
@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from typing import Optional, Union, List
+
+from .derived_operation import DerivedOperation
+
+
+@dataclass
+class DerivedChannelConfig:
+    """
+    Describes a channel that is computed from the sensor data when its graph provider is created.
+    Derived channels are computed in the order of their configs, so they may select the channels derived before them.
+
+    :Example:
+    name: "AccMag"
+    operation: DerivedOperation.MAGNITUDE
+    columns: ["AccX", "AccY", "AccZ"]
+    """
+
+    name: str
+    """
+    Name of the derived column. Operations on each selected column name their results
+    "<column>_<name>" if more than one column is selected.
+    """
+    operation: DerivedOperation
+    """How the channel is computed"""
+    columns: Union[str, List[str]]
+    """The selected columns, either as a list of column names or as a string contained in the column names"""
+    cutoff_hz: Optional[float] = None
+    """Cutoff frequency of DerivedOperation.LOWPASS"""
+    order: int = 4
+    """Order of the Butterworth filter of DerivedOperation.LOWPASS"""
+    window_seconds: Optional[float] = None
+    """Length of the window of DerivedOperation.RMS"""
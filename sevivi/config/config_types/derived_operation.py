@@ -0,0 +1,17 @@
+from enum import Enum
+
+
+class DerivedOperation(Enum):
+    """How a derived channel is computed from the columns of the sensor data"""
+
+    MAGNITUDE = 0
+    """The euclidean norm of all selected columns, e.g., the magnitude of a three-axis accelerometer"""
+    LOWPASS = 1
+    """
+    A zero-phase Butterworth low-pass filter of each selected column with DerivedChannelConfig.cutoff_hz
+    and DerivedChannelConfig.order
+    """
+    RMS = 2
+    """The root mean square of each selected column over the preceding DerivedChannelConfig.window_seconds"""
+    GRADIENT = 3
+    """The rate of change per second of each selected column, e.g., the jerk of an acceleration"""
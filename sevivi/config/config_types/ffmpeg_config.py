@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class FfmpegConfig:
+    """Contains configuration of the encoder used by VideoWriterBackend.FFMPEG"""
+
+    executable: str = "ffmpeg"
+    """Name or path of the ffmpeg executable"""
+    codec: str = "libx264"
+    """Name of the ffmpeg video encoder"""
+    crf: Optional[int] = None
+    """
+    Constant rate factor. Lower values mean higher quality and larger files.
+    Only passed to x264-style encoders like libx264 and libx265. If None, the encoder default is used, e.g., 23
+    """
+    preset: Optional[str] = None
+    """
+    Encoder preset trading encoding speed for file size, e.g., ultrafast, fast, medium or slow.
+    Only passed to x264-style encoders like libx264 and libx265. If None, the encoder default is used, e.g., medium
+    """
+    pixel_format: str = "yuv420p"
+    """Pixel format of the encoded video. yuv420p is supported by most players"""
+    threads: int = 0
+    """Number of encoder threads. 0 lets ffmpeg choose"""
@@ -0,0 +1,21 @@
+from enum import Enum
+
+
+class PanelType(Enum):
+    """How the columns of a graph group are shown in its axis"""
+
+    LINES = 0
+    """
+    Plot a line for each column of the group. If no graph groups are configured, each column gets its own axis.
+    """
+    STACKED = 1
+    """
+    Plot the columns as traces stacked on top of each other, each scaled to its own lane, e.g., for EMG or
+    pressure insoles with dozens of channels. If no graph groups are configured, all columns share a single axis.
+    """
+    HEATMAP = 2
+    """
+    Show the columns as rows of a color-mapped image over time, e.g., for pressure mats or electrode grids with
+    dozens of channels. If no graph groups are configured, all columns share a single axis.
+    Supports PlottingMethod.MOVING_VERTICAL_LINE and PlottingMethod.SCROLLING_WINDOW.
+    """
@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class PlotBackend(Enum):
+    """How the graphs are drawn"""
+
+    MATPLOTLIB = 0
+    """Draw the graphs with matplotlib. Slower, but with the full fidelity and styling of matplotlib."""
+    OPENCV = 1
+    """
+    Draw axes, ticks, titles and lines directly into an image with OpenCV primitives.
+    Much faster to set up and to render, and does not import pyplot, but with simpler styling.
+    """
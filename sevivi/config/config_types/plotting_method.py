@@ -13,5 +13,18 @@ class PlottingMethod(Enum):
     PUSH_IN = 1
     """
     The PUSH_IN plotting method adds new sensor data on the right edge of the graph.
-    This compresses the data on the left. The most recent data is always on the rightmost edge.
+    Older data moves to the left until it leaves the graph. The graph shows a time window of
+    RenderConfig.push_in_window_seconds, and the most recent data is always on the rightmost edge.
+    """
+    SCROLLING_WINDOW = 2
+    """
+    The SCROLLING_WINDOW plotting method shows RenderConfig.scrolling_window_seconds of data before and after
+    the current time, which is marked by a vertical line in the center. The data scrolls from right to left.
+    All data is rendered once into a wide image, of which each frame shows a slice.
+    """
+    SPECTROGRAM = 3
+    """
+    The SPECTROGRAM plotting method shows the spectrogram of the columns of each graph group over the entire video,
+    e.g., for EMG, audio-rate or vibration sensors. It is computed once with segments of
+    RenderConfig.spectrogram_window_seconds, and a vertical line is moved through it like in MOVING_VERTICAL_LINE.
     """
@@ -1,7 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional, List, Tuple
 
+from .ffmpeg_config import FfmpegConfig
+from .skeleton_panel_config import SkeletonPanelConfig
 from .stacking_direction import StackingDirection
 from .plotting_method import PlottingMethod
+from .video_writer_backend import VideoWriterBackend
+from .plot_backend import PlotBackend
 
 
 @dataclass
@@ -12,9 +17,73 @@ class RenderConfig:
     """Should the plots be next to or below the input video?"""
     plotting_method: PlottingMethod = PlottingMethod.MOVING_VERTICAL_LINE
     """The plotting method to use, i.e., how should changes in time be shown?"""
+    push_in_window_seconds: float = 10.0
+    """Length of the time window shown by PlottingMethod.PUSH_IN"""
+    scrolling_window_seconds: float = 5.0
+    """Time shown before and after the current time by PlottingMethod.SCROLLING_WINDOW"""
+    spectrogram_window_seconds: float = 0.5
+    """Length of the segments of the spectrograms shown by PlottingMethod.SPECTROGRAM"""
+    value_readout: bool = False
+    """
+    Show the current value of each line as a marker and a label at the current time.
+    Not shown for PlottingMethod.SPECTROGRAM.
+    """
+    skeleton_panel_config: Optional[SkeletonPanelConfig] = None
+    """
+    If given, the 3D skeleton of a Kinect video is shown in a square panel to the right of the video and the graphs.
+    Requires a KinectVideoConfig.
+    """
+    plot_backend: PlotBackend = PlotBackend.MATPLOTLIB
+    """How the graphs are drawn"""
     target_file_path: str = "sevivi.avi"
     """Path where the resulting video file should be stored"""
+    video_writer_backend: VideoWriterBackend = VideoWriterBackend.OPENCV
+    """How the resulting video is encoded"""
     fourcc_codec: str = "MJPG"
-    """Fourcc (check OpenCV docs) codec of the resulting video"""
+    """Fourcc (check OpenCV docs) codec of the resulting video. Used by VideoWriterBackend.OPENCV"""
+    ffmpeg_config: FfmpegConfig = field(default_factory=FfmpegConfig)
+    """Encoder configuration used by VideoWriterBackend.FFMPEG"""
+    target_fps: Optional[float] = None
+    """
+    Frame rate of the resulting video. Source frames are dropped or repeated by their timestamp to achieve it.
+    If None, the frame rate of the source video is used.
+    """
+    time_ranges: List[Tuple[float, float]] = field(default_factory=list)
+    """
+    Start and end in seconds of video time of the parts of the video to render. If empty, the whole video is rendered.
+    Synchronization always uses all data, so the offsets match those of a full render.
+    """
+    split_time_ranges: bool = False
+    """
+    If True, each time range is written to its own file. The index of the range is appended to the
+    name of target_file_path, e.g., sevivi_0.avi. Otherwise, the time ranges are concatenated.
+    """
+    preview: bool = False
+    """
+    Render a quick preview to check the synchronization. Uses the same offsets as the full render,
+    but scales the video and plots by preview_scale and only renders every preview_frame_step-th frame.
+    """
+    preview_scale: float = 0.25
+    """Factor applied to the video and plot dimensions in preview mode"""
+    preview_frame_step: int = 4
+    """Only every preview_frame_step-th frame is rendered in preview mode. The frame rate is reduced accordingly."""
+    background_cache_dir: Optional[str] = None
+    """
+    Directory in which the rasterized plot backgrounds are cached. Renders of the same data, offsets and figure
+    dimensions restore them instead of drawing the figure. If None, nothing is cached.
+    Only used if all graph providers support raster rendering.
+    """
+    background_cache_max_mb: float = 512.0
+    """Maximum size of the background cache. The least recently used backgrounds are deleted first."""
+    process_count: int = 1
+    """
+    Number of worker processes. If larger than 1, each worker renders a contiguous segment of the video
+    into a lossless intermediate file, and the segments are concatenated into the target file afterwards.
+    """
+    pipeline_queue_size: int = 0
+    """
+    If larger than 0, decoding and encoding run in separate threads that are connected to the plotting
+    by queues holding up to this many frames. If 0, all stages run one after another in a single thread.
+    """
     plot_column_count = 2
     """Number of columns to use in the plots. Should be divisible by 2 for StackingDirection.HORIZONTAL"""
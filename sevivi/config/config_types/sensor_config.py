@@ -1,9 +1,13 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Union, List
 
 import pandas as pd
 
+from .plotting_method import PlottingMethod
+from .panel_type import PanelType
+from .derived_channel_config import DerivedChannelConfig
+
 
 @dataclass
 class SensorConfig:
@@ -21,6 +25,17 @@ class SensorConfig:
     """End time of the sensor data. This is useful to select a portion of data from a longer recording"""
     graph_groups: Optional[List[str]] = None
     """List of in/pre/postfixes that select a number of columns to be graphed in the same axis."""
+    plotting_method: Optional[PlottingMethod] = None
+    """Plotting method of the graphs of this sensor. If None, RenderConfig.plotting_method is used."""
+    panel_type: PanelType = PanelType.LINES
+    """How the columns of each graph group are shown in its axis"""
+    derived: List[DerivedChannelConfig] = field(default_factory=list)
+    """Channels computed from the data and added to its columns, e.g., to plot magnitudes or filtered signals"""
+    derived_cache: bool = False
+    """
+    Store the derived channels next to the sensor data file, so that later renders of the same time range
+    load them instead of computing them again
+    """
 
     def get_missing_files(self) -> List[str]:
         """Returns a list of all missing files for this config"""
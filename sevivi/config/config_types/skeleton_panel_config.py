@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class SkeletonPanelConfig:
+    """
+    Contains configuration of the panel that shows the 3D skeleton of a Kinect video next to the graphs.
+    The skeleton is projected orthographically, so its size does not depend on the distance to the viewpoint.
+    """
+
+    azimuth_degrees: float = 0.0
+    """
+    Rotation of the viewpoint around the vertical axis. 0 looks from the camera, 90 from the right of the camera,
+    and 180 from behind the person
+    """
+    elevation_degrees: float = 0.0
+    """Tilt of the viewpoint above the person. 0 looks horizontally, 90 looks down from above"""
@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class VideoWriterBackend(Enum):
+    """How the rendered frames are encoded into the target file"""
+
+    OPENCV = 0
+    """Use cv2.VideoWriter with the configured fourcc codec. Needs no additional software."""
+    FFMPEG = 1
+    """
+    Pipe the raw frames to a local ffmpeg process.
+    Allows modern codecs like H.264 with configurable quality, speed and encoder threads.
+    """
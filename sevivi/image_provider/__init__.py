@@ -6,4 +6,6 @@ from .video_provider import (
     VideoImuCaptureAppImageProvider,
 )
 from .graph_provider import GraphImageProvider
+from .annotation_provider import AnnotationImageProvider, AnnotationTrack
+from .skeleton_provider import SkeletonImageProvider
 from .dimensions import Dimensions
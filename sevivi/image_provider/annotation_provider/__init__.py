@@ -0,0 +1,2 @@
+from .annotation_provider import AnnotationImageProvider, AnnotationTrack
+from .interval_index import IntervalIndex
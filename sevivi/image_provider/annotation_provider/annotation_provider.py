@@ -0,0 +1,169 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Tuple, Dict
+
+import cv2
+import numpy as np
+import pandas as pd
+from matplotlib.colors import to_rgb
+
+from .interval_index import IntervalIndex
+
+
+@dataclass
+class AnnotationTrack:
+    """Labeled intervals of video time, e.g., exercise repetitions, activities or artefacts"""
+
+    name: str
+    """Human readable name of the track, shown in front of its labels"""
+    starts_ns: np.ndarray
+    """Start of each interval in nanoseconds of video time"""
+    ends_ns: np.ndarray
+    """End of each interval in nanoseconds of video time, which is not part of the interval"""
+    labels: np.ndarray
+    """Label of each interval"""
+
+
+class AnnotationImageProvider:
+    """
+    Shows the labels of the annotation tracks active at each frame in a strip with a row per track.
+    The active intervals are found by binary search in an interval index per track, and the strip is only
+    painted again when they change.
+    """
+
+    label_colors = [f"C{i}" for i in range(10)]
+    """
+    Colors of the labels, which are assigned to the sorted labels of all tracks.
+    Labels beyond the number of colors repeat them.
+    """
+
+    ROW_HEIGHT = 24
+    """Height of the row of each track in pixels at scale 1"""
+    STRIP_CACHE_SIZE = 64
+    """Number of painted strips kept for label combinations that appear again"""
+
+    def __init__(self, tracks: List[AnnotationTrack]):
+        """
+        :param tracks: the annotation tracks to show
+        """
+        self.tracks = tracks
+        self._indices = [
+            IntervalIndex(track.starts_ns, track.ends_ns) for track in tracks
+        ]
+        labels = sorted({str(label) for track in tracks for label in track.labels})
+        self._label_colors = {
+            label: self.label_colors[i % len(self.label_colors)]
+            for i, label in enumerate(labels)
+        }
+        self._strips: Dict[Tuple, np.ndarray] = OrderedDict()
+        """Painted strips by the active intervals of all tracks, in the order of their last use"""
+
+    def get_label_color(self, label: str) -> str:
+        """Get the color of the label, which is shared by its spans in the graphs and its box in the strip"""
+        return self._label_colors[str(label)]
+
+    def get_spans(self) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """Get the starts, ends and colors of the intervals of all tracks, e.g., to shade them in the graphs"""
+        if len(self.tracks) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), []
+        starts = np.concatenate([track.starts_ns for track in self.tracks])
+        ends = np.concatenate([track.ends_ns for track in self.tracks])
+        colors = [
+            self.get_label_color(label)
+            for track in self.tracks
+            for label in track.labels
+        ]
+        return starts, ends, colors
+
+    def get_strip_height(self, scale: float = 1.0) -> int:
+        """Get the height of the label strip in pixels, e.g., at the scale of preview renders"""
+        return len(self.tracks) * int(round(self.ROW_HEIGHT * scale))
+
+    def paint_strip(self, image: np.ndarray, ts: pd.Timestamp):
+        """Paint the labels active at the given timestamp into the BGR image of the strip"""
+        key = tuple(tuple(index.get_active(ts.value)) for index in self._indices) + (
+            image.shape,
+        )
+        strip = self._strips.get(key)
+        if strip is None:
+            strip = self.__render_strip(key[:-1], image.shape)
+            self._strips[key] = strip
+            if len(self._strips) > self.STRIP_CACHE_SIZE:
+                self._strips.popitem(last=False)
+        else:
+            self._strips.move_to_end(key)
+        np.copyto(image, strip)
+
+    def __render_strip(
+        self, active: Tuple[Tuple[int, ...], ...], shape: Tuple[int, ...]
+    ) -> np.ndarray:
+        """Render the strip with the given active intervals of each track"""
+        strip = np.full(shape, 255, dtype=np.uint8)
+        if len(self.tracks) == 0:
+            return strip
+        row_height = shape[0] // len(self.tracks)
+        scale = row_height / self.ROW_HEIGHT
+        font_scale = 0.45 * scale
+        thickness = max(1, int(round(scale)))
+        padding = max(1, int(round(4 * scale)))
+        for row, (track, positions) in enumerate(zip(self.tracks, active)):
+            top = row * row_height
+            baseline = top + (row_height + int(round(10 * scale))) // 2
+            x = padding
+            if track.name != "":
+                x = self.__put_text(
+                    strip, f"{track.name}:", x, baseline, font_scale, thickness
+                )
+                x += padding
+            for position in positions:
+                label = str(track.labels[position])
+                (width, _), _ = cv2.getTextSize(
+                    label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness
+                )
+                color = np.round(
+                    np.array(to_rgb(self.get_label_color(label)))[::-1] * 255
+                )
+                cv2.rectangle(
+                    strip,
+                    (x, top + padding // 2),
+                    (x + width + 2 * padding, top + row_height - padding // 2 - 1),
+                    color.tolist(),
+                    -1,
+                )
+                self.__put_text(
+                    strip,
+                    label,
+                    x + padding,
+                    baseline,
+                    font_scale,
+                    thickness,
+                    (255, 255, 255),
+                )
+                x += width + 3 * padding
+        return strip
+
+    @staticmethod
+    def __put_text(
+        image: np.ndarray,
+        text: str,
+        x: int,
+        baseline: int,
+        font_scale: float,
+        thickness: int,
+        color: Tuple[int, int, int] = (0, 0, 0),
+    ) -> int:
+        """Put the text at the given left and baseline and return its right end"""
+        cv2.putText(
+            image,
+            text,
+            (x, baseline),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            font_scale,
+            color,
+            thickness,
+            cv2.LINE_AA,
+        )
+        (width, _), _ = cv2.getTextSize(
+            text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness
+        )
+        return x + width
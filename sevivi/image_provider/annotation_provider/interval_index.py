@@ -0,0 +1,35 @@
+"""Finds the intervals containing a time by binary search instead of scanning all intervals"""
+import numpy as np
+
+
+class IntervalIndex:
+    """
+    Half-open intervals [start, end) sorted by their start. The running maximum of the ends bounds the
+    intervals that may still contain a time, so both ends of the candidates are found by binary search,
+    and only the candidates between them are checked.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray):
+        """
+        :param starts: start of each interval, e.g., in nanoseconds
+        :param ends: end of each interval, which is not part of the interval
+        """
+        self.order = np.argsort(starts, kind="stable")
+        """Position of each sorted interval in the given arrays"""
+        self.starts = np.asarray(starts)[self.order]
+        self.ends = np.asarray(ends)[self.order]
+        self._max_ends = (
+            np.maximum.accumulate(self.ends) if len(self.ends) > 0 else self.ends
+        )
+        """Largest end of the intervals up to each position"""
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def get_active(self, time: int) -> np.ndarray:
+        """Get the positions in the given arrays of the intervals containing the time, in the order of their starts"""
+        # intervals before first end before the time, intervals from stop on start after it
+        first = np.searchsorted(self._max_ends, time, side="right")
+        stop = np.searchsorted(self.starts, time, side="right")
+        candidates = np.arange(first, stop)
+        return self.order[candidates[self.ends[candidates] > time]]
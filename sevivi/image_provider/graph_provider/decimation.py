@@ -0,0 +1,49 @@
+"""Reduces the samples of lines to those that determine how the lines look at a given horizontal resolution"""
+from typing import Tuple
+
+import numpy as np
+
+SAMPLES_PER_PIXEL = 4
+"""Number of samples a pixel column keeps for each line: the first, last, minimum and maximum sample"""
+
+
+def get_decimated_indices(
+    times_ns: np.ndarray, values: np.ndarray, x_transform: Tuple[float, float]
+) -> np.ndarray:
+    """
+    Get the positions of the samples that have to be plotted so that lines of the values look the same as lines
+    of all samples at the resolution given by x_transform.
+
+    The samples are grouped by the pixel column they fall into. For each column of values, the first, last,
+    minimum and maximum sample of each pixel column are kept (M4 decimation). The line between them covers the same
+    pixels as the line through all samples, and the lines between pixel columns are unchanged. NaN samples are kept,
+    so gaps in the lines are preserved.
+
+    :param times_ns: sorted times of the samples in nanoseconds since the epoch
+    :param values: values of the samples with one column per line
+    :param x_transform: scale and offset that transform nanoseconds since the epoch into horizontal pixel coordinates
+    :return: sorted positions of the kept samples, shared by all lines
+    """
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    sample_count = len(times_ns)
+    scale, offset = x_transform
+    pixels = np.floor(times_ns * scale + offset).astype(np.int64)
+    boundaries = np.flatnonzero(np.diff(pixels)) + 1
+    if sample_count <= SAMPLES_PER_PIXEL * (len(boundaries) + 1) * values.shape[1]:
+        # decimation would not remove enough samples to pay off
+        return np.arange(sample_count)
+
+    starts = np.concatenate(([0], boundaries))
+    stops = np.concatenate((boundaries, [sample_count]))
+    kept = [starts, stops - 1]
+    for column in values.T:
+        is_nan = np.isnan(column)
+        # sorting by pixel column first keeps the pixel column boundaries, so the first sample of each pixel column
+        # in the sorted order is its minimum and the last sample is its maximum
+        by_value = np.lexsort((np.where(is_nan, np.inf, column), pixels))
+        kept.append(by_value[starts])
+        by_value = np.lexsort((np.where(is_nan, -np.inf, column), pixels))
+        kept.append(by_value[stops - 1])
+        kept.append(np.flatnonzero(is_nan))
+    return np.unique(np.concatenate(kept))
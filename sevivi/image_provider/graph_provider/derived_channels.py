@@ -0,0 +1,215 @@
+"""Computes derived channels of sensor data, e.g., magnitudes or filtered signals, and caches them on disk"""
+import hashlib
+import os
+import zipfile
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import signal
+
+from sevivi.atomic_write import atomic_write
+from sevivi.config import (
+    SensorConfig,
+    DerivedChannelConfig,
+    DerivedOperation,
+    find_matching_columns,
+)
+from sevivi.log import logger
+
+logger = logger.getChild("derived_channels")
+
+CACHE_FORMAT_VERSION = 2
+"""Increased whenever the computation of derived channels changes, so that old cache files are not used"""
+
+
+def add_derived_channels(
+    data: pd.DataFrame, sensor_config: SensorConfig
+) -> pd.DataFrame:
+    """
+    Add the derived channels of the sensor config to the data.
+    If SensorConfig.derived_cache is set, the channels are loaded from or stored to the cache file next to
+    SensorConfig.path, see get_derived_cache_path.
+    """
+    if len(sensor_config.derived) == 0:
+        return data
+
+    cache_path, key = None, None
+    if sensor_config.derived_cache and sensor_config.path is not None:
+        cache_path = get_derived_cache_path(sensor_config.path)
+        key = get_derived_cache_key(data, sensor_config)
+        derived = _load_cached(cache_path, key, data.index)
+        if derived is not None:
+            logger.info(f"Using cached derived channels {cache_path}")
+            return pd.concat([data, derived], axis=1)
+
+    derived = compute_derived_channels(data, sensor_config.derived)
+    if cache_path is not None:
+        _store_cached(cache_path, key, derived)
+    return pd.concat([data, derived], axis=1)
+
+
+def compute_derived_channels(
+    data: pd.DataFrame, derived_configs: List[DerivedChannelConfig]
+) -> pd.DataFrame:
+    """
+    Compute the derived channels of the data in the order of their configs,
+    so that later channels may select earlier ones.
+
+    :return: the derived channels, with the index of the data
+    """
+    times_ns = data.index.asi8
+    working = data
+    derived = {}
+    for config in derived_configs:
+        columns = find_matching_columns(working, config.columns)
+        if len(columns) == 0:
+            raise ValueError(
+                f"Derived channel {config.name} selects no columns with {config.columns}"
+            )
+        values = working[columns].to_numpy(dtype=float)
+        names = (
+            [config.name]
+            if config.operation == DerivedOperation.MAGNITUDE or len(columns) == 1
+            else [f"{column}_{config.name}" for column in columns]
+        )
+        existing = set(names) & set(working.columns)
+        if len(existing) > 0:
+            raise ValueError(
+                f"Derived channel {config.name} would overwrite the columns {existing}"
+            )
+
+        if config.operation == DerivedOperation.MAGNITUDE:
+            result = np.sqrt(np.sum(values**2, axis=1, keepdims=True))
+        elif config.operation == DerivedOperation.LOWPASS:
+            result = lowpass(times_ns, values, config.cutoff_hz, config.order)
+        elif config.operation == DerivedOperation.RMS:
+            result = rolling_rms(times_ns, values, config.window_seconds)
+        elif config.operation == DerivedOperation.GRADIENT:
+            result = np.gradient(values, times_ns / 1e9, axis=0)
+        else:
+            raise NotImplementedError(
+                f"Derived operation {config.operation} is not implemented"
+            )
+
+        results = {name: result[:, col_idx] for col_idx, name in enumerate(names)}
+        derived.update(results)
+        working = working.assign(**results)
+    return pd.DataFrame(derived, index=data.index)
+
+
+def lowpass(
+    times_ns: np.ndarray, values: np.ndarray, cutoff_hz: float, order: int
+) -> np.ndarray:
+    """
+    Filter each column of the values forwards and backwards with a Butterworth low-pass filter,
+    which does not shift the signal in time. The sampling rate is estimated from the median distance
+    of the samples. Missing values are interpolated for filtering and stay missing in the result.
+    """
+    fs = 1e9 / np.median(np.diff(times_ns))
+    if not cutoff_hz < fs / 2:
+        raise ValueError(
+            f"Low-pass cutoff {cutoff_hz} Hz must be below half the sampling rate of {fs:.1f} Hz"
+        )
+    sos = signal.butter(order, cutoff_hz, fs=fs, output="sos")
+    missing = np.isnan(values)
+    filled = values.copy()
+    for col_idx in np.flatnonzero(missing.any(axis=0)):
+        present = ~missing[:, col_idx]
+        if not present.any():
+            continue
+        filled[:, col_idx] = np.interp(
+            times_ns, times_ns[present], values[present, col_idx]
+        )
+    result = signal.sosfiltfilt(sos, filled, axis=0)
+    result[missing] = np.nan
+    return result
+
+
+def rolling_rms(
+    times_ns: np.ndarray, values: np.ndarray, window_seconds: float
+) -> np.ndarray:
+    """
+    Compute the root mean square of each column of the values over the samples in the preceding window
+    of window_seconds, including the current sample. Missing values are skipped.
+    """
+    finite = np.isfinite(values)
+    squares = np.where(finite, values, 0) ** 2
+    square_sums = np.vstack([np.zeros(values.shape[1]), np.cumsum(squares, axis=0)])
+    counts = np.vstack(
+        [np.zeros(values.shape[1], dtype=np.int64), np.cumsum(finite, axis=0)]
+    )
+
+    stops = np.arange(1, len(times_ns) + 1)
+    starts = np.searchsorted(
+        times_ns, times_ns - int(round(window_seconds * 1e9)), side="right"
+    )
+    window_counts = counts[stops] - counts[starts]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = (square_sums[stops] - square_sums[starts]) / window_counts
+    # the running sums may cancel to slightly negative values
+    return np.sqrt(np.maximum(means, 0))
+
+
+def get_derived_cache_path(sensor_path: str) -> str:
+    """Get the path of the cache file of the derived channels of a sensor data file"""
+    return f"{sensor_path}.derived.npz"
+
+
+def get_derived_cache_key(data: pd.DataFrame, sensor_config: SensorConfig) -> str:
+    """
+    Get a hash of everything the derived channels depend on: the size and modification time of the sensor data
+    file, the time range and columns of the data, and the derived channel configs
+    """
+    stat = os.stat(sensor_config.path)
+    return hashlib.sha256(
+        repr(
+            (
+                CACHE_FORMAT_VERSION,
+                os.path.abspath(sensor_config.path),
+                stat.st_size,
+                stat.st_mtime_ns,
+                len(data),
+                data.index[0] if len(data) > 0 else None,
+                data.index[-1] if len(data) > 0 else None,
+                list(data.columns),
+                sensor_config.derived,
+            )
+        ).encode()
+    ).hexdigest()
+
+
+def _load_cached(
+    path: str, key: str, index: pd.DatetimeIndex
+) -> Optional[pd.DataFrame]:
+    """
+    Load the derived channels from the cache file, or None if it is missing, unreadable or for another key.
+    The file holds plain arrays and is read without pickle, so it cannot run code.
+    """
+    try:
+        with np.load(path, allow_pickle=False) as cached:
+            if str(cached["key"]) != key:
+                return None
+            values, columns = cached["values"], cached["columns"].tolist()
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        logger.warning(f"Ignoring unreadable derived channel cache {path}: {e}")
+        return None
+    if values.shape != (len(index), len(columns)):
+        return None
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def _store_cached(path: str, key: str, derived: pd.DataFrame):
+    """Store the derived channels in the cache file. Failing to write it, e.g., next to read-only data, is logged."""
+    try:
+        with atomic_write(path) as f:
+            np.savez(
+                f,
+                key=np.array(key),
+                values=derived.to_numpy(dtype=float),
+                columns=np.array(derived.columns, dtype=str),
+            )
+    except OSError as e:
+        logger.warning(f"Could not write derived channel cache {path}: {e}")
@@ -1,10 +1,10 @@
+import hashlib
+from math import ceil
 from pprint import pformat
-from typing import List, Optional
+from typing import List, Optional, Dict, Tuple, TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
-from matplotlib.axes import SubplotBase, Axes
-from matplotlib.axis import Axis
-from matplotlib.figure import Figure
 
 from sevivi.config import (
     RenderConfig,
@@ -15,12 +15,56 @@ from sevivi.config import (
     ImuSynchronizedSensorConfig,
     get_graph_groups,
     PlottingMethod,
+    PanelType,
 )
 from sevivi.log import logger
-from .utils import epochize_index, calculate_index, RenderAxis
+from .utils import (
+    epochize_index,
+    calculate_indices,
+    RenderAxis,
+    prepare_render_axis_raster,
+    paint_vline,
+    SampleRingBuffer,
+    get_pixel_bounds,
+    prepare_vline_raster,
+    to_bgr,
+    render_panorama,
+    paint_panorama_window,
+    get_x_transform,
+    get_y_transform,
+    get_stacked_values,
+    add_line_collection,
+    add_spans,
+)
+from .raster_figure import blend_spans
+from .readout import GlyphCache, paint_readout
+from .decimation import SAMPLES_PER_PIXEL
+from .pyramid import MinMaxPyramid
+from .spectrogram import compute_spectrogram_image
+from .heatmap import compute_heatmap_image
+from .derived_channels import add_derived_channels
+
+if TYPE_CHECKING:
+    # matplotlib figures are only imported when they are used, see sevivi.video_renderer.plot_backend
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
 
 logger = logger.getChild("graph_provider")
 
+RASTER_STATE_FIELDS = (
+    "columns",
+    "name",
+    "pixel_bounds",
+    "x_transform",
+    "vline_color",
+    "vline_width",
+    "panorama",
+    "panorama_transform",
+    "panorama_fill",
+    "y_transform",
+)
+"""Fields of the render axes needed by paint_graph_axes, see get_raster_state"""
+
 
 class GraphImageProvider:
     """
@@ -32,10 +76,17 @@ class GraphImageProvider:
     group_line_colors = [f"C{i}" for i in range(10)]
     """
     Provide the default matplotlib color cycle for 10 dimensions.
-    Overwrite with a bigger color cycle if you have more dimensions
-    in a single graph, or want different colors.
+    Groups with more dimensions repeat the colors.
+    Overwrite with a bigger color cycle if you want different colors.
     """
 
+    STACKED_LINE_WIDTH = 1.0
+    """Width in points of the traces of PanelType.STACKED axes, which are thinner to fit into their lanes"""
+    STACKED_MIN_LABEL_HEIGHT = 10.0
+    """Minimum lane height in points of PanelType.STACKED axes to label the lanes with their column names"""
+    ANNOTATION_ALPHA = 0.25
+    """Opacity of the shaded annotation spans, see set_annotation_spans"""
+
     @property
     def name(self) -> str:
         return self.sensor_config.name
@@ -45,49 +96,398 @@ class GraphImageProvider:
         data: pd.DataFrame,
         sensor_config: SensorConfig,
         plotting_method: PlottingMethod = PlottingMethod.MOVING_VERTICAL_LINE,
+        push_in_window_seconds: float = 10.0,
+        scrolling_window_seconds: float = 5.0,
+        value_readout: bool = False,
+        spectrogram_window_seconds: float = 0.5,
     ):
-        self._data = epochize_index(data)
+        """
+        :param data: the data to display, with a DatetimeIndex
+        :param sensor_config: the configuration of the sensor that recorded the data
+        :param plotting_method: how changes in time are shown
+        :param push_in_window_seconds: length of the time window shown by PlottingMethod.PUSH_IN
+        :param scrolling_window_seconds: time shown before and after the current time by
+                                         PlottingMethod.SCROLLING_WINDOW
+        :param value_readout: show the current value of each line as a marker and a label at the current time.
+                              Spectrograms and heatmaps have no lines, so it is ignored for
+                              PlottingMethod.SPECTROGRAM and PanelType.HEATMAP.
+        :param spectrogram_window_seconds: length of the STFT segments of PlottingMethod.SPECTROGRAM
+        """
+        if (
+            sensor_config.panel_type == PanelType.HEATMAP
+            and plotting_method == PlottingMethod.PUSH_IN
+        ):
+            raise ValueError(
+                f"Heatmaps do not support {plotting_method}, "
+                f"use {PlottingMethod.MOVING_VERTICAL_LINE} or {PlottingMethod.SCROLLING_WINDOW}"
+            )
+        self._data = epochize_index(add_derived_channels(data, sensor_config))
         self.plotting_method = plotting_method
         self.sensor_config = sensor_config
+        self.push_in_window = pd.to_timedelta(push_in_window_seconds, unit="s")
+        self.scrolling_window = pd.to_timedelta(scrolling_window_seconds, unit="s")
+        self.spectrogram_window = pd.to_timedelta(spectrogram_window_seconds, unit="s")
+        self.value_readout = (
+            value_readout
+            and plotting_method != PlottingMethod.SPECTROGRAM
+            and sensor_config.panel_type != PanelType.HEATMAP
+        )
+        self._glyphs: Optional[GlyphCache] = None
+        """Glyphs of the value readout, rasterized at the resolution of the assigned figure"""
 
         self.__axs: List[RenderAxis] = []
 
-        self._graph_groups = get_graph_groups(data, sensor_config.graph_groups)
+        self._frame_timestamps = np.empty(0, dtype=np.int64)
+        """Expected frame timestamps in nanoseconds, see set_frame_timestamps"""
+        self._frame_data_indices = np.empty(0, dtype=np.int64)
+        """Position of the data sample shown for each of the expected frame timestamps"""
+        self._frame_cursor = 0
+        """Position of the next expected frame timestamp"""
+        self._frame_window_starts = np.empty(0, dtype=np.int64)
+        """Position of the first data sample in the PUSH_IN window of each of the expected frame timestamps"""
+        self._visible_range = (0, 0)
+        """Start and stop position of the data samples in the sample buffers of the axes"""
+        self._pyramids: Dict[Tuple[str, ...], MinMaxPyramid] = {}
+        """Maps the columns of axes to their min/max pyramid, which is kept when pickling"""
+        self._annotation_spans: Tuple[np.ndarray, np.ndarray, List[str]] = (
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.int64),
+            [],
+        )
+        """Starts and ends in nanoseconds of video time and colors of the shaded annotation spans"""
+
+        self._graph_groups = get_graph_groups(
+            self._data,
+            sensor_config.graph_groups,
+            single_group=sensor_config.panel_type != PanelType.LINES,
+        )
         logger.debug(
             f"Got groups {pformat(self._graph_groups)} "
-            f"for columns {list(data.columns)} "
+            f"for columns {list(self._data.columns)} "
             f"and graph_groups {sensor_config.graph_groups}"
         )
 
-    def set_axs(self, figure: Figure, axes: List[Axes]):
-        """Assign the axes that this graph provider may draw to."""
+    def set_axs(
+        self, figure: "Figure", axes: List["Axes"], capture_backgrounds: bool = True
+    ):
+        """
+        Assign the axes that this graph provider may draw to and add all artists to them.
+
+        :param figure: the figure the axes are from
+        :param axes: the axes to draw to
+        :param capture_backgrounds: draw the figure once and capture the backgrounds of the axes.
+                                    When assigning axes of one figure to several providers, pass False and call
+                                    capture_backgrounds once after drawing the figure instead.
+        """
         for axis_idx, (title, cols) in enumerate(self._graph_groups.items()):
             ax = axes[axis_idx]
-            ax.set_xlim(self._data.index[0], self._data.index[-1])
-            ax.set_ylim(self._data[cols].min().min(), self._data[cols].max().max())
 
             if self.sensor_config.name != "":
                 title = f"{self.sensor_config.name}: {title}"
             ax.set_title(title)
 
             render_axis = RenderAxis(ax, cols, title)
-            for col_idx, col in enumerate(cols):
-                color = self.group_line_colors[col_idx]
-                line = ax.plot(
-                    self._data.index,
-                    self._data[col],
-                    color=color,
-                )[0]
+            render_axis.pyramid = self.__get_pyramid(cols)
+            render_axis.values = self.__get_plotted_values(render_axis)
+            self.__set_y_axis(render_axis)
+            if self.plotting_method == PlottingMethod.PUSH_IN:
+                self.__prepare_push_in_axis(render_axis)
+            elif self.plotting_method == PlottingMethod.SCROLLING_WINDOW:
+                self.__prepare_scrolling_window_axis(render_axis)
+            elif self.plotting_method == PlottingMethod.SPECTROGRAM:
+                self.__prepare_spectrogram_axis(render_axis, int(figure.bbox.height))
+            elif self.sensor_config.panel_type == PanelType.HEATMAP:
+                self.__prepare_heatmap_axis(render_axis, int(figure.bbox.height))
+            else:
+                self.__prepare_vline_axis(render_axis)
+            self.__axs.append(render_axis)
 
-                # draw to cache renderers
-                figure.canvas.draw()
+        if self.value_readout:
+            self._glyphs = GlyphCache(figure.dpi / 100)
 
-                bbox_copy = figure.canvas.copy_from_bbox(line.clipbox)
-                render_axis.bounding_boxes[col] = bbox_copy
+        if capture_backgrounds and len(self.__axs) > 0:
+            figure.canvas.draw()
+            self.capture_backgrounds(figure)
 
-            render_axis.vline = ax.axvline(0, color="grey")
+    def set_annotation_spans(
+        self, starts_ns: np.ndarray, ends_ns: np.ndarray, colors: List[str]
+    ):
+        """
+        Shade the given intervals of video time in the axes assigned afterwards, so that the spans are part of the
+        backgrounds and cost nothing per frame. PlottingMethod.PUSH_IN does not show them, as its time axis moves.
 
-            self.__axs.append(render_axis)
+        :param starts_ns: start of each span in nanoseconds of video time, i.e., of the data with the applied offset
+        :param ends_ns: end of each span
+        :param colors: color of each span
+        """
+        self._annotation_spans = (
+            np.asarray(starts_ns, dtype=np.int64),
+            np.asarray(ends_ns, dtype=np.int64),
+            list(colors),
+        )
+
+    def capture_backgrounds(self, figure: "Figure"):
+        """
+        Copy the background of each assigned axis from the figure, which must have been drawn after set_axs.
+        Animated artists are skipped when the figure is drawn, so the backgrounds contain everything but the
+        artists that change between frames. All lines of an axis are clipped to the axis, so one region per axis
+        covers them.
+        """
+        for render_axis in self.__axs:
+            render_axis.background = figure.canvas.copy_from_bbox(render_axis.ax.bbox)
+        self._visible_range = (0, 0)
+
+    def __get_plotted_values(self, render_axis: RenderAxis) -> np.ndarray:
+        """Get the values of the columns of the render axis as they are plotted, i.e., in lanes if stacked"""
+        if self.sensor_config.panel_type == PanelType.STACKED:
+            return get_stacked_values(render_axis.pyramid.values)
+        return render_axis.pyramid.values
+
+    def __get_line_colors(self, count: int) -> List[str]:
+        """Get the colors of the lines of an axis with the given number of columns"""
+        return [
+            self.group_line_colors[i % len(self.group_line_colors)]
+            for i in range(count)
+        ]
+
+    def __set_y_axis(self, render_axis: RenderAxis):
+        """
+        Set the y limits to the plotted values. Stacked axes and heatmaps have a lane per column instead,
+        which is labeled with the column name if the lanes are high enough.
+        """
+        ax = render_axis.ax
+        if self.sensor_config.panel_type == PanelType.LINES:
+            data = self._data[render_axis.columns]
+            ax.set_ylim(data.min().min(), data.max().max())
+            return
+
+        lane_count = len(render_axis.columns)
+        ax.set_ylim(-0.5, lane_count - 0.5)
+        lane_height = ax.bbox.height / lane_count * 72 / ax.figure.dpi
+        if lane_height >= self.STACKED_MIN_LABEL_HEIGHT:
+            ax.set_yticks(np.arange(lane_count)[::-1], render_axis.columns)
+        else:
+            ax.set_yticks([])
+
+    def __prepare_vline_axis(self, render_axis: RenderAxis):
+        """Plot all data of the axis and add the vline that moves through it"""
+        ax = render_axis.ax
+        ax.set_xlim(self._data.index[0], self._data.index[-1])
+        if self.sensor_config.panel_type == PanelType.STACKED:
+            self.__plot_stacked_lines(render_axis)
+        else:
+            # only plot the samples that determine how the lines look at the pixel width of the axis
+            kept = render_axis.pyramid.get_decimated_indices(
+                self._data.index.asi8, 0, len(self._data), get_x_transform(ax)
+            )
+            data = self._data.iloc[kept]
+            colors = self.__get_line_colors(len(render_axis.columns))
+            for col, color in zip(render_axis.columns, colors):
+                ax.plot(data.index, data[col], color=color)
+        self.__add_annotation_spans(render_axis)
+
+        # animated artists are skipped when the figure is drawn, so the vline is not part of the backgrounds
+        render_axis.vline = ax.axvline(0, color="grey", animated=True)
+
+    def __add_annotation_spans(self, render_axis: RenderAxis):
+        """Shade the annotation spans in the axis, whose x axis must show the data times"""
+        starts_ns, ends_ns, colors = self._annotation_spans
+        if len(starts_ns) == 0:
+            return
+        ax = render_axis.ax
+        add_spans(
+            ax,
+            ax.xaxis.convert_units(starts_ns.astype("datetime64[ns]")),
+            ax.xaxis.convert_units(ends_ns.astype("datetime64[ns]")),
+            colors,
+            self.ANNOTATION_ALPHA,
+        )
+
+    def __plot_stacked_lines(self, render_axis: RenderAxis):
+        """
+        Plot the stacked traces of all columns as a single line collection. Each trace is decimated separately,
+        so that dozens of traces do not share the samples kept for all of them.
+        """
+        ax = render_axis.ax
+        index = self._data.index
+        x_transform = get_x_transform(ax)
+        segments = []
+        for col_idx in range(len(render_axis.columns)):
+            kept = render_axis.pyramid.get_decimated_indices(
+                index.asi8, 0, len(index), x_transform, col_idx
+            )
+            x = ax.xaxis.convert_units(index.values[kept])
+            segments.append(np.column_stack([x, render_axis.values[kept, col_idx]]))
+        add_line_collection(
+            ax,
+            segments,
+            self.__get_line_colors(len(render_axis.columns)),
+            self.STACKED_LINE_WIDTH,
+        )
+
+    def __prepare_spectrogram_axis(self, render_axis: RenderAxis, figure_height: int):
+        """
+        Show the spectrogram of all data of the axis as an image sized to the axis interior,
+        and add the vline that moves through it
+        """
+        ax = render_axis.ax
+        ax.set_xlim(self._data.index[0], self._data.index[-1])
+        left, top, right, bottom = get_pixel_bounds(ax, figure_height)
+        image, max_frequency = compute_spectrogram_image(
+            self._data.index.asi8,
+            render_axis.pyramid.values,
+            self.spectrogram_window.value,
+            get_x_transform(ax),
+            left,
+            right - left,
+            bottom - top,
+        )
+        self.__show_image(render_axis, image, 0, max_frequency)
+
+    def __prepare_heatmap_axis(self, render_axis: RenderAxis, figure_height: int):
+        """
+        Show all data of the axis as a heatmap sized to the axis interior, with a row per column in the lanes
+        set by __set_y_axis, and add the vline that moves through it
+        """
+        ax = render_axis.ax
+        ax.set_xlim(self._data.index[0], self._data.index[-1])
+        left, top, right, bottom = get_pixel_bounds(ax, figure_height)
+        image = compute_heatmap_image(
+            self._data.index.asi8,
+            render_axis.pyramid.values,
+            get_x_transform(ax),
+            left,
+            right - left,
+            bottom - top,
+        )
+        self.__show_image(render_axis, image, -0.5, len(render_axis.columns) - 0.5)
+
+    def __show_image(
+        self, render_axis: RenderAxis, image: np.ndarray, bottom: float, top: float
+    ):
+        """Show an image spanning all data of the axis between the given y limits, and add the vline"""
+        ax = render_axis.ax
+        x0, x1 = ax.xaxis.convert_units(self._data.index[[0, -1]].values)
+        ax.imshow(
+            image,
+            extent=(x0, x1, bottom, top),
+            aspect="auto",
+            interpolation="nearest",
+        )
+        ax.set_xlim(self._data.index[0], self._data.index[-1])
+        ax.set_ylim(bottom, top)
+        self.__add_annotation_spans(render_axis)
+
+        # animated artists are skipped when the figure is drawn, so the vline is not part of the backgrounds
+        render_axis.vline = ax.axvline(0, color="white", animated=True)
+
+    def __prepare_push_in_axis(self, render_axis: RenderAxis):
+        """
+        Add empty lines that show the samples in the window before the current timestamp.
+        The x axis shows seconds relative to the current timestamp, so it does not change between frames.
+        """
+        ax = render_axis.ax
+        ax.set_xlim(-self.push_in_window.total_seconds(), 0)
+        colors = self.__get_line_colors(len(render_axis.columns))
+        for col, color in zip(render_axis.columns, colors):
+            render_axis.lines[col] = ax.plot([], [], color=color, animated=True)[0]
+        capacity = self.__get_push_in_capacity()
+        if capacity <= SAMPLES_PER_PIXEL * ax.bbox.width * len(render_axis.columns):
+            render_axis.samples = SampleRingBuffer(capacity, len(render_axis.columns))
+        # otherwise, the window has far more samples than pixels and the lines are decimated with the pyramid
+
+    def __prepare_scrolling_window_axis(self, render_axis: RenderAxis):
+        """
+        Add the vline in the center of the axis. The data is rendered into a panorama by prepare_raster.
+        The x axis shows seconds relative to the current timestamp, so it does not change between frames.
+        """
+        ax = render_axis.ax
+        window_seconds = self.scrolling_window.total_seconds()
+        ax.set_xlim(-window_seconds, window_seconds)
+        # animated artists are skipped when the figure is drawn, so the vline is not part of the backgrounds
+        vline_color = (
+            "white" if self.sensor_config.panel_type == PanelType.HEATMAP else "grey"
+        )
+        render_axis.vline = ax.axvline(0, color=vline_color, animated=True)
+
+    def __prepare_scrolling_window_panorama(
+        self, render_axis: RenderAxis, figure_height: int, dpi: float
+    ):
+        """
+        Render all data of the axis into a panorama at the scale of the axis and store its pixel geometry.
+        The panorama of lines starts and ends a window before and after the data, so that the lines are clipped
+        like in the axis. The panorama of a heatmap only spans the data, and the rest is filled with the face color.
+        """
+        ax = render_axis.ax
+        prepare_vline_raster(render_axis, dpi)
+        # the vline stays in the center of the axis, independent of the painted time
+        render_axis.x_transform = (0.0, ax.transData.transform((0, 0))[0])
+
+        left, top, right, bottom = get_pixel_bounds(ax, figure_height)
+        window_ns = self.scrolling_window.value
+        px_per_ns = (right - left) / (2 * window_ns)
+        index = self._data.index.asi8
+        if self.sensor_config.panel_type == PanelType.HEATMAP:
+            start_ns = index[0]
+            heatmap = compute_heatmap_image(
+                index,
+                render_axis.pyramid.values,
+                (px_per_ns, -px_per_ns * start_ns),
+                0,
+                int(ceil((index[-1] - start_ns) * px_per_ns)) + 1,
+                bottom - top,
+            )
+            panorama = np.ascontiguousarray(heatmap[..., ::-1])
+        else:
+            start_ns = index[0] - window_ns
+            kept = render_axis.pyramid.get_decimated_indices(
+                index, 0, len(index), (px_per_ns, -px_per_ns * start_ns)
+            )
+            panorama = render_panorama(
+                ax,
+                index[kept],
+                render_axis.values[kept],
+                self.__get_line_colors(len(render_axis.columns)),
+                bottom - top,
+                px_per_ns,
+                start_ns,
+                index[-1] + window_ns,
+                dpi,
+            )
+
+        starts_ns, ends_ns, colors = self._annotation_spans
+        if len(starts_ns) > 0:
+            blend_spans(
+                panorama,
+                np.round(px_per_ns * (starts_ns - start_ns)).astype(np.int64),
+                np.round(px_per_ns * (ends_ns - start_ns)).astype(np.int64),
+                np.array([to_bgr(color) for color in colors]),
+                self.ANNOTATION_ALPHA,
+            )
+
+        # keep the spines on the edges of the axis interior intact, including their antialiased border
+        spine_width = max(spine.get_linewidth() for spine in ax.spines.values())
+        inset = ceil(spine_width * dpi / 72 / 2) + 1
+        render_axis.pixel_bounds = (
+            left + inset,
+            top + inset,
+            right - inset,
+            bottom - inset,
+        )
+        render_axis.panorama = panorama[inset : panorama.shape[0] - inset]
+        # the window shown at a time starts window_ns earlier
+        render_axis.panorama_transform = (
+            px_per_ns,
+            inset - px_per_ns * (start_ns + window_ns),
+        )
+        render_axis.panorama_fill = to_bgr(ax.get_facecolor())
+
+    def __get_push_in_capacity(self) -> int:
+        """Get the maximum number of data samples in the PUSH_IN window"""
+        index = self._data.index.asi8
+        window_starts = np.searchsorted(index, index - self.push_in_window.value)
+        # the window may contain one more sample if it ends between samples
+        return int(np.max(np.arange(len(index)) - window_starts)) + 2
 
     def get_sync_dataframe(self) -> Optional[pd.DataFrame]:
         """
@@ -115,25 +515,362 @@ class GraphImageProvider:
         """
         return len(self._graph_groups)
 
-    def render_graph_axes(self, figure: Figure, ts: pd.Timestamp):
+    def render_graph_axes(self, figure: "Figure", ts: pd.Timestamp):
         """
         Render to the axes this graph provider has been assigned.
         Figure must be the same figure the axes instances are from.
         Data will be rendered for the given timestamp.
         """
-        if self.plotting_method == PlottingMethod.MOVING_VERTICAL_LINE:
+        if self.plotting_method in (
+            PlottingMethod.MOVING_VERTICAL_LINE,
+            PlottingMethod.SPECTROGRAM,
+        ):
+            if len(self.__axs) == 0:
+                return
+            vline_position = self._data.index[self._get_data_index(ts)]
             for render_axis in self.__axs:
+                figure.canvas.restore_region(render_axis.background)
 
-                for bbox in render_axis.bounding_boxes.values():
-                    figure.canvas.restore_region(bbox)
-
-                # noinspection PyTypeChecker
-                vline_position = calculate_index(ts, self._data.index)
                 # noinspection PyTypeChecker
                 render_axis.vline.set_xdata([vline_position, vline_position])
                 render_axis.ax.draw_artist(render_axis.vline)
+            self.__paint_canvas_readouts(figure, ts)
+        elif self.plotting_method == PlottingMethod.PUSH_IN:
+            if len(self.__axs) == 0:
+                return
+            start, stop = self._get_visible_range(ts)
+            self.__update_visible_samples(start, stop)
+            for render_axis in self.__axs:
+                figure.canvas.restore_region(render_axis.background)
+
+                if render_axis.samples is not None:
+                    times, values = (
+                        render_axis.samples.times,
+                        render_axis.samples.values,
+                    )
+                else:
+                    times, values = self.__get_decimated_window(
+                        render_axis, ts, start, stop
+                    )
+                x = (times - ts.value) / 1e9
+                for col_idx, line in enumerate(render_axis.lines.values()):
+                    line.set_data(x, values[:, col_idx])
+                    render_axis.ax.draw_artist(line)
+            self.__paint_canvas_readouts(figure, ts)
+        elif self.plotting_method == PlottingMethod.SCROLLING_WINDOW:
+            if len(self.__axs) == 0:
+                return
+            if self.__axs[0].panorama is None:
+                self.prepare_raster(figure)
+            # paint into a BGR view of the RGBA canvas buffer
+            self.paint_graph_axes(
+                np.asarray(figure.canvas.buffer_rgba())[..., 2::-1], ts
+            )
+        else:
+            raise NotImplementedError(
+                f"Plotting method {self.plotting_method} is not implemented"
+            )
+
+    def __update_visible_samples(self, start: int, stop: int):
+        """
+        Update the sample buffers of the axes to the data samples [start, stop).
+        Consecutive frames only append the new samples and drop the old ones.
+        """
+        previous_start, previous_stop = self._visible_range
+        is_continuation = previous_start <= start <= previous_stop <= stop
+        for render_axis in self.__axs:
+            samples = render_axis.samples
+            if samples is None:
+                continue
+            if is_continuation:
+                samples.drop_oldest(start - previous_start)
+                append_start = previous_stop
+            else:
+                # e.g., after seeking
+                samples.clear()
+                append_start = start
+            samples.append(
+                self._data.index.asi8[append_start:stop],
+                render_axis.values[append_start:stop],
+            )
+        self._visible_range = (start, stop)
+
+    def __get_decimated_window(
+        self, render_axis: RenderAxis, ts: pd.Timestamp, start: int, stop: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the times and values of the data samples [start, stop) decimated to the pixel width of the axis"""
+        # the right edge of the axis shows the timestamp
+        scale = render_axis.ax.bbox.width / self.push_in_window.value
+        offset = render_axis.ax.bbox.x1 - scale * ts.value
+        index = self._data.index.asi8
+        kept = render_axis.pyramid.get_decimated_indices(
+            index, start, stop, (scale, offset)
+        )
+        return index[kept], render_axis.values[kept]
+
+    def __get_pyramid(self, columns: List[str]) -> MinMaxPyramid:
+        """Get the min/max pyramid of the given columns, which is shared by all renders of this provider"""
+        key = tuple(columns)
+        if key not in self._pyramids:
+            self._pyramids[key] = MinMaxPyramid(
+                self._data[columns].to_numpy(dtype=float)
+            )
+        return self._pyramids[key]
+
+    def supports_raster_rendering(self) -> bool:
+        """
+        Whether this provider can paint its frames into an image of the drawn figure with paint_graph_axes,
+        which is much faster than rendering them with matplotlib through render_graph_axes
+        """
+        return self.plotting_method in (
+            PlottingMethod.MOVING_VERTICAL_LINE,
+            PlottingMethod.SCROLLING_WINDOW,
+            PlottingMethod.SPECTROGRAM,
+        )
+
+    def prepare_raster(self, figure: "Figure"):
+        """
+        Precompute the pixel geometry of the assigned axes for paint_graph_axes.
+        Figure must be the same figure the axes instances are from, and it must have been drawn.
+        """
+        figure_height = int(figure.bbox.height)
+        for render_axis in self.__axs:
+            if self.plotting_method == PlottingMethod.SCROLLING_WINDOW:
+                self.__prepare_scrolling_window_panorama(
+                    render_axis, figure_height, figure.dpi
+                )
+            else:
+                prepare_render_axis_raster(render_axis, figure_height, figure.dpi)
+            if self.value_readout:
+                self.__prepare_readout_geometry(render_axis, figure_height)
+
+    def paint_graph_axes(self, image: np.ndarray, ts: pd.Timestamp):
+        """
+        Paint the graph changes for the given timestamp into the BGR image of the drawn figure.
+        The static parts of the graphs must already be in the image, and prepare_raster must have been called.
+        """
+        if len(self.__axs) == 0:
+            return
+        if self.plotting_method == PlottingMethod.SCROLLING_WINDOW:
+            for render_axis in self.__axs:
+                paint_panorama_window(image, render_axis, ts.value)
+                paint_vline(image, render_axis, ts.value)
+                self.__paint_readout(image, render_axis, ts)
+                # the next frame paints the whole axis interior again, so nothing needs to be restored
+                render_axis.painted_region = None
+            return
+
+        vline_position = self._data.index.asi8[self._get_data_index(ts)]
+        for render_axis in self.__axs:
+            paint_vline(image, render_axis, vline_position)
+            self.__paint_readout(image, render_axis, ts)
+
+    def __paint_canvas_readouts(self, figure: "Figure", ts: pd.Timestamp):
+        """Paint the value readouts into the canvas of the figure after its artists have been drawn"""
+        if not self.value_readout:
+            return
+        # paint into a BGR view of the RGBA canvas buffer
+        image = np.asarray(figure.canvas.buffer_rgba())[..., 2::-1]
+        for render_axis in self.__axs:
+            self.__paint_readout(image, render_axis, ts)
+            # the background of the axis is restored before the next frame
+            render_axis.painted_region = None
+
+    def __paint_readout(
+        self, image: np.ndarray, render_axis: RenderAxis, ts: pd.Timestamp
+    ):
+        """
+        Paint the value readout of the render axis for the given timestamp into the BGR image,
+        and extend the painted region of the axis by the changed columns
+        """
+        if not self.value_readout:
+            return
+        if render_axis.readout_values is None:
+            self.__prepare_readout(render_axis)
+        position = np.searchsorted(self._frame_timestamps, ts.value)
+        if (
+            position < len(self._frame_timestamps)
+            and self._frame_timestamps[position] == ts.value
+        ):
+            x = render_axis.readout_x[position]
+            ys = render_axis.readout_y[position]
+            values = render_axis.readout_values[position]
+        else:
+            # the timestamp is not expected, e.g., when rendering single frames
+            data_index = calculate_indices(np.array([ts.value]), self._data.index)
+            x, ys, values = self.__compute_readout(
+                render_axis, np.array([ts.value]), data_index
+            )
+            x, ys, values = x[0], ys[0], values[0]
+
+        left, right = paint_readout(
+            image,
+            self._glyphs,
+            x,
+            ys,
+            values,
+            render_axis.readout_colors,
+            render_axis.panorama_fill,
+            render_axis.pixel_bounds,
+        )
+        if render_axis.painted_region is not None:
+            rows, columns = render_axis.painted_region
+            left, right = min(left, columns.start), max(right, columns.stop)
+        _, top, _, bottom = render_axis.pixel_bounds
+        render_axis.painted_region = (slice(top, bottom), slice(left, right))
+
+    def __prepare_readout(self, render_axis: RenderAxis):
+        """
+        Precompute the pixel geometry of the value readout of the render axis,
+        and its position and values at all expected frame timestamps in one vectorized pass
+        """
+        if render_axis.y_transform is None:
+            # not prepared by prepare_raster, e.g., when rendering with matplotlib
+            self.__prepare_readout_geometry(
+                render_axis, int(render_axis.ax.figure.bbox.height)
+            )
+        render_axis.readout_colors = [
+            to_bgr(color) for color in self.__get_line_colors(len(render_axis.columns))
+        ]
+        (
+            render_axis.readout_x,
+            render_axis.readout_y,
+            render_axis.readout_values,
+        ) = self.__compute_readout(
+            render_axis, self._frame_timestamps, self._frame_data_indices
+        )
+
+    @staticmethod
+    def __prepare_readout_geometry(render_axis: RenderAxis, figure_height: int):
+        """Store the pixel geometry of the axis needed to paint the value readout"""
+        ax = render_axis.ax
+        if render_axis.pixel_bounds is None:
+            render_axis.pixel_bounds = get_pixel_bounds(ax, figure_height)
+        if render_axis.panorama_fill is None:
+            render_axis.panorama_fill = to_bgr(ax.get_facecolor())
+        render_axis.y_transform = get_y_transform(ax, figure_height)
+
+    def __compute_readout(
+        self,
+        render_axis: RenderAxis,
+        timestamps_ns: np.ndarray,
+        data_indices: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the horizontal pixel coordinates, and the vertical pixel coordinates and values of all lines,
+        of the value readout of the render axis at the given frame timestamps.
+        The readout is at the vline, i.e., at the data sample shown at each timestamp, or at the timestamp itself
+        for PlottingMethod.SCROLLING_WINDOW, where the values are interpolated between the samples.
+        The markers are on the plotted lines, while the labels show the values of the data.
+        """
+        ax = render_axis.ax
+        index = self._data.index.asi8
+        if self.plotting_method == PlottingMethod.SCROLLING_WINDOW:
+
+            def interpolate(columns: np.ndarray) -> np.ndarray:
+                return np.column_stack(
+                    [
+                        np.interp(timestamps_ns, index, col, left=np.nan, right=np.nan)
+                        for col in columns.T
+                    ]
+                ).reshape(len(timestamps_ns), len(render_axis.columns))
+
+            values = interpolate(render_axis.pyramid.values)
+            plotted = (
+                values
+                if render_axis.values is render_axis.pyramid.values
+                else interpolate(render_axis.values)
+            )
+            # the vline stays in the center of the axis, see __prepare_scrolling_window_panorama
+            x = np.full(len(timestamps_ns), render_axis.x_transform[1])
         else:
-            raise NotImplementedError("Only VLINE implemented so far")
+            values = render_axis.pyramid.values[data_indices]
+            plotted = render_axis.values[data_indices]
+            x_ns = index[data_indices]
+            if self.plotting_method == PlottingMethod.PUSH_IN:
+                # the right edge of the axis shows the timestamp
+                scale = ax.bbox.width / self.push_in_window.value
+                x = ax.bbox.x1 + scale * (x_ns - timestamps_ns)
+            else:
+                scale, offset = render_axis.x_transform or get_x_transform(ax)
+                x = scale * x_ns + offset
+
+        y_scale, y_offset = render_axis.y_transform
+        return (
+            np.round(x).astype(np.int64),
+            np.round(y_scale * plotted + y_offset),
+            values,
+        )
+
+    def restore_graph_axes(self, image: np.ndarray, background: np.ndarray):
+        """
+        Restore the regions of the image changed by the last paint_graph_axes call from the background,
+        so that only these regions need to be copied instead of the whole figure image.
+        """
+        for render_axis in self.__axs:
+            if render_axis.painted_region is not None:
+                image[render_axis.painted_region] = background[
+                    render_axis.painted_region
+                ]
+                render_axis.painted_region = None
+
+    def set_frame_timestamps(self, timestamps: pd.DatetimeIndex):
+        """
+        Precompute the data sample shown at each of the given frame timestamps with a single search.
+        Rendering frames at these timestamps in order then looks up the data sample in constant time.
+        Must be called after the offset has been set.
+        """
+        self._frame_timestamps = timestamps.asi8
+        self._frame_data_indices = calculate_indices(
+            self._frame_timestamps, self._data.index
+        )
+        self._frame_cursor = 0
+        for render_axis in self.__axs:
+            # recomputed for the new frame timestamps when painted next
+            render_axis.readout_values = None
+        if self.plotting_method == PlottingMethod.PUSH_IN:
+            self._frame_window_starts = calculate_indices(
+                self._frame_timestamps - self.push_in_window.value, self._data.index
+            )
+
+    def _get_frame_position(self, ts: pd.Timestamp) -> Optional[int]:
+        """Get the position of the given timestamp in the expected frame timestamps, or None if it is not expected"""
+        cursor = self._frame_cursor
+        if cursor >= len(self._frame_timestamps) or (
+            self._frame_timestamps[cursor] != ts.value
+        ):
+            # the frame is not the next expected one, e.g., after seeking
+            cursor = np.searchsorted(self._frame_timestamps, ts.value)
+            if cursor >= len(self._frame_timestamps) or (
+                self._frame_timestamps[cursor] != ts.value
+            ):
+                return None
+
+        self._frame_cursor = cursor + 1
+        return cursor
+
+    def _get_data_index(self, ts: pd.Timestamp) -> int:
+        """Get the position of the data sample shown at the given timestamp with the semantics of calculate_index"""
+        position = self._get_frame_position(ts)
+        if position is None:
+            return calculate_indices(np.array([ts.value]), self._data.index)[0]
+        return self._frame_data_indices[position]
+
+    def _get_visible_range(self, ts: pd.Timestamp) -> Tuple[int, int]:
+        """
+        Get the start and stop position of the data samples shown by PUSH_IN at the given timestamp:
+        the samples in the window before the timestamp, up to and including the sample shown at the timestamp.
+        """
+        position = self._get_frame_position(ts)
+        if position is None:
+            start, index = calculate_indices(
+                np.array([ts.value - self.push_in_window.value, ts.value]),
+                self._data.index,
+            )
+        else:
+            start = self._frame_window_starts[position]
+            index = self._frame_data_indices[position]
+        return start, index + 1
 
     def set_offset(self, offset: pd.Timedelta):
         """
@@ -146,3 +883,64 @@ class GraphImageProvider:
             offset = pd.to_timedelta(self.sensor_config.offset_seconds, unit="s")
 
         self._data.index += offset
+
+    def get_raster_cache_key(self) -> str:
+        """
+        Get a hash of everything that determines the raster state of this provider apart from the figure:
+        the data with the applied offset, the graph groups, the titles, the plotting method and the annotation spans.
+        """
+        hasher = hashlib.sha256()
+        hasher.update(pd.util.hash_pandas_object(self._data, index=True).values)
+        starts_ns, ends_ns, colors = self._annotation_spans
+        hasher.update(starts_ns.tobytes())
+        hasher.update(ends_ns.tobytes())
+        hasher.update(
+            repr(
+                (
+                    list(self._data.columns),
+                    self._graph_groups,
+                    self.sensor_config.name,
+                    self.plotting_method.name,
+                    self.sensor_config.panel_type.name,
+                    self.scrolling_window.value,
+                    self.spectrogram_window.value,
+                    self.value_readout,
+                    self.group_line_colors,
+                    colors,
+                )
+            ).encode()
+        )
+        return hasher.hexdigest()
+
+    def get_raster_state(self) -> Dict:
+        """
+        Get the state that paint_graph_axes needs after prepare_raster,
+        so that a later render can restore it with set_raster_state instead of drawing a figure
+        """
+        return {
+            "axes": [
+                {name: getattr(render_axis, name) for name in RASTER_STATE_FIELDS}
+                for render_axis in self.__axs
+            ],
+            "glyph_scale": None if self._glyphs is None else self._glyphs.scale,
+        }
+
+    def set_raster_state(self, state: Dict):
+        """Restore the state of get_raster_state. The provider paints with paint_graph_axes without any axes."""
+        self.__axs = []
+        for axis_state in state["axes"]:
+            render_axis = RenderAxis(**axis_state)
+            render_axis.pyramid = self.__get_pyramid(render_axis.columns)
+            render_axis.values = self.__get_plotted_values(render_axis)
+            self.__axs.append(render_axis)
+        if state["glyph_scale"] is not None:
+            self._glyphs = GlyphCache(state["glyph_scale"])
+
+    def __getstate__(self) -> Dict:
+        """
+        Drop the assigned axes when pickling, e.g., to send this provider to a render worker process.
+        The worker has to assign new axes with set_axs.
+        """
+        state = self.__dict__.copy()
+        state["_GraphImageProvider__axs"] = []
+        return state
@@ -0,0 +1,84 @@
+"""Computes heatmap images of many sensor columns over time once, pooled to the pixel columns of an axis"""
+from typing import Tuple, Optional
+
+import cv2
+import numpy as np
+
+
+def compute_heatmap_image(
+    times_ns: np.ndarray,
+    values: np.ndarray,
+    x_transform: Tuple[float, float],
+    left: int,
+    width: int,
+    height: int,
+) -> np.ndarray:
+    """
+    Rasterize the values into a color-mapped RGB image with a row of cells per column of the values,
+    from the first column at the top to the last column at the bottom.
+    The values are converted to float32, the samples falling into the same pixel column are averaged,
+    and pixel columns without samples show the nearest pixel column with samples.
+    The colors span the minimum to the maximum of all averages, so that the columns of, e.g., a pressure mat
+    can be compared.
+
+    :param times_ns: sorted times of the samples in nanoseconds since the epoch
+    :param values: values of the samples with one column per heatmap row
+    :param x_transform: scale and offset that transform nanoseconds since the epoch into horizontal pixel coordinates
+    :param left: horizontal pixel coordinate of the first image column
+    :param width: width of the image in pixels
+    :param height: height of the image in pixels
+    :return: the image
+    """
+    values = values.reshape(len(times_ns), -1).astype(np.float32, copy=False)
+    row_count = values.shape[1]
+    scale, offset = x_transform
+    columns = np.floor(scale * times_ns + offset).astype(np.int64) - left
+    inside = (columns >= 0) & (columns < width)
+    columns, values = columns[inside], values[inside]
+
+    counts = np.bincount(columns, minlength=width)
+    nearest = get_nearest_filled_columns(counts)
+    if nearest is None:
+        return color_map(np.zeros((height, width), dtype=np.uint8))
+
+    # the times are sorted, so the samples of each pixel column are consecutive
+    starts = np.flatnonzero(np.diff(columns, prepend=-1))
+    finite = np.isfinite(values)
+    sums = np.zeros((width, row_count), dtype=np.float32)
+    finite_counts = np.zeros((width, row_count), dtype=np.int32)
+    sums[columns[starts]] = np.add.reduceat(
+        np.where(finite, values, 0), starts, dtype=np.float64
+    )
+    finite_counts[columns[starts]] = np.add.reduceat(finite, starts, dtype=np.int64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = (sums / finite_counts)[nearest].T
+
+    low, high = np.nanmin(means, initial=np.inf), np.nanmax(means, initial=-np.inf)
+    span = high - low if high > low else 1.0
+    levels = np.nan_to_num(np.clip((means - low) / span, 0, 1))
+    levels = np.round(levels * 255).astype(np.uint8)
+    interpolation = cv2.INTER_AREA if row_count > height else cv2.INTER_NEAREST
+    levels = cv2.resize(levels, (width, height), interpolation=interpolation)
+    return color_map(levels)
+
+
+def get_nearest_filled_columns(counts: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Get the position of the nearest pixel column with samples for each pixel column,
+    or None if no pixel column has samples
+
+    :param counts: number of samples in each pixel column
+    """
+    filled = np.flatnonzero(counts)
+    if len(filled) == 0:
+        return None
+    return filled[
+        np.round(
+            np.interp(np.arange(len(counts)), filled, np.arange(len(filled)))
+        ).astype(np.int64)
+    ]
+
+
+def color_map(levels: np.ndarray) -> np.ndarray:
+    """Map uint8 levels to RGB colors of the viridis color map"""
+    return cv2.applyColorMap(levels, cv2.COLORMAP_VIRIDIS)[..., ::-1]
@@ -0,0 +1,134 @@
+"""Multi-resolution min/max aggregates of sensor data, from which lines can be decimated for any window and width"""
+from typing import Dict, Tuple, Optional
+
+import numpy as np
+
+from .decimation import get_decimated_indices, SAMPLES_PER_PIXEL
+
+BUCKETS_PER_PIXEL = 4
+"""Minimum number of pyramid buckets per pixel column, so that buckets rarely straddle pixel column boundaries"""
+
+
+class MinMaxPyramid:
+    """
+    Positions of the minimum and maximum sample of each column in buckets of 2^k consecutive samples,
+    for all levels k > 0. Levels are computed lazily from the finest level already available,
+    so only the levels that are actually used take memory.
+    """
+
+    def __init__(self, values: np.ndarray):
+        """
+        :param values: values of the samples with one column per line
+        """
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+        self.values = values
+        self._levels: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        """Maps levels to the positions of the minimum and maximum samples of their buckets and columns"""
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def get_level(self, level: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the positions of the minimum and maximum sample of each column in each bucket of 2^level samples.
+        Both arrays have a row per bucket and a column per value column. The last bucket may be partial.
+        NaN samples are only chosen if all samples of a bucket are NaN.
+        """
+        if level in self._levels:
+            return self._levels[level]
+
+        finer = max((k for k in self._levels if k < level), default=0)
+        if finer == 0:
+            finer_min = finer_max = np.broadcast_to(
+                np.arange(len(self))[:, np.newaxis], self.values.shape
+            )
+        else:
+            finer_min, finer_max = self._levels[finer]
+        group = 2 ** (level - finer)
+        self._levels[level] = (
+            self.__reduce(finer_min, group, np.argmin, np.inf),
+            self.__reduce(finer_max, group, np.argmax, -np.inf),
+        )
+        return self._levels[level]
+
+    def __reduce(
+        self, positions: np.ndarray, group: int, arg_function, nan_replacement: float
+    ) -> np.ndarray:
+        """Choose the position of the extreme value from each group of consecutive rows of positions"""
+        bucket_count = -(-len(positions) // group)
+        # repeat the last position to fill up the last group
+        padding = bucket_count * group - len(positions)
+        positions = np.concatenate([positions, np.repeat(positions[-1:], padding, 0)])
+        grouped = positions.reshape(bucket_count, group, -1)
+
+        columns = np.arange(self.values.shape[1])
+        values = self.values[grouped, columns]
+        values = np.where(np.isnan(values), nan_replacement, values)
+        chosen = arg_function(values, axis=1)
+        return np.take_along_axis(grouped, chosen[:, np.newaxis], axis=1)[:, 0]
+
+    def get_indices(
+        self, start: int, stop: int, bucket_size: int, column: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Get the sorted positions of samples in [start, stop) that contain the first and last sample, and the minimum
+        and maximum sample of each column, or only of the given column, within buckets of at most bucket_size samples.
+        Full buckets are served from the coarsest adequate level, so the number of positions is proportional to
+        (stop - start) / bucket_size, plus the samples of the partial buckets at the edges.
+        """
+        level = int(np.floor(np.log2(bucket_size))) if bucket_size >= 2 else 0
+        size = 2**level
+        first_bucket = -(-start // size)
+        stop_bucket = stop // size
+        if level == 0 or first_bucket >= stop_bucket:
+            return np.arange(start, stop)
+
+        minima, maxima = self.get_level(level)
+        if column is not None:
+            minima, maxima = minima[:, column], maxima[:, column]
+        return np.unique(
+            np.concatenate(
+                [
+                    np.arange(start, first_bucket * size),
+                    minima[first_bucket:stop_bucket].ravel(),
+                    maxima[first_bucket:stop_bucket].ravel(),
+                    np.arange(stop_bucket * size, stop),
+                ]
+            )
+        )
+
+    def get_decimated_indices(
+        self,
+        times_ns: np.ndarray,
+        start: int,
+        stop: int,
+        x_transform: Tuple[float, float],
+        column: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Get the positions of the samples in [start, stop) that have to be plotted so that the lines look like lines
+        of all samples at the resolution given by x_transform, see decimation.get_decimated_indices.
+        The positions are shared by the lines of all columns, or only needed for the line of the given column.
+        The time spent depends on the number of pixels rather than on the number of samples.
+
+        :param times_ns: sorted times of the samples in nanoseconds since the epoch
+        :param start: position of the first sample of the window
+        :param stop: position after the last sample of the window
+        :param x_transform: scale and offset that transform nanoseconds since the epoch into horizontal pixel
+                            coordinates
+        :param column: position of the only column whose line is plotted with the positions, or None for all columns
+        """
+        if stop - start < 2:
+            return np.arange(start, stop)
+        pixel_count = abs(times_ns[stop - 1] - times_ns[start]) * x_transform[0] + 1
+        bucket_size = int((stop - start) / (pixel_count * BUCKETS_PER_PIXEL))
+        if bucket_size < SAMPLES_PER_PIXEL:
+            candidates = np.arange(start, stop)
+        else:
+            candidates = self.get_indices(start, stop, bucket_size, column)
+        values = self.values if column is None else self.values[:, column]
+        kept = get_decimated_indices(
+            times_ns[candidates], values[candidates], x_transform
+        )
+        return candidates[kept]
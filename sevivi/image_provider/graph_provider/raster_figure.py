@@ -0,0 +1,711 @@
+"""
+A lightweight stand-in for the matplotlib figures, axes and lines used by the graph providers.
+It draws axes, ticks, titles, lines and vlines directly into a numpy buffer with OpenCV primitives, which is much
+faster to set up and to draw than matplotlib's Agg pipeline, and does not need pyplot.
+Only the subset of the matplotlib API used by GraphImageProvider and VideoRenderer is implemented.
+"""
+from datetime import datetime
+from math import ceil, floor, log10
+from typing import Any, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import pandas as pd
+from matplotlib.colors import to_rgba
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+LINE_WIDTH = 1.5
+"""Width of plotted lines in points, like the matplotlib default"""
+SPINE_WIDTH = 0.8
+"""Width of the axis spines and ticks in points, like the matplotlib default"""
+TICK_LENGTH = 3.5
+"""Length of the ticks in points, also the padding between ticks and their labels"""
+TICK_FONT_SCALE = 0.45
+"""OpenCV font scale of the tick labels at 100 dpi"""
+TITLE_FONT_SCALE = 0.55
+"""OpenCV font scale of the titles at 100 dpi"""
+TITLE_PAD = 6.0
+"""Distance between the axis and its title in points"""
+
+MARGINS = (40.0, 24.0, 16.0, 24.0)
+"""Left, top, right and bottom space in points between the interior of each axis and the edges of its subplot"""
+MIN_TICK_SPACING = (72.0, 24.0)
+"""Minimum horizontal and vertical distance between ticks in points"""
+
+TICK_STEPS = (1.0, 2.0, 2.5, 5.0, 10.0)
+"""Multiples of powers of ten used as distance between ticks"""
+TIME_TICK_STEPS = (1, 2, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800, 3600)
+"""Distances between ticks in seconds on datetime x axes, for distances of at least a second"""
+
+SUBPIXEL_BITS = 4
+"""Fractional bits of the line coordinates passed to OpenCV"""
+
+
+def points_to_pixels(points: float, dpi: float) -> float:
+    """Convert a length in points into pixels"""
+    return points * dpi / 72
+
+
+def to_rgba_pixel(color: Any) -> Tuple[int, int, int, int]:
+    """Convert a matplotlib color into an RGBA uint8 pixel"""
+    return tuple(int(round(channel * 255)) for channel in to_rgba(color))
+
+
+def convert_x(x: Any) -> Tuple[np.ndarray, bool]:
+    """
+    Convert x values into floats: datetimes become nanoseconds since the epoch.
+    Returns the converted values and whether they were datetimes.
+    """
+    if isinstance(x, (pd.Timestamp, datetime, np.datetime64)):
+        return np.array(float(pd.Timestamp(x).value)), True
+    values = np.asarray(x)
+    if values.dtype == object and values.size > 0:
+        if isinstance(values.flat[0], (pd.Timestamp, datetime, np.datetime64)):
+            values = pd.DatetimeIndex(values.ravel()).values.reshape(values.shape)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(float), True
+    return values.astype(float), False
+
+
+def get_ticks(
+    low: float, high: float, max_count: int, steps: Tuple[float, ...] = TICK_STEPS
+) -> Tuple[np.ndarray, float]:
+    """
+    Get at most max_count ticks between low and high at multiples of a round step, and the step.
+    The steps are multiples of powers of ten, or the given steps if one of them is large enough.
+    """
+    span = high - low
+    if not np.isfinite(span) or not span > 0:
+        return np.array([low]), 1.0
+    raw_step = span / max(1, max_count)
+    step = next((s for s in steps if s >= raw_step), None)
+    if step is None:
+        magnitude = 10 ** floor(log10(raw_step))
+        step = next(s * magnitude for s in TICK_STEPS if s * magnitude >= raw_step)
+    first = ceil(low / step - 1e-9)
+    last = floor(high / step + 1e-9)
+    return np.arange(first, last + 1) * step, step
+
+
+def get_decimals(step: float) -> int:
+    """Get the number of decimals needed to tell apart ticks at the given distance"""
+    decimals = 0
+    while decimals < 10 and abs(round(step, decimals) - step) > step * 1e-6:
+        decimals += 1
+    return decimals
+
+
+def format_ticks(ticks: np.ndarray, step: float) -> List[str]:
+    """Format numeric tick values with as many decimals as their distance needs"""
+    decimals = get_decimals(step)
+    # adding zero turns a rounded -0.0 into 0.0
+    return [f"{round(tick, decimals) + 0.0:.{decimals}f}" for tick in ticks]
+
+
+def format_time_ticks(ticks_ns: np.ndarray, step_ns: float) -> List[str]:
+    """Format datetime ticks given in nanoseconds since the epoch as time of day"""
+    decimals = get_decimals(step_ns / 1e9) if step_ns < 1e9 else 0
+    labels = []
+    for tick in pd.to_datetime(np.round(ticks_ns).astype(np.int64), unit="ns"):
+        label = tick.strftime("%H:%M:%S")
+        if decimals > 0:
+            label += f"{tick.microsecond / 1e6:.{decimals}f}"[1:]
+        labels.append(label)
+    return labels
+
+
+def get_vertex_normals(points: np.ndarray) -> np.ndarray:
+    """Get the unit normal at each point of a polyline, averaged over its adjacent segments"""
+    directions = np.diff(points, axis=0)
+    normals = np.column_stack([-directions[:, 1], directions[:, 0]])
+    vertex_normals = np.zeros_like(points)
+    vertex_normals[:-1] += normalize(normals)
+    vertex_normals[1:] += normalize(normals)
+    return normalize(vertex_normals)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale the vectors to unit length. Vectors of length zero stay zero."""
+    lengths = np.hypot(vectors[:, 0], vectors[:, 1])[:, np.newaxis]
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
+
+
+def blend_spans(
+    image: np.ndarray,
+    starts: np.ndarray,
+    stops: np.ndarray,
+    colors: np.ndarray,
+    alpha: float,
+):
+    """
+    Blend the colors over the image columns [start, stop) of each span, clipped to the image.
+
+    :param image: the image, whose channels match the colors
+    :param starts: first column of each span
+    :param stops: end column of each span
+    :param colors: uint8 color of each span
+    :param alpha: opacity of the colors
+    """
+    weight = int(round(alpha * 256))
+    width = image.shape[1]
+    starts = np.clip(starts, 0, width)
+    stops = np.clip(stops, 0, width)
+    for start, stop, color in zip(starts, stops, colors):
+        if stop <= start:
+            continue
+        region = image[:, start:stop]
+        blended = (
+            region.astype(np.uint16) * (256 - weight) + color.astype(np.uint16) * weight
+        )
+        region[:] = blended >> 8
+
+
+def draw_polyline(
+    image: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    color: Tuple[int, ...],
+    thickness: int,
+):
+    """
+    Draw an antialiased line through the given pixel coordinates into the image.
+    Points with NaN coordinates split the line, like in matplotlib.
+    Thick lines are drawn as thin lines offset along the normals of the line, which is several times faster than
+    OpenCV's thick antialiased lines and closer to the line widths of matplotlib.
+    """
+    finite = np.isfinite(x) & np.isfinite(y)
+    # avoid overflows of the fixed point coordinates of points far outside of the image
+    limit = 2 ** (30 - SUBPIXEL_BITS) - thickness
+    points = np.column_stack([np.clip(x, -limit, limit), np.clip(y, -limit, limit)])
+    if finite.all():
+        segments = [points]
+    else:
+        breaks = np.flatnonzero(np.diff(finite)) + 1
+        segments = [
+            segment
+            for segment, segment_finite in zip(
+                np.split(points, breaks), np.split(finite, breaks)
+            )
+            if segment_finite[0]
+        ]
+    segments = [segment for segment in segments if len(segment) > 1]
+    if len(segments) == 0:
+        return
+
+    offsets = np.arange(thickness) - (thickness - 1) / 2
+    normals = [get_vertex_normals(segment) for segment in segments]
+    for offset in offsets:
+        cv2.polylines(
+            image,
+            [
+                np.round(
+                    (segment + offset * segment_normals) * (1 << SUBPIXEL_BITS)
+                ).astype(np.int32)
+                for segment, segment_normals in zip(segments, normals)
+            ],
+            False,
+            color,
+            1,
+            cv2.LINE_AA,
+            SUBPIXEL_BITS,
+        )
+
+
+class Bbox:
+    """Rectangle in display coordinates, which go from the bottom left to the top right of the figure"""
+
+    def __init__(self, x0: float, y0: float, x1: float, y1: float):
+        self.x0, self.y0, self.x1, self.y1 = x0, y0, x1, y1
+
+    @property
+    def extents(self) -> Tuple[float, float, float, float]:
+        return self.x0, self.y0, self.x1, self.y1
+
+    @property
+    def width(self) -> float:
+        return self.x1 - self.x0
+
+    @property
+    def height(self) -> float:
+        return self.y1 - self.y0
+
+
+class DataTransform:
+    """Transforms data coordinates of an axis into display coordinates"""
+
+    def __init__(self, axes: "RasterAxes"):
+        self.axes = axes
+
+    def transform(self, points: Any) -> np.ndarray:
+        points = np.asarray(points, dtype=float)
+        bbox = self.axes.bbox
+        (x0, x1), (y0, y1) = self.axes.get_xlim(), self.axes.get_ylim()
+        scale = np.array([bbox.width / (x1 - x0), bbox.height / (y1 - y0)])
+        return (points - np.array([x0, y0])) * scale + np.array([bbox.x0, bbox.y0])
+
+
+class XAxis:
+    """The x axis of RasterAxes, which converts datetimes into nanoseconds since the epoch"""
+
+    def __init__(self, axes: "RasterAxes"):
+        self.axes = axes
+
+    def convert_units(self, x: Any) -> np.ndarray:
+        return convert_x(x)[0]
+
+
+class Spine:
+    """An edge of the axis interior"""
+
+    def __init__(self, linewidth: float = SPINE_WIDTH):
+        self.linewidth = linewidth
+
+    def get_linewidth(self) -> float:
+        return self.linewidth
+
+
+class RasterLine:
+    """A line of RasterAxes, or a vline spanning the axis height if vertical is True"""
+
+    def __init__(
+        self,
+        axes: "RasterAxes",
+        x: Any,
+        y: Any,
+        color: Any,
+        linewidth: float = LINE_WIDTH,
+        animated: bool = False,
+        vertical: bool = False,
+    ):
+        self.axes = axes
+        self.color = color
+        self.linewidth = linewidth
+        self.animated = animated
+        self.vertical = vertical
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+        self.set_data(x, y)
+
+    def set_data(self, x: Any, y: Any):
+        self.set_xdata(x)
+        self._y = np.asarray(y, dtype=float)
+
+    def set_xdata(self, x: Any):
+        self._x, is_datetime = convert_x(x)
+        if is_datetime:
+            self.axes.x_is_datetime = True
+
+    def get_xdata(self) -> np.ndarray:
+        return self._x
+
+    def get_ydata(self) -> np.ndarray:
+        return self._y
+
+    def get_color(self) -> Any:
+        return self.color
+
+    def get_linewidth(self) -> float:
+        return self.linewidth
+
+    def get_animated(self) -> bool:
+        return self.animated
+
+    def draw(self, image: np.ndarray):
+        """Draw the line into the RGBA figure image, clipped to the interior of its axis"""
+        axes = self.axes
+        left, top, right, bottom = axes.get_pixel_bounds()
+        interior = image[top:bottom, left:right]
+        thickness = max(
+            1, int(round(points_to_pixels(self.linewidth, axes.figure.dpi)))
+        )
+        if self.vertical:
+            x = axes.transData.transform(
+                np.column_stack([self._x.ravel()[:1], np.zeros(1)])
+            )[0, 0]
+            x = np.array([x, x]) - left - 0.5
+            y = np.array([-thickness, bottom - top + thickness], dtype=float)
+        else:
+            display = axes.transData.transform(np.column_stack([self._x, self._y]))
+            # pixel centers are half a pixel from the pixel edges of the display coordinates
+            x = display[:, 0] - left - 0.5
+            y = axes.figure.bbox.height - display[:, 1] - top - 0.5
+        draw_polyline(interior, x, y, to_rgba_pixel(self.color), thickness)
+
+
+class RasterAxes:
+    """An axis of a RasterFigure with the plotting methods of matplotlib axes used by the graph providers"""
+
+    def __init__(self, figure: "RasterFigure", bbox: Bbox):
+        self.figure = figure
+        self.bbox = bbox
+        self.transData = DataTransform(self)
+        self.xaxis = XAxis(self)
+        self.spines = {name: Spine() for name in ("left", "right", "bottom", "top")}
+        self.x_is_datetime = False
+        """Whether the x axis shows datetimes, which are labeled as time of day"""
+        self._xlim = (0.0, 1.0)
+        self._ylim = (0.0, 1.0)
+        self._title = ""
+        self._facecolor = "white"
+        self._lines: List[RasterLine] = []
+        self._images: List[Tuple[np.ndarray, Tuple[float, float, float, float]]] = []
+        self._yticks: Optional[Tuple[np.ndarray, List[str]]] = None
+        self._spans: List[Tuple[np.ndarray, np.ndarray, List[Any], float]] = []
+
+    @staticmethod
+    def __nonsingular(low: float, high: float) -> Tuple[float, float]:
+        """Expand equal limits, so that the transforms stay finite"""
+        if low == high:
+            delta = abs(low) * 0.05 if low != 0 else 0.05
+            return low - delta, high + delta
+        return low, high
+
+    def set_xlim(self, left: Any, right: Any):
+        (left, right), is_datetime = convert_x([left, right])
+        self.x_is_datetime = self.x_is_datetime or is_datetime
+        self._xlim = self.__nonsingular(float(left), float(right))
+
+    def get_xlim(self) -> Tuple[float, float]:
+        return self._xlim
+
+    def set_ylim(self, bottom: float, top: Optional[float] = None):
+        if top is None:
+            bottom, top = bottom
+        self._ylim = self.__nonsingular(float(bottom), float(top))
+
+    def get_ylim(self) -> Tuple[float, float]:
+        return self._ylim
+
+    def set_title(self, title: str):
+        self._title = title
+
+    def get_title(self) -> str:
+        return self._title
+
+    def get_facecolor(self) -> Tuple[float, float, float, float]:
+        return to_rgba(self._facecolor)
+
+    def get_lines(self) -> List[RasterLine]:
+        return [line for line in self._lines if not line.vertical]
+
+    def plot(self, x: Any, y: Any, color: Any = None, animated: bool = False):
+        """Add a line through the given points. Returns a list with the line, like matplotlib."""
+        if color is None:
+            color = f"C{len(self.get_lines()) % 10}"
+        line = RasterLine(self, x, y, color, animated=animated)
+        self._lines.append(line)
+        return [line]
+
+    def set_yticks(self, ticks: Any, labels: Optional[List[str]] = None):
+        """Show ticks at the given values instead of automatic ticks, labeled with the labels or their values"""
+        ticks = np.asarray(ticks, dtype=float)
+        if labels is None:
+            labels = format_ticks(ticks, np.min(np.diff(ticks), initial=1.0))
+        self._yticks = (ticks, list(labels))
+
+    def add_line_collection(
+        self, segments: List[np.ndarray], colors: List[Any], linewidth: float
+    ):
+        """Add lines through the given arrays of (x, y) data coordinates"""
+        for segment, color in zip(segments, colors):
+            self._lines.append(
+                RasterLine(self, segment[:, 0], segment[:, 1], color, linewidth)
+            )
+
+    def add_spans(
+        self, x0: np.ndarray, x1: np.ndarray, colors: List[Any], alpha: float
+    ):
+        """Add vertical spans between the given x data coordinates that cover the height of the axis"""
+        self._spans.append((np.asarray(x0), np.asarray(x1), list(colors), alpha))
+
+    def imshow(
+        self,
+        image: np.ndarray,
+        extent: Tuple[float, float, float, float],
+        aspect: str = "auto",
+        interpolation: str = "nearest",
+    ):
+        """
+        Add an RGB image covering the given left, right, bottom and top data coordinates.
+        The image is scaled to its extent with nearest neighbor interpolation.
+        """
+        self._images.append((np.asarray(image), extent))
+
+    def axvline(self, x: Any = 0, color: Any = "C0", animated: bool = False):
+        """Add a vertical line spanning the height of the axis at the given x"""
+        line = RasterLine(self, [x, x], [0, 1], color, animated=animated, vertical=True)
+        self._lines.append(line)
+        return line
+
+    def draw_artist(self, line: RasterLine):
+        """Draw a single line into the canvas of the figure, e.g., an animated line"""
+        line.draw(self.figure.canvas.buffer_rgba())
+
+    def get_pixel_bounds(self) -> Tuple[int, int, int, int]:
+        """Get the left, top, right and bottom pixel coordinates of the axis interior in the figure image"""
+        height = int(self.figure.bbox.height)
+        return (
+            int(round(self.bbox.x0)),
+            height - int(round(self.bbox.y1)),
+            int(round(self.bbox.x1)),
+            height - int(round(self.bbox.y0)),
+        )
+
+    def draw(self, image: np.ndarray):
+        """Draw the interior, the lines that are not animated, the spines, the ticks and the title"""
+        left, top, right, bottom = self.get_pixel_bounds()
+        image[top:bottom, left:right] = to_rgba_pixel(self._facecolor)
+        for rgb, extent in self._images:
+            self.__draw_image(image, rgb, extent)
+        for x0, x1, colors, alpha in self._spans:
+            self.__draw_spans(image, x0, x1, colors, alpha)
+        for line in self._lines:
+            if not line.animated:
+                line.draw(image)
+
+        dpi = self.figure.dpi
+        black = (0, 0, 0, 255)
+        spine_width = max(1, int(round(points_to_pixels(SPINE_WIDTH, dpi))))
+        cv2.rectangle(image, (left, top), (right - 1, bottom - 1), black, spine_width)
+        self.__draw_ticks(image, dpi, black, spine_width)
+
+        if self._title != "":
+            font_scale = TITLE_FONT_SCALE * dpi / 100
+            thickness = max(1, int(round(dpi / 100)))
+            (width, _), _ = cv2.getTextSize(self._title, FONT, font_scale, thickness)
+            baseline_y = top - int(round(points_to_pixels(TITLE_PAD, dpi)))
+            cv2.putText(
+                image,
+                self._title,
+                ((left + right - width) // 2, baseline_y),
+                FONT,
+                font_scale,
+                black,
+                thickness,
+                cv2.LINE_AA,
+            )
+
+    def __draw_spans(
+        self,
+        image: np.ndarray,
+        x0: np.ndarray,
+        x1: np.ndarray,
+        colors: List[Any],
+        alpha: float,
+    ):
+        """Blend vertical spans into the RGBA figure image, clipped to the axis interior"""
+        left, top, right, bottom = self.get_pixel_bounds()
+        zeros = np.zeros(len(x0))
+        starts = self.transData.transform(np.column_stack([x0, zeros]))[:, 0]
+        stops = self.transData.transform(np.column_stack([x1, zeros]))[:, 0]
+        # spans cover the pixels whose centers they contain
+        blend_spans(
+            image[top:bottom, left:right],
+            np.round(starts).astype(np.int64) - left,
+            np.round(stops).astype(np.int64) - left,
+            np.array([to_rgba_pixel(color) for color in colors], dtype=np.uint8),
+            alpha,
+        )
+
+    def __draw_image(
+        self,
+        image: np.ndarray,
+        rgb: np.ndarray,
+        extent: Tuple[float, float, float, float],
+    ):
+        """Draw an RGB image scaled to its extent into the RGBA figure image, clipped to the axis interior"""
+        left, top, right, bottom = self.get_pixel_bounds()
+        x0, x1, y0, y1 = extent
+        corners = self.transData.transform([(x0, y1), (x1, y0)])
+        image_left, image_right = np.round(corners[:, 0]).astype(int)
+        image_top, image_bottom = np.round(
+            self.figure.bbox.height - corners[:, 1]
+        ).astype(int)
+        if image_right <= image_left or image_bottom <= image_top:
+            return
+        scaled = cv2.resize(
+            rgb,
+            (image_right - image_left, image_bottom - image_top),
+            interpolation=cv2.INTER_NEAREST,
+        )
+        x_start, x_stop = max(left, image_left), min(right, image_right)
+        y_start, y_stop = max(top, image_top), min(bottom, image_bottom)
+        if x_start < x_stop and y_start < y_stop:
+            image[y_start:y_stop, x_start:x_stop, :3] = scaled[
+                y_start - image_top : y_stop - image_top,
+                x_start - image_left : x_stop - image_left,
+            ]
+
+    def __draw_ticks(
+        self,
+        image: np.ndarray,
+        dpi: float,
+        color: Tuple[int, ...],
+        thickness: int,
+    ):
+        """Draw the ticks and tick labels of both axes outside of the axis interior"""
+        left, top, right, bottom = self.get_pixel_bounds()
+        tick_length = int(round(points_to_pixels(TICK_LENGTH, dpi)))
+        font_scale = TICK_FONT_SCALE * dpi / 100
+        font_thickness = max(1, int(round(dpi / 100)))
+        min_x_spacing, min_y_spacing = (
+            points_to_pixels(spacing, dpi) for spacing in MIN_TICK_SPACING
+        )
+
+        x0, x1 = self._xlim
+        max_count = max(2, int((right - left) / min_x_spacing))
+        if self.x_is_datetime:
+            ticks, step = get_ticks(x0 / 1e9, x1 / 1e9, max_count, TIME_TICK_STEPS)
+            ticks, step = ticks * 1e9, step * 1e9
+            labels = format_time_ticks(ticks, step)
+        else:
+            ticks, step = get_ticks(x0, x1, max_count)
+            labels = format_ticks(ticks, step)
+        positions = self.transData.transform(
+            np.column_stack([ticks, np.zeros(len(ticks))])
+        )[:, 0]
+        for position, label in zip(positions, labels):
+            x = int(round(position - 0.5))
+            cv2.line(image, (x, bottom), (x, bottom + tick_length), color, thickness)
+            (width, height), _ = cv2.getTextSize(
+                label, FONT, font_scale, font_thickness
+            )
+            cv2.putText(
+                image,
+                label,
+                (x - width // 2, bottom + 2 * tick_length + height),
+                FONT,
+                font_scale,
+                color,
+                font_thickness,
+                cv2.LINE_AA,
+            )
+
+        if self._yticks is None:
+            y0, y1 = self._ylim
+            max_count = max(2, int((bottom - top) / min_y_spacing))
+            ticks, step = get_ticks(min(y0, y1), max(y0, y1), max_count)
+            labels = format_ticks(ticks, step)
+        else:
+            ticks, labels = self._yticks
+        positions = self.transData.transform(
+            np.column_stack([np.zeros(len(ticks)), ticks])
+        )[:, 1]
+        for position, label in zip(positions, labels):
+            y = int(round(self.figure.bbox.height - position - 0.5))
+            cv2.line(image, (left - tick_length, y), (left, y), color, thickness)
+            (width, height), _ = cv2.getTextSize(
+                label, FONT, font_scale, font_thickness
+            )
+            cv2.putText(
+                image,
+                label,
+                (left - 2 * tick_length - width, y + height // 2),
+                FONT,
+                font_scale,
+                color,
+                font_thickness,
+                cv2.LINE_AA,
+            )
+
+    def render_panorama(
+        self,
+        times_ns: np.ndarray,
+        values: np.ndarray,
+        colors: List[str],
+        height: int,
+        px_per_ns: float,
+        start_ns: int,
+        stop_ns: int,
+        dpi: float,
+    ) -> np.ndarray:
+        """Render lines into a BGR panorama that continues this axis horizontally, see utils.render_panorama"""
+        width = int(ceil((stop_ns - start_ns) * px_per_ns))
+        panorama = np.empty((height, width, 3), dtype=np.uint8)
+        panorama[:] = to_rgba_pixel(self._facecolor)[2::-1]
+
+        y0, y1 = self._ylim
+        x = (times_ns - start_ns) * px_per_ns - 0.5
+        thickness = max(1, int(round(points_to_pixels(LINE_WIDTH, dpi))))
+        for col_idx, color in enumerate(colors):
+            y = (y1 - values[:, col_idx]) * (height / (y1 - y0)) - 0.5
+            draw_polyline(panorama, x, y, to_rgba_pixel(color)[2::-1], thickness)
+        return panorama
+
+
+class RasterCanvas:
+    """The RGBA image of a RasterFigure, with the blitting methods of the matplotlib Agg canvas"""
+
+    def __init__(self, figure: "RasterFigure"):
+        self.figure = figure
+        self._buffer = np.zeros(
+            (int(figure.bbox.height), int(figure.bbox.width), 4), dtype=np.uint8
+        )
+
+    def draw(self):
+        """Draw the figure background and all axes without their animated lines"""
+        self._buffer[:] = to_rgba_pixel(self.figure.facecolor)
+        for ax in self.figure.axes:
+            ax.draw(self._buffer)
+
+    def buffer_rgba(self) -> np.ndarray:
+        return self._buffer
+
+    def copy_from_bbox(self, bbox: Bbox) -> Tuple[slice, slice, np.ndarray]:
+        """Copy the pixels of the given rectangle, so that they can be restored with restore_region"""
+        height = self._buffer.shape[0]
+        rows = slice(height - int(round(bbox.y1)), height - int(round(bbox.y0)))
+        columns = slice(int(round(bbox.x0)), int(round(bbox.x1)))
+        return rows, columns, self._buffer[rows, columns].copy()
+
+    def restore_region(self, region: Tuple[slice, slice, np.ndarray]):
+        rows, columns, pixels = region
+        self._buffer[rows, columns] = pixels
+
+
+class RasterFigure:
+    """A figure of RasterAxes that draws into a numpy buffer"""
+
+    def __init__(self, width: int, height: int, dpi: float, facecolor: Any = "white"):
+        """
+        :param width: width of the figure image in pixels
+        :param height: height of the figure image in pixels
+        :param dpi: resolution of the figure, which scales line widths, font sizes and margins
+        :param facecolor: color of the figure background
+        """
+        self.dpi = dpi
+        self.facecolor = facecolor
+        self.bbox = Bbox(0, 0, width, height)
+        self.axes: List[RasterAxes] = []
+        self.canvas = RasterCanvas(self)
+
+    def add_axes(self, bbox: Bbox) -> RasterAxes:
+        """Add an axis whose interior covers the given rectangle in display coordinates"""
+        ax = RasterAxes(self, bbox)
+        self.axes.append(ax)
+        return ax
+
+
+def create_raster_subplots(
+    rows: int, columns: int, width: int, height: int, dpi: float
+) -> Tuple[RasterFigure, np.ndarray]:
+    """
+    Create a figure with a grid of axes, like pyplot.subplots with squeeze=False followed by tight_layout.
+    The margins around the axes leave space for the ticks and titles, and scale with the dpi.
+
+    :return: the figure and an array of its axes with the shape (rows, columns)
+    """
+    figure = RasterFigure(width, height, dpi)
+    left, top, right, bottom = (points_to_pixels(m, dpi) for m in MARGINS)
+    cell_width, cell_height = width / columns, height / rows
+    axs = np.empty((rows, columns), dtype=object)
+    for row in range(rows):
+        for column in range(columns):
+            # integer coordinates keep the axis interior aligned to the pixel grid
+            x0 = round(column * cell_width + left)
+            x1 = max(x0 + 1, round((column + 1) * cell_width - right))
+            y1 = round(height - row * cell_height - top)
+            y0 = min(y1 - 1, round(height - (row + 1) * cell_height + bottom))
+            axs[row, column] = figure.add_axes(Bbox(x0, y0, x1, y1))
+    return figure, axs
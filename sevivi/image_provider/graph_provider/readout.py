@@ -0,0 +1,158 @@
+"""Paints the current value of each line as a marker and a numeric label from pre-rasterized glyphs"""
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+READOUT_CHARACTERS = "0123456789.-+eainf"
+"""Characters that may appear in formatted readout values"""
+
+
+class GlyphCache:
+    """
+    Rasterizes the readout characters and the marker once, so that painting a label only blends small masks
+    into the image instead of rendering text.
+    """
+
+    def __init__(self, scale: float = 1.0):
+        """
+        :param scale: factor applied to the glyph and marker sizes, e.g., the scale of preview renders
+        """
+        self.scale = scale
+        self.font_scale = 0.4 * scale
+        self.thickness = max(1, int(round(scale)))
+        self.marker_radius = max(2, int(round(3 * scale)))
+        (_, self.height), self.baseline = cv2.getTextSize(
+            "0", cv2.FONT_HERSHEY_SIMPLEX, self.font_scale, self.thickness
+        )
+        self.height += self.baseline
+        self.glyphs: Dict[str, np.ndarray] = {
+            char: self.__rasterize(char) for char in READOUT_CHARACTERS
+        }
+        self.marker = self.__rasterize_marker()
+
+    def __rasterize(self, char: str) -> np.ndarray:
+        """Get the antialiased coverage of a character as float mask"""
+        (width, _), _ = cv2.getTextSize(
+            char, cv2.FONT_HERSHEY_SIMPLEX, self.font_scale, self.thickness
+        )
+        mask = np.zeros((self.height, width + 1), dtype=np.uint8)
+        cv2.putText(
+            mask,
+            char,
+            (0, self.height - self.baseline),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            self.font_scale,
+            255,
+            self.thickness,
+            cv2.LINE_AA,
+        )
+        return mask.astype(np.float32) / 255
+
+    def __rasterize_marker(self) -> np.ndarray:
+        """Get the antialiased coverage of a filled circle as float mask"""
+        size = 2 * self.marker_radius + 1
+        mask = np.zeros((size, size), dtype=np.uint8)
+        cv2.circle(
+            mask,
+            (self.marker_radius, self.marker_radius),
+            self.marker_radius,
+            255,
+            -1,
+            cv2.LINE_AA,
+        )
+        return mask.astype(np.float32) / 255
+
+    def get_label(self, text: str) -> np.ndarray:
+        """Get the coverage mask of a text made from the cached glyphs. Unknown characters are skipped."""
+        return np.hstack([self.glyphs[char] for char in text if char in self.glyphs])
+
+
+def format_value(value: float) -> str:
+    """Format a readout value with a fixed number of significant digits"""
+    return f"{value:.3g}"
+
+
+def clip(
+    left: int, top: int, width: int, height: int, bounds: Tuple[int, int, int, int]
+) -> Tuple[int, int, int, int]:
+    """Clip a rectangle to the bounds. Returns its left, top, right and bottom, which may be empty."""
+    b_left, b_top, b_right, b_bottom = bounds
+    x0, y0 = max(left, b_left), max(top, b_top)
+    return (
+        x0,
+        y0,
+        max(x0, min(left + width, b_right)),
+        max(y0, min(top + height, b_bottom)),
+    )
+
+
+def blend(
+    image: np.ndarray,
+    mask: np.ndarray,
+    left: int,
+    top: int,
+    color: np.ndarray,
+    bounds: Tuple[int, int, int, int],
+) -> Tuple[int, int, int, int]:
+    """
+    Blend the color into the image with the coverage mask placed at the given position, clipped to the bounds.
+    Returns the left, top, right and bottom of the changed region.
+    """
+    x0, y0, x1, y1 = clip(left, top, mask.shape[1], mask.shape[0], bounds)
+    alpha = mask[y0 - top : y1 - top, x0 - left : x1 - left, np.newaxis]
+    region = image[y0:y1, x0:x1]
+    region[:] = region * (1 - alpha) + color * alpha
+    return x0, y0, x1, y1
+
+
+def paint_readout(
+    image: np.ndarray,
+    glyphs: GlyphCache,
+    x: int,
+    ys: np.ndarray,
+    values: np.ndarray,
+    colors: List[np.ndarray],
+    background: np.ndarray,
+    bounds: Tuple[int, int, int, int],
+) -> Tuple[int, int]:
+    """
+    Paint a marker at (x, y) and a label with the value next to it for each line, clipped to the bounds.
+    Labels are placed right of the marker, or left of it if there is not enough space.
+    Lines with NaN values are skipped.
+
+    :param image: BGR image to paint into
+    :param glyphs: the glyph cache to paint with
+    :param x: horizontal pixel coordinate of the markers
+    :param ys: vertical pixel coordinate of the marker of each line
+    :param values: current value of each line
+    :param colors: BGR color of each line
+    :param background: BGR color behind the labels
+    :param bounds: left, top, right and bottom of the region that may be painted
+    :return: the left and right of the changed columns
+    """
+    radius = glyphs.marker_radius
+    changed_left, changed_right = x, x
+    for y, value, color in zip(ys, values, colors):
+        if np.isnan(value):
+            continue
+        y = int(y)
+        x0, _, x1, _ = blend(
+            image, glyphs.marker, x - radius, y - radius, color, bounds
+        )
+        changed_left, changed_right = min(changed_left, x0), max(changed_right, x1)
+
+        label = glyphs.get_label(format_value(value))
+        label_left = x + radius + 2
+        if label_left + label.shape[1] > bounds[2]:
+            label_left = x - radius - 2 - label.shape[1]
+        label_top = min(
+            max(y - label.shape[0] // 2, bounds[1]), bounds[3] - label.shape[0]
+        )
+        x0, y0, x1, y1 = clip(
+            label_left, label_top, label.shape[1], label.shape[0], bounds
+        )
+        image[y0:y1, x0:x1] = background
+        blend(image, label, label_left, label_top, color, bounds)
+        changed_left, changed_right = min(changed_left, x0), max(changed_right, x1)
+    return changed_left, changed_right
@@ -0,0 +1,94 @@
+"""Computes spectrogram images of sensor data once, pooled to the pixel columns of an axis"""
+from typing import Tuple
+
+import cv2
+import numpy as np
+from scipy import signal
+
+from .heatmap import get_nearest_filled_columns, color_map
+
+DYNAMIC_RANGE_DB = 60.0
+"""Power range shown by the colors of a spectrogram, below its maximum power"""
+STFT_CHUNK_VALUES = 2**22
+"""Maximum number of STFT values computed at once, which bounds the memory used for long signals"""
+MIN_SEGMENT_LENGTH = 8
+"""Minimum number of samples per STFT segment"""
+
+
+def compute_spectrogram_image(
+    times_ns: np.ndarray,
+    values: np.ndarray,
+    window_ns: int,
+    x_transform: Tuple[float, float],
+    left: int,
+    width: int,
+    height: int,
+) -> Tuple[np.ndarray, float]:
+    """
+    Compute the spectrogram of the values and rasterize it into a color-mapped RGB image for an axis interior.
+    The power of all columns is summed, and the STFT segments falling into the same pixel column are averaged.
+    The STFT is computed in chunks, so that long signals never need more than STFT_CHUNK_VALUES values at once.
+    The sampling rate is estimated from the median distance of the samples.
+
+    :param times_ns: sorted times of the samples in nanoseconds since the epoch
+    :param values: values of the samples with one column per signal
+    :param window_ns: length of the STFT segments
+    :param x_transform: scale and offset that transform nanoseconds since the epoch into horizontal pixel coordinates
+    :param left: horizontal pixel coordinate of the first image column
+    :param width: width of the image in pixels
+    :param height: height of the image in pixels
+    :return: the image, whose rows go from the highest to the lowest frequency, and the highest frequency in Hz
+    """
+    if len(times_ns) < 2:
+        return color_map(np.zeros((height, width), dtype=np.uint8)), 1.0
+
+    fs = 1e9 / np.median(np.diff(times_ns))
+    values = np.nan_to_num(values.reshape(len(times_ns), -1)).T
+    sample_count = values.shape[1]
+    nperseg = int(
+        min(sample_count, max(MIN_SEGMENT_LENGTH, round(window_ns * fs / 1e9)))
+    )
+    # segments at least as dense as the pixel columns, so that every column shows at least one segment
+    scale, offset = x_transform
+    samples_per_pixel = sample_count / max(1.0, scale * (times_ns[-1] - times_ns[0]))
+    hop = int(max(1, min(nperseg // 2, samples_per_pixel)))
+    segment_count = (sample_count - nperseg) // hop + 1
+    chunk_segments = max(1, STFT_CHUNK_VALUES // (nperseg * len(values)))
+
+    frequency_count = nperseg // 2 + 1
+    power_sums = np.zeros((frequency_count, width))
+    counts = np.zeros(width)
+    for first in range(0, segment_count, chunk_segments):
+        segments = min(chunk_segments, segment_count - first)
+        start = first * hop
+        stop = start + (segments - 1) * hop + nperseg
+        _, _, stft = signal.stft(
+            values[:, start:stop],
+            fs=fs,
+            nperseg=nperseg,
+            noverlap=nperseg - hop,
+            detrend="constant",
+            boundary=None,
+            padded=False,
+        )
+        power = np.sum(np.abs(stft[..., :segments]) ** 2, axis=0)
+
+        centers = times_ns[start + np.arange(segments) * hop + nperseg // 2]
+        columns = np.floor(scale * centers + offset).astype(np.int64) - left
+        inside = (columns >= 0) & (columns < width)
+        np.add.at(power_sums, (slice(None), columns[inside]), power[:, inside])
+        counts += np.bincount(columns[inside], minlength=width)
+
+    # columns without segments, e.g., at the edges of the data, show the nearest column with segments
+    nearest = get_nearest_filled_columns(counts)
+    if nearest is None:
+        return color_map(np.zeros((height, width), dtype=np.uint8)), fs / 2
+    power = power_sums[:, nearest] / counts[nearest]
+
+    decibels = 10 * np.log10(power + np.finfo(float).tiny)
+    maximum = decibels.max()
+    levels = np.clip((decibels - maximum) / DYNAMIC_RANGE_DB + 1, 0, 1)
+    levels = np.round(levels[::-1] * 255).astype(np.uint8)
+    interpolation = cv2.INTER_AREA if frequency_count > height else cv2.INTER_LINEAR
+    levels = cv2.resize(levels, (width, height), interpolation=interpolation)
+    return color_map(levels), fs / 2
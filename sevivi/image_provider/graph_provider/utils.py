@@ -1,31 +1,117 @@
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from math import ceil
+from typing import List, Optional, Dict, Any, Tuple, TYPE_CHECKING
 
+import cv2
 import numpy as np
 import pandas as pd
-from matplotlib.axes import Axes
-from matplotlib.lines import Line2D
+from matplotlib.colors import to_rgb
 
 from sevivi.log import logger
+from .pyramid import MinMaxPyramid
+from .raster_figure import RasterAxes
+
+if TYPE_CHECKING:
+    # matplotlib figures are only imported when they are used, see sevivi.video_renderer.plot_backend
+    from matplotlib.axes import Axes
+    from matplotlib.lines import Line2D
 
 logger = logger.getChild("graph_provider")
 
 
+STACKED_LANE_FILL = 0.8
+"""Fraction of its lane the value range of each column fills in PanelType.STACKED axes"""
+
+
 def calculate_index(
     target_ts: pd.Timestamp, timestamps: pd.DatetimeIndex
 ) -> pd.Timestamp:
     """
     Return the first index value after the target timestamp if the exact timestamp is not available
     """
-    # noinspection PyUnresolvedReferences
-    target_beyond_available = (target_ts > timestamps).all()
+    position = calculate_indices(np.array([target_ts.value]), timestamps)[0]
+    return timestamps[position]
+
+
+def calculate_indices(
+    target_ns: np.ndarray, timestamps: pd.DatetimeIndex
+) -> np.ndarray:
+    """
+    Vectorized version of calculate_index for a sorted DatetimeIndex.
+    Return the positions of the index values shown at the target timestamps given as int64 nanoseconds: the position
+    of the exact timestamp if available, the position of the next timestamp otherwise, and the last position for
+    targets beyond the available data.
+    """
+    positions = np.searchsorted(timestamps.asi8, target_ns, side="left")
+    return np.minimum(positions, len(timestamps) - 1)
+
+
+def get_stacked_values(values: np.ndarray) -> np.ndarray:
+    """
+    Scale and offset each column of the values into its own lane of height one, so that the columns can be plotted
+    as stacked traces. The first column is in the top lane, which is centered at len(columns) - 1,
+    and the last column in the bottom lane, which is centered at 0.
+    """
+    lows, highs = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+    spans = highs - lows
+    scales = np.divide(
+        STACKED_LANE_FILL, spans, out=np.zeros_like(spans), where=spans > 0
+    )
+    lanes = np.arange(values.shape[1])[::-1]
+    return (values - (lows + highs) / 2) * scales + lanes
+
 
-    if target_beyond_available:
-        return timestamps[-1]
-    elif target_ts in timestamps:
-        return target_ts
-    else:
-        return timestamps[timestamps > target_ts][0]
+def add_line_collection(
+    ax: "Axes", segments: List[np.ndarray], colors: List[str], linewidth: float
+):
+    """
+    Add lines through the given arrays of (x, y) data coordinates to the axis as a single artist,
+    which is much faster to draw than an artist per line. The x coordinates must be converted with
+    ax.xaxis.convert_units.
+    """
+    if isinstance(ax, RasterAxes):
+        ax.add_line_collection(segments, colors, linewidth)
+        return
+    from matplotlib.collections import LineCollection
+
+    ax.add_collection(
+        LineCollection(segments, colors=colors, linewidths=linewidth), autolim=False
+    )
+
+
+def add_spans(
+    ax: "Axes", x0: np.ndarray, x1: np.ndarray, colors: List[str], alpha: float
+):
+    """
+    Add vertical spans between the given x data coordinates that cover the height of the axis as a single artist
+    behind the lines. The x coordinates must be converted with ax.xaxis.convert_units.
+    """
+    if isinstance(ax, RasterAxes):
+        ax.add_spans(x0, x1, colors, alpha)
+        return
+    from matplotlib.collections import PolyCollection
+
+    # x in data coordinates, y from the bottom to the top of the axis
+    vertices = np.stack(
+        [
+            np.column_stack([x0, np.zeros(len(x0))]),
+            np.column_stack([x0, np.ones(len(x0))]),
+            np.column_stack([x1, np.ones(len(x0))]),
+            np.column_stack([x1, np.zeros(len(x0))]),
+        ],
+        axis=1,
+    )
+    ax.add_collection(
+        PolyCollection(
+            vertices,
+            facecolors=colors,
+            edgecolors="none",
+            alpha=alpha,
+            transform=ax.get_xaxis_transform(),
+            zorder=0.5,
+        ),
+        autolim=False,
+    )
 
 
 def epochize_index(input: pd.DataFrame) -> pd.DataFrame:
@@ -45,13 +131,279 @@ def epochize_index(input: pd.DataFrame) -> pd.DataFrame:
 class RenderAxis:
     """Encapsulate all information about the axes of a GraphProvider needed for efficient drawing."""
 
-    ax: Axes = None
-    """The matplotlib axis to render to"""
+    ax: "Axes" = None
+    """The matplotlib axis or RasterAxes to render to"""
     columns: List[str] = None
     """The columns of the dataframe plotted in this axis"""
     name: str = None
     """Human-readable title prefix of this axis"""
-    vline: Optional[Line2D] = None
+    vline: Optional["Line2D"] = None
     """Vline artist"""
-    bounding_boxes: Dict[str, Any] = field(default_factory=dict)
-    """Maps all columns in this axis to a BufferRegion of the graphic inside their bounding box"""
+    pixel_bounds: Optional[Tuple[int, int, int, int]] = None
+    """Left, top, right and bottom pixel coordinates of the axis interior in the figure image"""
+    x_transform: Optional[Tuple[float, float]] = None
+    """Scale and offset that transform nanoseconds since the epoch into horizontal pixel coordinates"""
+    vline_color: Optional[np.ndarray] = None
+    """BGR color of the vline"""
+    vline_width: int = 1
+    """Width of the vline in pixels"""
+    painted_region: Optional[Tuple[slice, slice]] = None
+    """Rows and columns of the figure image changed by the last paint call"""
+    lines: Dict[str, "Line2D"] = field(default_factory=dict)
+    """Maps all columns in this axis to their line artist, if the lines are updated for each frame"""
+    values: Optional[np.ndarray] = None
+    """Plotted values of all columns in this axis, i.e., scaled into their lanes for PanelType.STACKED"""
+    samples: Optional["SampleRingBuffer"] = None
+    """The samples currently shown by the lines, if the lines are updated for each frame"""
+    background: Optional[Any] = None
+    """BufferRegion of the axis without its animated artists, restored before drawing them for a frame"""
+    pyramid: Optional[MinMaxPyramid] = None
+    """Min/max aggregates of the values of all columns in this axis, used to decimate the plotted lines"""
+    panorama: Optional[np.ndarray] = None
+    """BGR image of all data of this axis, of which a window is shown in each frame"""
+    panorama_transform: Optional[Tuple[float, float]] = None
+    """Scale and offset that transform nanoseconds since the epoch into the first panorama column of the window"""
+    panorama_fill: Optional[np.ndarray] = None
+    """BGR color of the axis interior, e.g., where the window is outside of the panorama"""
+    y_transform: Optional[Tuple[float, float]] = None
+    """Scale and offset that transform values into vertical pixel coordinates"""
+    readout_colors: List[np.ndarray] = field(default_factory=list)
+    """BGR color of the value readout of each column"""
+    readout_x: Optional[np.ndarray] = None
+    """Horizontal pixel coordinate of the value readout at each expected frame timestamp"""
+    readout_y: Optional[np.ndarray] = None
+    """Vertical pixel coordinate of the value readout of each column at each expected frame timestamp"""
+    readout_values: Optional[np.ndarray] = None
+    """Value of each column shown by the value readout at each expected frame timestamp"""
+
+
+class SampleRingBuffer:
+    """
+    Fixed-capacity buffer of the most recent samples of a number of columns.
+    The storage is twice as long as the capacity, so the samples always form contiguous views that can be
+    passed to matplotlib directly. They are only moved to the front when the end of the storage is reached.
+    """
+
+    def __init__(self, capacity: int, column_count: int):
+        self.capacity = capacity
+        self._times = np.empty(2 * capacity, dtype=np.int64)
+        self._values = np.empty((2 * capacity, column_count))
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def times(self) -> np.ndarray:
+        """View of the timestamps of the samples in nanoseconds"""
+        return self._times[self._start : self._end]
+
+    @property
+    def values(self) -> np.ndarray:
+        """View of the values of the samples, with one column per buffered column"""
+        return self._values[self._start : self._end]
+
+    def clear(self):
+        """Drop all samples"""
+        self._start = 0
+        self._end = 0
+
+    def drop_oldest(self, count: int):
+        """Drop the given number of oldest samples"""
+        self._start = min(self._end, self._start + count)
+
+    def append(self, times: np.ndarray, values: np.ndarray):
+        """Append samples, dropping the oldest samples if the capacity is exceeded"""
+        count = len(times)
+        if count > self.capacity:
+            times, values = times[-self.capacity :], values[-self.capacity :]
+            count = self.capacity
+        overflow = len(self) + count - self.capacity
+        if overflow > 0:
+            self.drop_oldest(overflow)
+
+        if self._end + count > len(self._times):
+            # move the remaining samples to the front of the storage
+            remaining = len(self)
+            self._times[:remaining] = self.times
+            self._values[:remaining] = self.values
+            self._start, self._end = 0, remaining
+
+        self._times[self._end : self._end + count] = times
+        self._values[self._end : self._end + count] = values
+        self._end += count
+
+
+def prepare_render_axis_raster(render_axis: RenderAxis, figure_height: int, dpi: float):
+    """
+    Store the pixel geometry of the axis and its vline in the render axis.
+    The figure must have been drawn, so that the axis layout is final.
+    """
+    ax = render_axis.ax
+    render_axis.pixel_bounds = get_pixel_bounds(ax, figure_height)
+    render_axis.x_transform = get_x_transform(ax)
+    prepare_vline_raster(render_axis, dpi)
+
+
+def get_x_transform(ax: "Axes") -> Tuple[float, float]:
+    """
+    Get the scale and offset that transform nanoseconds since the epoch into horizontal pixel coordinates
+    of an axis with a datetime x axis. Only depends on the x limits and the position of the axis in the figure.
+    """
+    # map two points of the x axis to pixels to obtain the linear transform from nanoseconds to pixels
+    ns = np.array([0, 10**9], dtype=np.int64)
+    data_x = ax.xaxis.convert_units(ns.astype("datetime64[ns]"))
+    pixel_x = ax.transData.transform(np.column_stack([data_x, np.zeros(2)]))[:, 0]
+    scale = (pixel_x[1] - pixel_x[0]) / (ns[1] - ns[0])
+    return scale, pixel_x[0] - scale * ns[0]
+
+
+def get_pixel_bounds(ax: "Axes", figure_height: int) -> Tuple[int, int, int, int]:
+    """Get the left, top, right and bottom pixel coordinates of the axis interior in the figure image"""
+    x0, y0, x1, y1 = ax.bbox.extents
+    return (
+        int(round(x0)),
+        figure_height - int(round(y1)),
+        int(round(x1)),
+        figure_height - int(round(y0)),
+    )
+
+
+def get_y_transform(ax: "Axes", figure_height: int) -> Tuple[float, float]:
+    """Get the scale and offset that transform values into vertical pixel coordinates of the figure image"""
+    # the rows of the figure image go from top to bottom, the display coordinates of matplotlib from bottom to top
+    pixel_y = ax.transData.transform([(0, 0), (0, 1)])[:, 1]
+    return pixel_y[0] - pixel_y[1], figure_height - pixel_y[0]
+
+
+def prepare_vline_raster(render_axis: RenderAxis, dpi: float):
+    """Store the color and pixel width of the vline of the render axis, if it has one"""
+    if render_axis.vline is not None:
+        render_axis.vline_color = to_bgr(render_axis.vline.get_color())
+        render_axis.vline_width = max(
+            1, int(round(render_axis.vline.get_linewidth() * dpi / 72))
+        )
+
+
+def to_bgr(color: Any) -> np.ndarray:
+    """Convert a matplotlib color into a BGR uint8 pixel"""
+    rgb = np.array(to_rgb(color))
+    return np.round(rgb[::-1] * 255).astype(np.uint8)
+
+
+def paint_vline(image: np.ndarray, render_axis: RenderAxis, x_ns: int):
+    """
+    Paint the vline of the render axis at the given time into the figure image, clipped to the axis interior.
+    The painted region is stored in the render axis.
+    """
+    left, top, right, bottom = render_axis.pixel_bounds
+    scale, offset = render_axis.x_transform
+    center = int(round(scale * x_ns + offset))
+    start = max(left, center - render_axis.vline_width // 2)
+    stop = min(right, center - render_axis.vline_width // 2 + render_axis.vline_width)
+    if start < stop:
+        render_axis.painted_region = (slice(top, bottom), slice(start, stop))
+        image[render_axis.painted_region] = render_axis.vline_color
+
+
+PANORAMA_TILE_WIDTH = 4096
+"""Maximum width in pixels of the tiles in which panoramas are rendered with matplotlib"""
+
+
+def render_panorama(
+    ax: "Axes",
+    times_ns: np.ndarray,
+    values: np.ndarray,
+    colors: List[str],
+    height: int,
+    px_per_ns: float,
+    start_ns: int,
+    stop_ns: int,
+    dpi: float,
+) -> np.ndarray:
+    """
+    Render lines of the values over time into a BGR image that continues the given axis horizontally.
+    Column i of the image shows the time start_ns + i / px_per_ns, and the rows span the y limits of the axis.
+    The image is rendered in tiles of at most PANORAMA_TILE_WIDTH pixels, so it may be wider than matplotlib
+    can render at once.
+
+    :param ax: the axis whose y limits and face color are used
+    :param times_ns: sorted times of the samples in nanoseconds since the epoch, usually decimated to the panorama
+                     resolution
+    :param values: values of the samples with one column per line
+    :param colors: color of each line
+    :param height: height of the image in pixels
+    :param px_per_ns: horizontal scale of the image
+    :param start_ns: time of the first column of the image
+    :param stop_ns: time of the end of the image
+    :param dpi: dpi of the figure, which determines the line widths in pixels
+    """
+    if isinstance(ax, RasterAxes):
+        return ax.render_panorama(
+            times_ns, values, colors, height, px_per_ns, start_ns, stop_ns, dpi
+        )
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    width = int(ceil((stop_ns - start_ns) * px_per_ns))
+    panorama = np.empty((height, width, 3), dtype=np.uint8)
+
+    figure = Figure(
+        figsize=(PANORAMA_TILE_WIDTH / dpi, height / dpi),
+        dpi=dpi,
+        facecolor=ax.get_facecolor(),
+    )
+    canvas = FigureCanvasAgg(figure)
+    tile_ax = figure.add_axes([0, 0, 1, 1])
+    tile_ax.set_axis_off()
+    tile_ax.set_ylim(ax.get_ylim())
+    lines = [tile_ax.plot([], [], color=color)[0] for color in colors]
+
+    # seconds since start_ns avoid date conversions and keep the precision of the x coordinates
+    x = (times_ns - start_ns) / 1e9
+    px_per_s = px_per_ns * 1e9
+    for tile_start in range(0, width, PANORAMA_TILE_WIDTH):
+        x0 = tile_start / px_per_s
+        x1 = (tile_start + PANORAMA_TILE_WIDTH) / px_per_s
+        tile_ax.set_xlim(x0, x1)
+        # include the samples just outside the tile, so the lines continue across the tile edges
+        first = max(0, np.searchsorted(x, x0) - 1)
+        last = np.searchsorted(x, x1) + 1
+        for col_idx, line in enumerate(lines):
+            line.set_data(x[first:last], values[first:last, col_idx])
+
+        canvas.draw()
+        tile_width = min(PANORAMA_TILE_WIDTH, width - tile_start)
+        tile = np.asarray(canvas.buffer_rgba())[:, :tile_width]
+        cv2.cvtColor(
+            tile,
+            cv2.COLOR_RGBA2BGR,
+            dst=panorama[:, tile_start : tile_start + tile_width],
+        )
+    return panorama
+
+
+def paint_panorama_window(image: np.ndarray, render_axis: RenderAxis, ts_ns: int):
+    """
+    Copy the window of the panorama of the render axis shown at the given time into the axis interior
+    of the figure image. Parts of the window outside of the panorama are filled with the face color of the axis.
+    """
+    left, top, right, bottom = render_axis.pixel_bounds
+    width = right - left
+    panorama = render_axis.panorama
+    scale, offset = render_axis.panorama_transform
+    start = int(round(scale * ts_ns + offset))
+
+    clipped_start = min(max(start, 0), panorama.shape[1])
+    clipped_stop = min(max(start + width, 0), panorama.shape[1])
+    copy_left = min(max(left + clipped_start - start, left), right)
+    copy_right = copy_left + clipped_stop - clipped_start
+    if copy_left > left:
+        image[top:bottom, left:copy_left] = render_axis.panorama_fill
+    np.copyto(
+        image[top:bottom, copy_left:copy_right],
+        panorama[:, clipped_start:clipped_stop],
+    )
+    if copy_right < right:
+        image[top:bottom, copy_right:right] = render_axis.panorama_fill
@@ -0,0 +1 @@
+from .skeleton_provider import SkeletonImageProvider, get_view_matrix
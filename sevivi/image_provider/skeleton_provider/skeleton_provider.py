@@ -0,0 +1,144 @@
+from typing import List, Tuple, Optional
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from ..video_provider.azure_connections import joint_definition as azure_joints
+from ..video_provider.azure_image_provider import get_interpolated_hsv_color_as_rgb
+
+
+def get_view_matrix(azimuth_degrees: float, elevation_degrees: float) -> np.ndarray:
+    """
+    Get the 2x3 matrix that projects Kinect camera coordinates, where x points right, y down and z away from the
+    camera, orthographically onto the image plane of the viewpoint, where x points right and y down
+    """
+    azimuth, elevation = np.radians(azimuth_degrees), np.radians(elevation_degrees)
+    # the direction the viewpoint looks into, and its right and down directions before the elevation
+    forward = np.array([-np.sin(azimuth), 0, np.cos(azimuth)])
+    right = np.array([np.cos(azimuth), 0, np.sin(azimuth)])
+    down = np.array([0, 1, 0])
+    # looking down tilts the down direction of the image towards the forward direction
+    down = np.cos(elevation) * down - np.sin(elevation) * forward
+    return np.stack([right, down])
+
+
+class SkeletonImageProvider:
+    """
+    Paints the 3D skeleton of a Kinect recording from a configurable viewpoint into a panel.
+    All skeletons are projected at once, and the panel is painted with OpenCV lines,
+    so a frame costs a lookup and a few dozen lines.
+    """
+
+    PADDING = 0.05
+    """Empty margin around the skeletons as a fraction of the panel size"""
+    FIT_PERCENTILE = 0.5
+    """
+    Percentile of the projected joint coordinates at the edges of the panel. Joints of single glitched
+    skeletons beyond them are clipped instead of shrinking all skeletons.
+    """
+    LINE_THICKNESS = 0.01
+    """Thickness of the bones as a fraction of the panel size"""
+
+    def __init__(
+        self,
+        joints_3d: pd.DataFrame,
+        azimuth_degrees: float = 0.0,
+        elevation_degrees: float = 0.0,
+    ):
+        """
+        :param joints_3d: joint positions indexed by video time with an x, y and z column per joint, e.g., HEAD (x),
+                          see AzureProvider.get_joints_3d
+        :param azimuth_degrees: rotation of the viewpoint around the vertical axis, see SkeletonPanelConfig
+        :param elevation_degrees: tilt of the viewpoint above the person, see SkeletonPanelConfig
+        """
+        joints = self.get_joints(joints_3d)
+        self.bones = [
+            (joints.index(j1), joints.index(j2))
+            for j1, j2 in azure_joints
+            if j1 in joints and j2 in joints
+        ]
+        """Positions of the joints connected by each bone"""
+        self._times_ns = joints_3d.index.asi8
+        positions = joints_3d[
+            [f"{joint} ({axis})" for joint in joints for axis in "xyz"]
+        ].to_numpy(dtype=float)
+        positions = positions.reshape(len(joints_3d), len(joints), 3)
+        view = get_view_matrix(azimuth_degrees, elevation_degrees)
+        self._projected = self.__fit_to_unit_square(positions @ view.T)
+        """Projected joint positions of all skeletons in the unit square of the panel"""
+        bones = np.array(self.bones, dtype=np.int64).reshape(-1, 2)
+        self._valid_bones = np.isfinite(self._projected[:, bones]).all(axis=(2, 3))
+        """If both joints of each bone of each skeleton are available"""
+        self._bone_colors = [
+            get_interpolated_hsv_color_as_rgb(i, len(self.bones)).tolist()
+            for i in range(len(self.bones))
+        ]
+        self._pixels: Optional[np.ndarray] = None
+        """Joint positions of all skeletons in pixels of the last painted panel size"""
+        self._pixels_shape: Tuple[int, ...] = ()
+
+    @staticmethod
+    def get_joints(joints_3d: pd.DataFrame) -> List[str]:
+        """Get the names of the joints that have an x, y and z column"""
+        columns = set(joints_3d.columns)
+        return [
+            column[: -len(" (x)")]
+            for column in joints_3d.columns
+            if column.endswith(" (x)")
+            and column.replace(" (x)", " (y)") in columns
+            and column.replace(" (x)", " (z)") in columns
+        ]
+
+    def __fit_to_unit_square(self, projected: np.ndarray) -> np.ndarray:
+        """
+        Scale and shift the projected positions of all skeletons by the same amount, so that they are centered in
+        the unit square and movements across the room stay visible
+        """
+        if not np.isfinite(projected).any():
+            return projected
+        coordinates = projected.reshape(-1, 2)
+        low = np.nanpercentile(coordinates, self.FIT_PERCENTILE, axis=0)
+        high = np.nanpercentile(coordinates, 100 - self.FIT_PERCENTILE, axis=0)
+        span = max((high - low).max(), 1e-9)
+        scale = (1 - 2 * self.PADDING) / span
+        return (projected - (low + high) / 2) * scale + 0.5
+
+    def paint_panel(self, image: np.ndarray, ts: pd.Timestamp):
+        """
+        Paint the skeleton shown at the given timestamp into the BGR image of the panel:
+        the skeleton at the timestamp if available, the next skeleton otherwise,
+        and the last skeleton for timestamps beyond the recording
+        """
+        image.fill(255)
+        if len(self._times_ns) == 0:
+            return
+        if self._pixels_shape != image.shape:
+            # the shorter side fits the unit square, which is centered in the longer side
+            size = min(image.shape[:2])
+            offset = (np.array([image.shape[1], image.shape[0]]) - size) / 2
+            pixels = np.nan_to_num(self._projected * size + offset)
+            # OpenCV clips lines to the image, but their coordinates must fit into its integers
+            self._pixels = np.round(np.clip(pixels, -(2**15), 2**15)).astype(
+                np.int32
+            )
+            self._pixels_shape = image.shape
+
+        position = min(
+            np.searchsorted(self._times_ns, ts.value, side="left"),
+            len(self._times_ns) - 1,
+        )
+        joints = self._pixels[position]
+        thickness = max(1, int(round(min(image.shape[:2]) * self.LINE_THICKNESS)))
+        for (j1, j2), valid, color in zip(
+            self.bones, self._valid_bones[position], self._bone_colors
+        ):
+            if valid:
+                cv2.line(
+                    image,
+                    tuple(joints[j1].tolist()),
+                    tuple(joints[j2].tolist()),
+                    color,
+                    thickness,
+                    cv2.LINE_AA,
+                )
@@ -29,21 +29,13 @@ class AzureProvider(VideoImageProvider):
         if not os.path.exists(video_path):
             raise Exception(f"File {video_path} not found!")
 
+        self._video_path = video_path
         self.__video = cv2.VideoCapture(video_path)
-        self.__joint_df_3d = self._drop_duplicate_body_indices_and_confidence_values(
-            pd.read_csv(joint_3d_df, sep=";", index_col=0)
-        )
-        self.__joint_df_3d.index = pd.to_datetime(self.__joint_df_3d.index, unit="us")
+        self.__image_index = 0
+        self.__joint_df_3d = self.read_joint_csv(joint_3d_df)
 
         if joint_2d_df is not None:
-            self.__joint_df_2d = (
-                self._drop_duplicate_body_indices_and_confidence_values(
-                    pd.read_csv(joint_2d_df, sep=";", index_col=0)
-                )
-            )
-            self.__joint_df_2d.index = pd.to_datetime(
-                self.__joint_df_2d.index, unit="us"
-            )
+            self.__joint_df_2d = self.read_joint_csv(joint_2d_df)
             self.__skeleton_definition = self._get_skeleton_definition_as_tuple(
                 self.__joint_df_2d
             )
@@ -51,6 +43,18 @@ class AzureProvider(VideoImageProvider):
             self.__joint_df_2d = None
             self.__skeleton_definition = None
 
+    @staticmethod
+    def read_joint_csv(path: str) -> pd.DataFrame:
+        """
+        Read the joint positions of the most frequent body from a Kinect skeleton CSV,
+        indexed by the timestamps of the skeletons
+        """
+        df = AzureProvider._drop_duplicate_body_indices_and_confidence_values(
+            pd.read_csv(path, sep=";", index_col=0)
+        )
+        df.index = pd.to_datetime(df.index, unit="us")
+        return df
+
     @staticmethod
     def _drop_duplicate_body_indices_and_confidence_values(
         df: pd.DataFrame,
@@ -85,17 +89,16 @@ class AzureProvider(VideoImageProvider):
 
     def images(self) -> Generator[Tuple[pd.Timestamp, bytes], None, None]:
         """Delivers individual frames from Azure Kinect camera"""
-        image_count = 0
         while self.__video.isOpened():
             frame_exists, frame = self.__video.read()
             if frame_exists:
                 ts = self.__video.get(cv2.CAP_PROP_POS_MSEC)
 
-                if self.__skeleton_definition is not None and image_count < len(
+                if self.__skeleton_definition is not None and self.__image_index < len(
                     self.__joint_df_2d
                 ):
                     skeleton_data = (
-                        self.__joint_df_2d.iloc[image_count, :]
+                        self.__joint_df_2d.iloc[self.__image_index, :]
                         .to_numpy()
                         .reshape(-1, 2)
                     )
@@ -108,10 +111,15 @@ class AzureProvider(VideoImageProvider):
                         frame = cv2.line(frame, p1, p2, color=color, thickness=9)
 
                 yield pd.to_datetime(ts, unit="ms"), frame
-                image_count += 1
+                self.__image_index += 1
             else:
                 break
 
+    def seek(self, frame_index: int):
+        """Continue the next call to images() at the given frame index"""
+        self.__video.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+        self.__image_index = frame_index
+
     def get_sync_dataframe(self, column_names: List[str]) -> Optional[pd.DataFrame]:
         """Returns a dataframe used for synchronization based on given joint names"""
         if type(column_names) is str:
@@ -133,10 +141,18 @@ class AzureProvider(VideoImageProvider):
             f"Wrong type given: {type(column_names)}, expected: List[str] or str"
         )
 
+    def get_joints_3d(self) -> pd.DataFrame:
+        """Get the 3D joint positions in millimeters with an x, y and z column per joint, e.g., HEAD (x)"""
+        return self.__joint_df_3d
+
     def get_image_count(self) -> int:
         """Get the number of images that will be rendered"""
         return int(self.__video.get(cv2.CAP_PROP_FRAME_COUNT))
 
+    def get_frame_rate(self) -> float:
+        """Get the frame rate of the source video in frames per second"""
+        return self.__video.get(cv2.CAP_PROP_FPS)
+
     def get_dimensions(self) -> Dimensions:
         """Get the dimensions of the source video in pixels"""
         return Dimensions(
@@ -16,6 +16,7 @@ class ImuCameraImageProvider(VideoImageProvider):
     """The IMU video image provider provides images from a camera with an integrated IMU together with the IMU data."""
 
     def __init__(self, video_path: str, imu_df_path: str):
+        self._video_path = video_path
         self.__video = cv2.VideoCapture(video_path)
         self.data: pd.DataFrame = pd.read_csv(
             imu_df_path, index_col=0, parse_dates=True
@@ -38,10 +39,18 @@ class ImuCameraImageProvider(VideoImageProvider):
             else:
                 break
 
+    def seek(self, frame_index: int):
+        """Continue the next call to images() at the given frame index"""
+        self.__video.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+
     def get_image_count(self) -> int:
         """Get the number of images that will be rendered"""
         return int(self.__video.get(cv2.CAP_PROP_FRAME_COUNT))
 
+    def get_frame_rate(self) -> float:
+        """Get the frame rate of the source video in frames per second"""
+        return self.__video.get(cv2.CAP_PROP_FPS)
+
     def get_dimensions(self) -> Dimensions:
         """Get the dimensions of the source video in pixels."""
         return Dimensions(
@@ -26,6 +26,7 @@ class VideoImuCaptureAppImageProvider(VideoImageProvider):
     """
 
     def __init__(self, video_path: str, imu_pb_path: str):
+        self._video_path = video_path
         self.__video = cv2.VideoCapture(video_path)
 
         try:
@@ -66,10 +67,18 @@ class VideoImuCaptureAppImageProvider(VideoImageProvider):
             else:
                 break
 
+    def seek(self, frame_index: int):
+        """Continue the next call to images() at the given frame index"""
+        self.__video.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+
     def get_image_count(self) -> int:
         """Get the number of images that will be rendered"""
         return int(self.__video.get(cv2.CAP_PROP_FRAME_COUNT))
 
+    def get_frame_rate(self) -> float:
+        """Get the frame rate of the source video in frames per second"""
+        return self.__video.get(cv2.CAP_PROP_FPS)
+
     def get_dimensions(self) -> Dimensions:
         """Get the dimensions of the source video in pixels."""
         return Dimensions(
@@ -1,7 +1,8 @@
 """VideoImageProviders provide the video aroud which the data graphs are rendered"""
 
-from typing import Optional, List, Generator, Tuple
+from typing import Optional, List, Generator, Tuple, Dict
 
+import cv2
 import numpy as np
 import pandas as pd
 
@@ -17,6 +18,12 @@ class VideoImageProvider:
             "images must be implemented by VideoImageProvider subclasses!"
         )
 
+    def seek(self, frame_index: int):
+        """Continue the next call to images() at the given frame index"""
+        raise NotImplementedError(
+            "seek must be implemented by VideoImageProvider subclasses!"
+        )
+
     def get_sync_dataframe(self, column_names: List[str]) -> Optional[pd.DataFrame]:
         """
         Get a dataframe that can be used to synchronize graph data against this video.
@@ -33,8 +40,44 @@ class VideoImageProvider:
             "get_image_count must be implemented by VideoImageProvider subclasses!"
         )
 
+    def get_frame_rate(self) -> float:
+        """Get the frame rate of the source video in frames per second"""
+        raise NotImplementedError(
+            "get_frame_rate must be implemented by VideoImageProvider subclasses!"
+        )
+
+    def get_frame_timestamps(self) -> pd.DatetimeIndex:
+        """
+        Get the expected timestamps of all images assuming a constant frame rate.
+        The timestamps generated by images() may deviate, e.g., for videos with a variable frame rate.
+        """
+        fps = self.get_frame_rate()
+        if not fps > 0:
+            return pd.DatetimeIndex([])
+        frame_ms = np.arange(self.get_image_count()) * 1000 / fps
+        return pd.to_datetime(frame_ms, unit="ms")
+
     def get_dimensions(self) -> Dimensions:
         """Get the dimensions of the source video in pixels."""
         raise NotImplementedError(
             "get_dimensions must be implemented by VideoImageProvider subclasses!"
         )
+
+    def __getstate__(self) -> Dict:
+        """
+        Drop open OpenCV captures when pickling, e.g., to send this provider to a render worker process.
+        Subclasses keep the path of their capture in self._video_path so it can be reopened after unpickling.
+        """
+        state = self.__dict__.copy()
+        capture_keys = [k for k, v in state.items() if isinstance(v, cv2.VideoCapture)]
+        for key in capture_keys:
+            state[key] = None
+        state["_pickled_capture_keys"] = capture_keys
+        return state
+
+    def __setstate__(self, state: Dict):
+        """Restore a pickled provider and reopen its OpenCV captures at the first frame"""
+        capture_keys = state.pop("_pickled_capture_keys", [])
+        self.__dict__.update(state)
+        for key in capture_keys:
+            setattr(self, key, cv2.VideoCapture(self._video_path))
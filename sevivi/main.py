@@ -4,6 +4,7 @@ from pprint import pformat
 from typing import List
 
 from sevivi.config import Config, read_configs
+from sevivi.config.config_reader import get_time_range, get_process_count
 from sevivi.video_renderer import video_renderer_from_csv_files
 from sevivi.log import logger
 
@@ -18,6 +19,29 @@ def parse_arguments(args: List[str]) -> Config:
         help="Set the output file. Overwrites config value.",
         required=False,
     )
+    parser.add_argument(
+        "--processes",
+        dest="process_count",
+        type=int,
+        help="Set the number of worker processes used for rendering. Overwrites config value.",
+        required=False,
+    )
+    parser.add_argument(
+        "--range",
+        dest="time_ranges",
+        nargs=2,
+        type=float,
+        action="append",
+        metavar=("START", "END"),
+        help="Only render the given range in seconds of video time. Can be given multiple times. "
+        "Overwrites config value.",
+        required=False,
+    )
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="Render a quick preview at reduced resolution and frame rate to check the synchronization.",
+    )
     parser.add_argument(
         "config",
         nargs="+",
@@ -29,6 +53,16 @@ def parse_arguments(args: List[str]) -> Config:
 
     if "target_file_path" in args and args.target_file_path is not None:
         result.render_config.target_file_path = args.target_file_path
+    if "process_count" in args and args.process_count is not None:
+        result.render_config.process_count = get_process_count(
+            {"process_count": args.process_count}
+        )
+    if "time_ranges" in args and args.time_ranges is not None:
+        result.render_config.time_ranges = [
+            get_time_range(time_range) for time_range in args.time_ranges
+        ]
+    if args.preview:
+        result.render_config.preview = True
 
     return result
 
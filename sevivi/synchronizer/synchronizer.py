@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
 from .signal_processing import (
     resample_data,
@@ -50,6 +49,9 @@ def get_synchronization_offset(
     sensor_acceleration = calculate_magnitude(sensor_acceleration)
 
     if show_plots:
+        # importing pyplot takes long, so it is only imported for the debugging plots
+        import matplotlib.pyplot as plt
+
         plt.close()
         plt.figure(1)
         plt.plot(video_acceleration, label="Kinect")
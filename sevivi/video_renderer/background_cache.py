@@ -0,0 +1,154 @@
+"""Stores the rasterized plot backgrounds of renders on disk, so that later renders can skip drawing the figure"""
+import hashlib
+import json
+import os
+import zipfile
+from typing import Any, Optional, List
+
+import matplotlib
+import numpy as np
+
+from sevivi.atomic_write import atomic_write
+from sevivi.log import logger
+
+logger = logger.getChild("background_cache")
+
+CACHE_FORMAT_VERSION = 2
+"""Increased whenever the cached raster state changes, so that old entries are not used"""
+
+
+def get_style_key() -> str:
+    """Get a hash of the matplotlib version and style settings, which change how the figure is drawn"""
+    style = sorted((key, repr(value)) for key, value in matplotlib.rcParams.items())
+    return hashlib.sha256(
+        repr((CACHE_FORMAT_VERSION, matplotlib.__version__, style)).encode()
+    ).hexdigest()
+
+
+class BackgroundCache:
+    """
+    Stores values into npz files of a directory, named by their key. Values are nested dicts, lists and tuples of
+    numpy arrays, strings, numbers and None. The arrays are stored as arrays and everything else as JSON, so that
+    loading the files cannot run code, even if the directory is shared.
+    When the files exceed the size limit, the least recently used files are deleted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        :param directory: directory of the cache files, created if it does not exist
+        :param max_bytes: maximum total size of the cache files
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            logger.warning(
+                f"Could not create background cache directory {directory}: {e}"
+            )
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get the value stored for the key, or None if there is none"""
+        path = self._get_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                arrays = [
+                    stored[f"array_{i}"] for i in range(int(stored["array_count"]))
+                ]
+                value = _from_json(json.loads(str(stored["metadata"])), arrays)
+            # the modification time orders the files by their last use
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile) as e:
+            logger.warning(f"Ignoring unreadable background cache file {path}: {e}")
+            return None
+
+        logger.info(f"Using cached plot background {path}")
+        return value
+
+    def put(self, key: str, value: Any):
+        """
+        Store the value for the key, then evict the least recently used files above the size limit.
+        Failing to write, e.g., to a read-only directory, is logged, and the render continues without the cache.
+        """
+        arrays = []
+        metadata = json.dumps(_to_json(value, arrays))
+        path = self._get_path(key)
+        try:
+            with atomic_write(path) as f:
+                np.savez(
+                    f,
+                    metadata=np.array(metadata),
+                    array_count=np.array(len(arrays)),
+                    **{f"array_{i}": array for i, array in enumerate(arrays)},
+                )
+            self._evict()
+        except OSError as e:
+            logger.warning(f"Could not write background cache file {path}: {e}")
+
+    def _evict(self):
+        """Delete the least recently used files until the cache fits into max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".npz"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            logger.debug(f"Evicted {name} from the background cache")
+
+
+def _to_json(value: Any, arrays: List[np.ndarray]) -> Any:
+    """
+    Convert the value into JSON, replacing numpy arrays with their position in the arrays they are appended to,
+    and tuples with a marked list so that they are restored as tuples
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise TypeError(
+                "Arrays of objects cannot be stored in the background cache"
+            )
+        arrays.append(value)
+        return {"__array__": len(arrays) - 1}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return {"__tuple__": [_to_json(v, arrays) for v in value]}
+    if isinstance(value, list):
+        return [_to_json(v, arrays) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _to_json(v, arrays) for k, v in value.items()}
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    raise TypeError(
+        f"Values of type {type(value)} cannot be stored in the background cache"
+    )
+
+
+def _from_json(value: Any, arrays: List[np.ndarray]) -> Any:
+    """Restore a value converted by _to_json with the stored arrays"""
+    if isinstance(value, list):
+        return [_from_json(v, arrays) for v in value]
+    if isinstance(value, dict):
+        if "__array__" in value:
+            return arrays[value["__array__"]]
+        if "__tuple__" in value:
+            return tuple(_from_json(v, arrays) for v in value["__tuple__"])
+        return {k: _from_json(v, arrays) for k, v in value.items()}
+    return value
@@ -0,0 +1,50 @@
+"""Converts the frame rate of the source video by dropping or repeating frames"""
+from math import ceil
+from typing import Iterable, Tuple, Generator
+
+import numpy as np
+import pandas as pd
+
+SourceFrame = Tuple[pd.Timestamp, np.ndarray]
+"""Timestamp and image of a source video frame"""
+OutputFrame = Tuple[pd.Timestamp, np.ndarray, int]
+"""Timestamp and image of a source video frame, and how often it is written to the output"""
+
+
+def resample_frames(
+    images: Iterable[SourceFrame], target_fps: float, source_fps: float
+) -> Generator[OutputFrame, None, None]:
+    """
+    Resample source frames to a constant output frame rate.
+
+    Output frame k is shown at k / target_fps seconds of video time. It shows the last source frame with a timestamp
+    at or before that time, so source frames are dropped or repeated. Dropped source frames are not yielded at all.
+    Because the output times do not depend on the first source frame, consecutive segments of a video can be
+    resampled independently.
+
+    :param images: source frames with increasing timestamps
+    :param target_fps: the output frame rate
+    :param source_fps: the frame rate of the source video, used to determine how long the last frame is shown
+    :return: the source frames that are shown in at least one output frame, with the number of output frames
+    """
+    output_frame_ns = 1e9 / target_fps
+    last_frame_duration_ns = 1e9 / source_fps
+
+    def first_output_frame_at_or_after(ns: float) -> int:
+        return ceil(ns / output_frame_ns)
+
+    previous = None
+    next_output_frame = None
+    for ts, image in images:
+        start = first_output_frame_at_or_after(ts.value)
+        if previous is not None:
+            count = start - next_output_frame
+            if count > 0:
+                yield previous[0], previous[1], count
+        next_output_frame = start if previous is None else max(next_output_frame, start)
+        previous = ts, image
+
+    if previous is not None:
+        end = first_output_frame_at_or_after(previous[0].value + last_frame_duration_ns)
+        if end > next_output_frame:
+            yield previous[0], previous[1], end - next_output_frame
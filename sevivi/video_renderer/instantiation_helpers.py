@@ -1,7 +1,8 @@
 """Contains helpers to instantiate Video- and GraphImageProviders for the CLI"""
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 from sevivi.config import (
@@ -14,6 +15,7 @@ from sevivi.config import (
     Config,
     RenderConfig,
     SensorConfig,
+    AnnotationConfig,
 )
 from sevivi.image_provider import (
     AzureProvider,
@@ -22,9 +24,15 @@ from sevivi.image_provider import (
     VideoImageProvider,
     PlainVideoImageProvider,
     VideoImuCaptureAppImageProvider,
+    AnnotationImageProvider,
+    AnnotationTrack,
+    SkeletonImageProvider,
 )
 from .video_renderer import VideoRenderer
 
+CSV_CHUNK_ROWS = 100_000
+"""Number of rows read at once when only a time range of a sensor CSV is loaded"""
+
 
 def video_renderer_from_csv_files(config: Config) -> VideoRenderer:
     """Instantiate a VideoRenderer for Configs where all data is stored as .csv or .csv.gz"""
@@ -38,7 +46,17 @@ def video_renderer_from_csv_files(config: Config) -> VideoRenderer:
     graph_providers = instantiate_graph_providers(
         config.sensor_configs, config.render_config
     )
-    return VideoRenderer(config.render_config, video_provider, graph_providers)
+    annotation_provider = instantiate_annotation_provider(config.annotation_configs)
+    skeleton_provider = instantiate_skeleton_provider(
+        config.render_config, video_provider
+    )
+    return VideoRenderer(
+        config.render_config,
+        video_provider,
+        graph_providers,
+        annotation_provider=annotation_provider,
+        skeleton_provider=skeleton_provider,
+    )
 
 
 def instantiate_graph_providers(
@@ -53,12 +71,118 @@ def instantiate_graph_providers(
     result = []
 
     for sc in sensor_configs.values():
-        data = pd.read_csv(sc.path, index_col=0, parse_dates=True)
-        result.append(GraphImageProvider(data, sc, render_config.plotting_method))
+        data = read_sensor_csv(sc.path, sc.start_time, sc.end_time)
+        result.append(
+            GraphImageProvider(
+                data,
+                sc,
+                render_config.plotting_method
+                if sc.plotting_method is None
+                else sc.plotting_method,
+                render_config.push_in_window_seconds,
+                render_config.scrolling_window_seconds,
+                render_config.value_readout,
+                render_config.spectrogram_window_seconds,
+            )
+        )
 
     return result
 
 
+def instantiate_annotation_provider(
+    annotation_configs: List[AnnotationConfig],
+) -> Optional[AnnotationImageProvider]:
+    """Instantiate an AnnotationImageProvider for the annotation tracks, or return None if there are none"""
+    if len(annotation_configs) == 0:
+        return None
+    return AnnotationImageProvider(
+        [read_annotation_csv(ac.path, ac.name) for ac in annotation_configs]
+    )
+
+
+def instantiate_skeleton_provider(
+    render_config: RenderConfig, video_provider: VideoImageProvider
+) -> Optional[SkeletonImageProvider]:
+    """
+    Instantiate a SkeletonImageProvider for the 3D skeleton of a Kinect video,
+    or return None if no skeleton panel is configured
+    """
+    panel_config = render_config.skeleton_panel_config
+    if panel_config is None:
+        return None
+    if not isinstance(video_provider, AzureProvider):
+        raise ValueError("The skeleton panel requires a Kinect video config")
+    return SkeletonImageProvider(
+        video_provider.get_joints_3d(),
+        panel_config.azimuth_degrees,
+        panel_config.elevation_degrees,
+    )
+
+
+def read_annotation_csv(path: str, name: str = "") -> AnnotationTrack:
+    """
+    Read an annotation track from a CSV or CSV.GZ file with the columns start, end and label,
+    where start and end are seconds of video time
+    """
+    data = pd.read_csv(path)
+    missing_columns = {"start", "end", "label"} - set(data.columns)
+    if len(missing_columns) > 0:
+        raise KeyError(f"{path} is missing the annotation columns {missing_columns}")
+    return AnnotationTrack(
+        name,
+        np.round(data["start"].to_numpy(dtype=float) * 1e9).astype(np.int64),
+        np.round(data["end"].to_numpy(dtype=float) * 1e9).astype(np.int64),
+        data["label"].astype(str).to_numpy(),
+    )
+
+
+def read_sensor_csv(
+    path: str,
+    start_time: Optional[pd.Timestamp] = None,
+    end_time: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """
+    Read sensor data from a CSV or CSV.GZ file where the first column is a sorted DatetimeIndex.
+
+    If start_time or end_time are given, the file is read in chunks and only the rows in [start_time, end_time]
+    are kept, so memory is proportional to the selected range rather than to the whole recording.
+    Reading stops at the first chunk that ends after end_time.
+    Times without timezone are interpreted in the timezone of the sensor timestamps.
+    """
+    if start_time is None and end_time is None:
+        return pd.read_csv(path, index_col=0, parse_dates=True)
+
+    kept_chunks = []
+    for chunk in pd.read_csv(
+        path, index_col=0, parse_dates=True, chunksize=CSV_CHUNK_ROWS
+    ):
+        mask = np.ones(len(chunk), dtype=bool)
+        if start_time is not None:
+            mask &= chunk.index >= _in_timezone_of(start_time, chunk.index)
+        if end_time is not None:
+            end = _in_timezone_of(end_time, chunk.index)
+            mask &= chunk.index <= end
+        kept_chunks.append(chunk[mask])
+        if end_time is not None and len(chunk) > 0 and chunk.index[-1] > end:
+            break
+
+    data = pd.concat(kept_chunks)
+    if len(data) == 0:
+        raise ValueError(
+            f"{path} contains no data between start_time {start_time} and end_time {end_time}"
+        )
+    return data
+
+
+def _in_timezone_of(ts: pd.Timestamp, index: pd.DatetimeIndex) -> pd.Timestamp:
+    """Make the timestamp comparable with the index by giving it the same timezone, or none"""
+    if ts.tz is None and index.tz is not None:
+        return ts.tz_localize(index.tz)
+    if ts.tz is not None and index.tz is None:
+        return ts.tz_convert(None)
+    return ts
+
+
 def instantiate_video_provider(video_config: VideoConfig) -> VideoImageProvider:
     """Instantiate the appropriate VideoImageProvider subclass for a given VideoConfig"""
     if isinstance(video_config, VideoImuCaptureAppVideoConfig):
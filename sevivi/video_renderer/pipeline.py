@@ -0,0 +1,167 @@
+"""Runs decoding, plotting and encoding of the render loop in separate threads connected by bounded queues"""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, Tuple, Callable, List, Any
+
+import numpy as np
+import pandas as pd
+
+from sevivi.log import logger
+
+logger = logger.getChild("pipeline")
+
+_END = object()
+"""Sentinel that marks the end of the frames in a queue"""
+
+_POLL_SECONDS = 0.1
+"""Interval in which blocked stages check whether the pipeline has been stopped"""
+
+
+@dataclass
+class StageStatistics:
+    """Counts the frames of a pipeline stage and the time it spent waiting on its neighbouring stages"""
+
+    name: str
+    """Name of the stage"""
+    frames: int = 0
+    """Number of frames processed by the stage"""
+    starved_seconds: float = 0.0
+    """Seconds spent waiting for input from the previous stage"""
+    blocked_seconds: float = 0.0
+    """Seconds spent waiting for the next stage to accept output"""
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.frames} frames, starved {self.starved_seconds:.2f}s, "
+            f"blocked {self.blocked_seconds:.2f}s"
+        )
+
+
+def _put(q: queue.Queue, item: Any, stop: threading.Event) -> Tuple[bool, float]:
+    """Put an item into the queue unless the pipeline is stopped. Returns success and the time spent waiting."""
+    start = time.perf_counter()
+    while True:
+        try:
+            q.put(item, timeout=_POLL_SECONDS)
+            return True, time.perf_counter() - start
+        except queue.Full:
+            if stop.is_set():
+                return False, time.perf_counter() - start
+
+
+def _get(q: queue.Queue, stop: threading.Event) -> Tuple[Any, float]:
+    """
+    Get the next item from the queue, or the end sentinel if the queue is empty and the pipeline is stopped.
+    Returns the item and the time spent waiting.
+    """
+    start = time.perf_counter()
+    while True:
+        try:
+            return q.get(timeout=_POLL_SECONDS), time.perf_counter() - start
+        except queue.Empty:
+            if stop.is_set():
+                return _END, time.perf_counter() - start
+
+
+def run_render_pipeline(
+    frames: Iterable[Tuple[pd.Timestamp, np.ndarray, int]],
+    compose: Callable[[np.ndarray, pd.Timestamp, np.ndarray], None],
+    write: Callable[[np.ndarray], None],
+    frame_buffers: List[np.ndarray],
+    queue_size: int,
+) -> List[StageStatistics]:
+    """
+    Render all images with a decoder thread, plotting on the calling thread and an encoder thread.
+
+    :param frames: iterable of source timestamps, images, and how often the composed frame is written.
+                   It is consumed by the decoder thread.
+    :param compose: called on the calling thread to compose a target frame into the given buffer
+                    from a timestamp and source image
+    :param write: called on the encoder thread to write a composed target frame
+    :param frame_buffers: target frame buffers that are reused for composition. Need at least queue_size + 2 buffers
+                          to keep all stages busy.
+    :param queue_size: maximum number of frames waiting between two stages
+    :return: the statistics of the decode, plot and encode stages
+    """
+    decode_stats = StageStatistics("decode")
+    plot_stats = StageStatistics("plot")
+    encode_stats = StageStatistics("encode")
+
+    # set when a stage fails to stop the other stages
+    stop = threading.Event()
+    decoded_frames = queue.Queue(maxsize=queue_size)
+    composed_frames = queue.Queue(maxsize=queue_size)
+    free_buffers = queue.Queue()
+    for buffer in frame_buffers:
+        free_buffers.put(buffer)
+    errors = []
+
+    def decode():
+        try:
+            for item in frames:
+                success, waited = _put(decoded_frames, item, stop)
+                decode_stats.blocked_seconds += waited
+                if not success:
+                    return
+                decode_stats.frames += 1
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            _put(decoded_frames, _END, stop)
+
+    def encode():
+        while True:
+            item, waited = _get(composed_frames, stop)
+            encode_stats.starved_seconds += waited
+            if item is _END:
+                return
+            image, count = item
+            try:
+                if not stop.is_set():
+                    for _ in range(count):
+                        write(image)
+                    encode_stats.frames += 1
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+            free_buffers.put(image)
+
+    decoder = threading.Thread(target=decode, name="sevivi-decoder", daemon=True)
+    encoder = threading.Thread(target=encode, name="sevivi-encoder", daemon=True)
+    decoder.start()
+    encoder.start()
+
+    try:
+        while not stop.is_set():
+            item, waited = _get(decoded_frames, stop)
+            plot_stats.starved_seconds += waited
+            if item is _END:
+                break
+            ts, src_image, count = item
+
+            image, waited = _get(free_buffers, stop)
+            plot_stats.blocked_seconds += waited
+            if image is _END:
+                break
+            compose(image, ts, src_image)
+
+            _, waited = _put(composed_frames, (image, count), stop)
+            plot_stats.blocked_seconds += waited
+            plot_stats.frames += 1
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        _put(composed_frames, _END, stop)
+        encoder.join()
+        decoder.join()
+
+    if len(errors) > 0:
+        raise errors[0]
+
+    stats = [decode_stats, plot_stats, encode_stats]
+    for stage_stats in stats:
+        logger.info(str(stage_stats))
+    return stats
@@ -0,0 +1,54 @@
+"""
+Creates the figures the graph providers draw to.
+A backend creates a figure with a grid of axes. GraphImageProvider and VideoRenderer use this subset of the
+matplotlib API:
+
+- axes: set_xlim, set_ylim, get_ylim, set_title, plot, imshow, axvline, draw_artist, get_facecolor, bbox, transData,
+  xaxis.convert_units and spines
+- figure: dpi, bbox and canvas
+- canvas: draw, buffer_rgba, copy_from_bbox and restore_region
+"""
+from typing import Tuple
+
+import numpy as np
+
+from sevivi.config import PlotBackend
+from sevivi.image_provider import Dimensions
+from sevivi.image_provider.graph_provider.raster_figure import create_raster_subplots
+
+
+def create_figure(
+    plot_backend: PlotBackend,
+    rows: int,
+    columns: int,
+    dimensions: Dimensions,
+    dpi: float,
+) -> Tuple[object, np.ndarray]:
+    """
+    Create a figure of the given pixel dimensions with a grid of axes for the plot backend.
+    Returns the figure and its axes in an array with the shape (rows, columns).
+    """
+    if plot_backend == PlotBackend.MATPLOTLIB:
+        return create_matplotlib_figure(rows, columns, dimensions, dpi)
+    elif plot_backend == PlotBackend.OPENCV:
+        return create_raster_subplots(rows, columns, dimensions.w, dimensions.h, dpi)
+    else:
+        raise ValueError(f"Unknown plot backend {plot_backend}")
+
+
+def create_matplotlib_figure(
+    rows: int, columns: int, dimensions: Dimensions, dpi: float
+) -> Tuple[object, np.ndarray]:
+    """Create a matplotlib figure with a tight layout of subplots"""
+    # importing pyplot takes long, so only renders that use it pay for it
+    from matplotlib import pyplot as plt
+
+    fig, axs = plt.subplots(
+        rows,
+        columns,
+        figsize=(dimensions.w / dpi, dimensions.h / dpi),
+        squeeze=False,
+        dpi=dpi,
+    )
+    plt.tight_layout()
+    return fig, axs
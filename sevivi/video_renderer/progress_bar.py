@@ -17,7 +17,7 @@ def progress_bar(
     Yields
 
     :param iterable:    - Required  : Items from this list will be yielded to the for-loop
-    :param total:       - Required  : Number of items that will be yielded
+    :param total:       - Required  : Expected number of items. The bar stays full if more items are yielded
     :param prefix:      - Optional  : prefix string (Str)
     :param suffix:      - Optional  : suffix string (Str)
     :param decimals:    - Optional  : positive number of decimals in percent complete (Int)
@@ -25,8 +25,12 @@ def progress_bar(
     :param fill:        - Optional  : bar fill character (Str)
     """
 
+    # the total may be an underestimate, e.g., the frame count reported by OpenCV
+    total = max(total, 1)
+
     # Progress Bar Printing Function
     def print_progress_bar(iteration):
+        iteration = min(iteration, total)
         percent = ("{0:." + str(decimals) + "f}").format(
             100 * (iteration / float(total))
         )
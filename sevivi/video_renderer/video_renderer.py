@@ -1,11 +1,14 @@
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
 from math import ceil
-from typing import Tuple, Optional, List, Callable
+from typing import Tuple, Optional, List, Callable, Dict, Iterable
 
 import cv2
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
-from matplotlib.figure import Figure
 
 from sevivi.config import (
     RenderConfig,
@@ -14,15 +17,38 @@ from sevivi.config import (
     ManuallySynchronizedSensorConfig,
     StackingDirection,
 )
-from sevivi.image_provider import GraphImageProvider, VideoImageProvider, Dimensions
+from sevivi.image_provider import (
+    GraphImageProvider,
+    VideoImageProvider,
+    Dimensions,
+    AnnotationImageProvider,
+    SkeletonImageProvider,
+)
 from sevivi.log import logger
 from sevivi.synchronizer.synchronizer import get_synchronization_offset
+from .background_cache import BackgroundCache, get_style_key
+from .frame_rate import resample_frames, SourceFrame, OutputFrame
+from .pipeline import run_render_pipeline, StageStatistics
+from .plot_backend import create_figure
 from .progress_bar import progress_bar
+from .video_writer import VideoWriter, OpenCvVideoWriter, create_video_writer
 
 logger = logger.getChild("video_renderer")
 
 DPI = 100
 
+Region = Tuple[slice, slice]
+"""Rows and columns of an image"""
+
+FALLBACK_FPS = 32
+"""Output frame rate for source videos that do not report their frame rate"""
+
+FrameSpan = Tuple[int, Optional[int]]
+"""Start and stop index of consecutive video frames. A stop of None continues until the video ends."""
+
+INTERMEDIATE_FOURCC_CODEC = "FFV1"
+"""Lossless codec for the segments written by worker processes during parallel rendering"""
+
 
 class VideoRenderer:
     """
@@ -38,6 +64,8 @@ class VideoRenderer:
         synchronization_function: Callable[
             [pd.DataFrame, pd.DataFrame, bool, Optional[bool]], pd.Timedelta
         ] = get_synchronization_offset,
+        annotation_provider: Optional[AnnotationImageProvider] = None,
+        skeleton_provider: Optional[SkeletonImageProvider] = None,
     ):
         """
         :param render_config: rendering configuration, e.g., horizontal or vertical stacking
@@ -45,59 +73,271 @@ class VideoRenderer:
         :param graph_providers: the graph providers for each sensor
         :param synchronization_function: a synchronization function that adheres to the specifications of
                                          sevivi.synchronizer.synchronizer.get_synchronization_offset
+        :param annotation_provider: shows annotation tracks in a strip above the video and as spans in the graphs
+        :param skeleton_provider: shows a 3D skeleton in a square panel to the right of the video and the graphs
         """
         self.synchronization_function = synchronization_function
         self.render_config = render_config
         self.video_provider = video_provider
         self.graph_providers = graph_providers
+        self.annotation_provider = annotation_provider
+        self.skeleton_provider = skeleton_provider
+        self.pipeline_statistics: List[StageStatistics] = []
+        """Statistics of the decode, plot and encode stages of the last pipelined render"""
 
         self._graph_count = sum([gp.get_graph_count() for gp in self.graph_providers])
         self.__src_vid_dims = self.video_provider.get_dimensions()
+        self._scale, self._frame_step = self._get_preview_settings()
+        self.__shown_vid_dims = Dimensions(
+            w=round(self.__src_vid_dims.w * self._scale),
+            h=round(self.__src_vid_dims.h * self._scale),
+        )
+        self._source_fps = self._get_source_frame_rate()
+        self._output_fps = (
+            self.render_config.target_fps or self._source_fps
+        ) / self._frame_step
+        self._strip_height = (
+            0
+            if annotation_provider is None
+            else annotation_provider.get_strip_height(self._scale)
+        )
+        self._strip_region = (slice(0, self._strip_height), slice(None))
+        """Rows and columns of the target image that show the label strip of the annotations"""
+        self._panel_size = 0 if skeleton_provider is None else self.__shown_vid_dims.h
         self._plot_dims, self.__tgt_vid_dims = self._prepare_dimensions()
-        self._fig, self._axs = self._prepare_figure()
+        self._plot_regions, self._video_region = self._prepare_regions()
+        self._panel_region = (
+            slice(self._strip_height, self._strip_height + self._panel_size),
+            slice(self.__tgt_vid_dims.w - self._panel_size, None),
+        )
+        """Rows and columns of the target image that show the skeleton panel"""
         self._prepare_graph_providers()
 
+    def __getstate__(self) -> Dict:
+        """Drop the figure when pickling, e.g., to send this renderer to a render worker process"""
+        state = self.__dict__.copy()
+        del state["_fig"]
+        del state["_axs"]
+        del state["_plot_background"]
+        del state["_plot_image"]
+        return state
+
+    def __setstate__(self, state: Dict):
+        """
+        Restore a pickled renderer with a new figure.
+        The graph providers keep the offsets applied before pickling, so synchronization does not run again.
+        """
+        self.__dict__.update(state)
+        self._prepare_plots()
+
+    def _get_preview_settings(self) -> Tuple[float, int]:
+        """Get the factor applied to the video and plot dimensions and the step between rendered frames"""
+        if not self.render_config.preview:
+            return 1.0, 1
+        logger.info(
+            f"Rendering preview at {self.render_config.preview_scale}x resolution "
+            f"with every {self.render_config.preview_frame_step}. frame"
+        )
+        return self.render_config.preview_scale, self.render_config.preview_frame_step
+
+    def _get_source_frame_rate(self) -> float:
+        """Get the frame rate of the source video, or a fallback if the video does not report it"""
+        fps = self.video_provider.get_frame_rate()
+        if fps is None or not fps > 0:
+            logger.warning(f"Unknown source frame rate, assuming {FALLBACK_FPS} fps")
+            return FALLBACK_FPS
+        return fps
+
     def _prepare_dimensions(self) -> Tuple[Dimensions, Dimensions]:
-        """Calculate the desired plot and target video dimensions"""
-        src_vid_dim = self.__src_vid_dims
+        """
+        Calculate the desired plot and target video dimensions. The label strip is added above everything,
+        and the skeleton panel to the right of everything.
+        """
+        src_vid_dim = self.__shown_vid_dims
         if self.render_config.stacking_direction == StackingDirection.VERTICAL:
-            plot_w, plot_h = src_vid_dim.w, 200 * self._graph_count
+            plot_w, plot_h = src_vid_dim.w, round(200 * self._scale) * self._graph_count
             video_w, video_h = src_vid_dim.w, src_vid_dim.h + plot_h
         else:
             plot_w, plot_h = src_vid_dim.w, src_vid_dim.h
             video_w, video_h = src_vid_dim.w // 2 + plot_w, src_vid_dim.h
-        return Dimensions(plot_w, plot_h), Dimensions(video_w, video_h)
+        return Dimensions(plot_w, plot_h), Dimensions(
+            video_w + self._panel_size, video_h + self._strip_height
+        )
 
-    def _prepare_figure(self) -> Tuple[Figure, np.ndarray]:
-        """Create a figure with subplots and return the figure and its subplots"""
+    def _prepare_regions(
+        self,
+    ) -> Tuple[List[Tuple[Region, Region]], Tuple[Region, Region]]:
+        """
+        Calculate where the plot image and the source video are placed in the target image.
+        Returns the list of (target, plot image) region pairs and the (target, source video) region pair.
+        The source video region is given in the dimensions of the source video, which may be scaled
+        to the target region in preview mode.
+        """
+        src_vid_dim = self.__shown_vid_dims
+        everything = (slice(None), slice(None))
+        # everything goes below the label strip and left of the skeleton panel
+        top = self._strip_height
+        right = self.__tgt_vid_dims.w - self._panel_size
+        if self.render_config.stacking_direction == StackingDirection.VERTICAL:
+            # the plots go below the original video image
+            below_src_vid = slice(
+                top + src_vid_dim.h, top + src_vid_dim.h + self._plot_dims.h
+            )
+            plot_regions = [((below_src_vid, slice(0, right)), everything)]
+            video_region = (
+                (slice(top, top + src_vid_dim.h), slice(0, right)),
+                everything,
+            )
+        else:
+            # the center half of the original video image goes between the halves of the plots
+            plot_center = self._plot_dims.w // 2
+            video_half_w = src_vid_dim.w // 2
+            plot_regions = [
+                (
+                    (slice(top, None), slice(0, plot_center)),
+                    (slice(None), slice(0, plot_center)),
+                ),
+                (
+                    (slice(top, None), slice(plot_center + video_half_w, right)),
+                    (slice(None), slice(plot_center, None)),
+                ),
+            ]
+            full_src_vid_w = self.__src_vid_dims.w
+            source_video_half = slice(
+                full_src_vid_w // 4, full_src_vid_w // 4 + full_src_vid_w // 2
+            )
+            video_region = (
+                (slice(top, None), slice(plot_center, plot_center + video_half_w)),
+                (slice(None), source_video_half),
+            )
+        return plot_regions, video_region
+
+    def _prepare_figure(self) -> Tuple[object, np.ndarray]:
+        """Create a figure with subplots for the configured plot backend and return the figure and its subplots"""
         graph_rows = ceil(self._graph_count / self.render_config.plot_column_count)
         graph_cols = self.render_config.plot_column_count
 
-        figsize = self._plot_dims.w / DPI, self._plot_dims.h / DPI
-        fig, axs = plt.subplots(
+        # scaling the dpi keeps the layout of a full render in preview mode
+        fig, axs = create_figure(
+            self.render_config.plot_backend,
             graph_rows,
             graph_cols,
-            figsize=figsize,
-            squeeze=False,
-            dpi=DPI,
+            self._plot_dims,
+            DPI * self._scale,
         )
-        plt.tight_layout()
-
         return fig, axs.ravel()
 
     def _prepare_graph_providers(self):
-        """Set offsets to graph providers and assigns the available axes to the graph providers"""
-        assigned_axis_count = 0
+        """Set offsets and annotation spans to graph providers and prepare the plots they render to"""
         for gp in self.graph_providers:
             gp.set_offset(self._calc_offset(gp))
+            if self.annotation_provider is not None:
+                gp.set_annotation_spans(*self.annotation_provider.get_spans())
+        self._prepare_plots()
 
+    def _prepare_plots(self):
+        """
+        Prepare the figure, assign its axes to the graph providers and prepare the raster rendering.
+        If the background cache contains the raster state for the same plots, restore it instead,
+        so the figure is not created at all.
+        """
+        self._fig, self._axs = None, None
+        self._plot_background, self._plot_image = None, None
+        cache, cache_key = self._get_background_cache(), None
+        if cache is not None and all(
+            gp.supports_raster_rendering() for gp in self.graph_providers
+        ):
+            cache_key = self._get_background_cache_key()
+            cached = cache.get(cache_key)
+            if cached is not None:
+                self._plot_background = cached["plot_background"]
+                self._plot_image = self._plot_background.copy()
+                for gp, gp_state in zip(
+                    self.graph_providers, cached["graph_providers"]
+                ):
+                    gp.set_raster_state(gp_state)
+                return
+
+        self._fig, self._axs = self._prepare_figure()
+        self._assign_axes()
+        self._prepare_raster()
+        if cache_key is not None and self._plot_background is not None:
+            cache.put(
+                cache_key,
+                {
+                    "plot_background": self._plot_background,
+                    "graph_providers": [
+                        gp.get_raster_state() for gp in self.graph_providers
+                    ],
+                },
+            )
+
+    def _get_background_cache(self) -> Optional[BackgroundCache]:
+        """Get the background cache of the render config, or None if it is disabled"""
+        if self.render_config.background_cache_dir is None:
+            return None
+        return BackgroundCache(
+            self.render_config.background_cache_dir,
+            int(self.render_config.background_cache_max_mb * 2**20),
+        )
+
+    def _get_background_cache_key(self) -> str:
+        """
+        Get a hash of everything that determines the plot background and the raster state of the graph providers:
+        the data, graph groups, offsets and plotting method of all providers, the plot backend, the figure dimensions
+        and the matplotlib style
+        """
+        return hashlib.sha256(
+            repr(
+                (
+                    get_style_key(),
+                    self.render_config.plot_backend.name,
+                    self._plot_dims,
+                    DPI * self._scale,
+                    self.render_config.plot_column_count,
+                    [gp.get_raster_cache_key() for gp in self.graph_providers],
+                )
+            ).encode()
+        ).hexdigest()
+
+    def _assign_axes(self):
+        """
+        Assign the available axes of the figure to the graph providers,
+        then draw the figure once and let all graph providers capture their backgrounds from it
+        """
+        assigned_axis_count = 0
+        for gp in self.graph_providers:
             axis_idx_limit = assigned_axis_count + gp.get_graph_count()
-            gp.set_axs(self._fig, self._axs[assigned_axis_count:axis_idx_limit])
+            gp.set_axs(
+                self._fig,
+                self._axs[assigned_axis_count:axis_idx_limit],
+                capture_backgrounds=False,
+            )
             logger.debug(
                 f"Assigned axis {assigned_axis_count}:{axis_idx_limit} to GP {gp.sensor_config.name}"
             )
             assigned_axis_count += gp.get_graph_count()
 
+        self._fig.canvas.draw()
+        for gp in self.graph_providers:
+            gp.capture_backgrounds(self._fig)
+
+    def _prepare_raster(self):
+        """
+        If all graph providers can paint their frames into an image of the static graphs,
+        keep the figure drawn by _assign_axes as background for stitch_plot_image.
+        """
+        if not all(gp.supports_raster_rendering() for gp in self.graph_providers):
+            return
+
+        canvas_buffer = self._fig.canvas.buffer_rgba()
+        self._plot_background = cv2.cvtColor(
+            np.asarray(canvas_buffer), cv2.COLOR_RGBA2BGR
+        )
+        self._plot_image = self._plot_background.copy()
+        for gp in self.graph_providers:
+            gp.prepare_raster(self._fig)
+
     def _calc_offset(
         self, graph_provider: GraphImageProvider
     ) -> Optional[pd.Timedelta]:
@@ -128,49 +368,247 @@ class VideoRenderer:
         return offset
 
     def stitch_plot_image(self, ts: pd.Timestamp) -> np.ndarray:
-        # self.graph_providers["1"].render_graph_axes(self._fig, ts)
+        """
+        Return the BGR image of all graphs at the given timestamp.
+        The returned array may be reused for the next timestamp.
+        """
+        plot_image = self._render_plot_image(ts)
+        if plot_image.shape[2] == 4:
+            return cv2.cvtColor(plot_image, cv2.COLOR_RGBA2BGR)
+        return plot_image
+
+    def _render_plot_image(self, ts: pd.Timestamp) -> np.ndarray:
+        """
+        Render all graphs at the given timestamp without allocating a new image.
+        Returns the reused BGR image of the pre-rendered graphs if available,
+        or a view of the RGBA canvas buffer of the matplotlib figure.
+        """
+        if self._plot_background is not None:
+            for gp in self.graph_providers:
+                gp.restore_graph_axes(self._plot_image, self._plot_background)
+                gp.paint_graph_axes(self._plot_image, ts)
+            return self._plot_image
+
         for gp in self.graph_providers:
             gp.render_graph_axes(self._fig, ts)
-
-        canvas_buffer = self._fig.canvas.buffer_rgba()
-        return cv2.cvtColor(np.asarray(canvas_buffer), cv2.COLOR_RGBA2BGR)
+        return np.asarray(self._fig.canvas.buffer_rgba())
 
     def render_video(self):
         """Renders the video from given VideoImageProvider and GraphImageProviders using the given RenderConfig."""
-        src_vid_dim = self.__src_vid_dims
-        image = np.empty(
-            (self.__tgt_vid_dims.h, self.__tgt_vid_dims.w, 3), dtype=np.uint8
+        spans = self._get_frame_spans()
+        if (
+            self.render_config.split_time_ranges
+            and len(self.render_config.time_ranges) > 0
+        ):
+            root, ext = os.path.splitext(self.render_config.target_file_path)
+            outputs = [(f"{root}_{i}{ext}", [span]) for i, span in enumerate(spans)]
+        else:
+            outputs = [(self.render_config.target_file_path, spans)]
+
+        for path, output_spans in outputs:
+            logger.info(f"Rendering frames {output_spans} to {path}")
+            if self.render_config.process_count > 1:
+                self._render_parallel(path, output_spans)
+                continue
+
+            writer = self._create_writer(path)
+            image_count = self.video_provider.get_image_count()
+            for start, stop in output_spans:
+                self.video_provider.seek(start)
+                # the frame count reported by OpenCV may be inaccurate, so a span without stop renders until the video ends
+                self._render_frames(
+                    writer,
+                    None if stop is None else stop - start,
+                    progress_total=(stop or image_count) - start,
+                )
+            writer.release()
+
+    def _get_frame_spans(self) -> List[FrameSpan]:
+        """Get the frames of the configured time ranges, or of the whole video if no time ranges are configured"""
+        if len(self.render_config.time_ranges) == 0:
+            return [(0, None)]
+
+        image_count = self.video_provider.get_image_count()
+        spans = []
+        for start_s, end_s in self.render_config.time_ranges:
+            # the frames shown at or after start and before end
+            start = ceil(start_s * self._source_fps)
+            stop = ceil(end_s * self._source_fps)
+            if start >= image_count:
+                raise ValueError(
+                    f"Time range [{start_s}, {end_s}] starts after the video ends"
+                )
+            spans.append((start, None if stop >= image_count else stop))
+        return spans
+
+    def _get_segments(self, spans: List[FrameSpan]) -> List[FrameSpan]:
+        """Split the frame spans into segments for the worker processes, proportional to their length"""
+        process_count = self.render_config.process_count
+        image_count = self.video_provider.get_image_count()
+        lengths = [(stop or image_count) - start for start, stop in spans]
+        total_length = sum(lengths)
+
+        segments = []
+        for (start, stop), length in zip(spans, lengths):
+            part_count = max(1, round(process_count * length / total_length))
+            bounds = np.linspace(start, start + length, part_count + 1).astype(int)
+            # the frame count reported by OpenCV may be inaccurate, so a span without stop renders until the video ends
+            stops = [*bounds[1:-1], stop]
+            segments.extend(zip(bounds[:-1], stops))
+        return segments
+
+    def _render_parallel(self, target_file_path: str, spans: List[FrameSpan]):
+        """
+        Render contiguous segments of the given frame spans in worker processes and concatenate them into the
+        target file. Offsets have already been applied to the graph providers, so the workers do not synchronize again.
+        """
+        process_count = self.render_config.process_count
+        segments = self._get_segments(spans)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            segment_paths = [
+                os.path.join(tmp_dir, f"segment_{i}.avi") for i in range(len(segments))
+            ]
+            logger.info(f"Rendering {len(segments)} segments {segments}")
+            with ProcessPoolExecutor(max_workers=process_count) as executor:
+                for path in executor.map(
+                    _render_segment,
+                    repeat(self),
+                    [start for start, _ in segments],
+                    [stop for _, stop in segments],
+                    segment_paths,
+                ):
+                    logger.debug(f"Finished rendering segment {path}")
+
+            writer = self._create_writer(target_file_path)
+            for path in segment_paths:
+                segment = cv2.VideoCapture(path)
+                while segment.isOpened():
+                    frame_exists, frame = segment.read()
+                    if not frame_exists:
+                        break
+                    writer.write(frame)
+                segment.release()
+            writer.release()
+
+    def _create_writer(self, path: str) -> VideoWriter:
+        """Create a writer for the target video dimensions using the configured backend"""
+        return create_video_writer(
+            self.render_config, path, self._output_fps, self.__tgt_vid_dims
         )
 
-        writer = cv2.VideoWriter(
-            self.render_config.target_file_path,
-            cv2.VideoWriter_fourcc(*self.render_config.fourcc_codec),
-            32,
-            tuple(self.__tgt_vid_dims),
+    def _create_intermediate_writer(self, path: str) -> VideoWriter:
+        """Create a writer that stores frames losslessly, e.g., for segments of a parallel render"""
+        return OpenCvVideoWriter(
+            path, INTERMEDIATE_FOURCC_CODEC, self._output_fps, self.__tgt_vid_dims
         )
 
-        video_provider = self.video_provider
-        images, image_count = video_provider.images(), video_provider.get_image_count()
-        for index, (ts, src_image) in progress_bar(images, image_count):
-            plot_image = self.stitch_plot_image(ts)
+    def _render_frames(
+        self,
+        writer: VideoWriter,
+        frame_count: Optional[int],
+        progress_total: Optional[int] = None,
+    ):
+        """
+        Render the next frame_count images of the video provider, or all remaining images if frame_count is None,
+        and write them to the given writer.
+        If progress_total is given, a progress bar shows how many of the expected progress_total images are rendered.
+        """
+        frame_timestamps = self.video_provider.get_frame_timestamps()
+        for gp in self.graph_providers:
+            gp.set_frame_timestamps(frame_timestamps)
 
-            if self.render_config.stacking_direction == StackingDirection.VERTICAL:
-                # add the original video image
-                image[: src_vid_dim.h, :, :] = src_image
-                below_src_vid = slice(src_vid_dim.h, src_vid_dim.h + self._plot_dims.h)
-                image[below_src_vid, :, :] = plot_image
+        images = islice(self.video_provider.images(), frame_count)
+        if progress_total is not None:
+            images = (item for _, item in progress_bar(images, progress_total))
+
+        frames = self._get_output_frames(images)
+        queue_size = self.render_config.pipeline_queue_size
+        if queue_size > 0:
+            self.pipeline_statistics = run_render_pipeline(
+                frames,
+                self._compose_frame,
+                writer.write,
+                [self._create_target_image() for _ in range(queue_size + 2)],
+                queue_size,
+            )
+        else:
+            image = self._create_target_image()
+            for ts, src_image, count in frames:
+                self._compose_frame(image, ts, src_image)
+                for _ in range(count):
+                    writer.write(image)
+
+    def _get_output_frames(
+        self, images: Iterable[SourceFrame]
+    ) -> Iterable[OutputFrame]:
+        """
+        Pair the source frames with how often they are written to achieve the output frame rate.
+        Source frames that are not needed for the output frame rate are dropped.
+        """
+        if self._output_fps == self._source_fps:
+            return ((ts, src_image, 1) for ts, src_image in images)
+        return resample_frames(images, self._output_fps, self._source_fps)
+
+    def _create_target_image(self) -> np.ndarray:
+        """
+        Allocate a white image with the target video dimensions.
+        Parts that no region covers, e.g., below the skeleton panel in vertical stacking, stay white.
+        """
+        return np.full(
+            (self.__tgt_vid_dims.h, self.__tgt_vid_dims.w, 3), 255, dtype=np.uint8
+        )
+
+    def _compose_frame(
+        self, image: np.ndarray, ts: pd.Timestamp, src_image: np.ndarray
+    ):
+        """
+        Write the source image, the graphs, the label strip and the skeleton panel at the given timestamp into the
+        target image.
+        Copies go directly into views of the target image, so no images are allocated.
+        """
+        if self.annotation_provider is not None:
+            self.annotation_provider.paint_strip(image[self._strip_region], ts)
+        if self.skeleton_provider is not None:
+            self.skeleton_provider.paint_panel(image[self._panel_region], ts)
+        plot_image = self._render_plot_image(ts)
+        is_rgba = plot_image.shape[2] == 4
+        for target_region, plot_region in self._plot_regions:
+            if is_rgba:
+                # cvtColor writes into the given view of the target image instead of allocating a new array
+                cv2.cvtColor(
+                    plot_image[plot_region],
+                    cv2.COLOR_RGBA2BGR,
+                    dst=image[target_region],
+                )
             else:
-                # add the center half of the original video image
-                plot_center = self._plot_dims.w // 2
-                tgt_vid_left = slice(0, plot_center)
-                tgt_vid_center = slice(plot_center, plot_center + src_vid_dim.w // 2)
-                tgt_vid_right = slice(src_vid_dim.w // 2 + plot_center, None, None)
+                np.copyto(image[target_region], plot_image[plot_region])
 
-                source_video_half = slice(src_vid_dim.w // 4, 3 * src_vid_dim.w // 4)
+        target_region, source_region = self._video_region
+        if self._scale == 1:
+            np.copyto(image[target_region], src_image[source_region])
+        else:
+            target_view = image[target_region]
+            cv2.resize(
+                src_image[source_region],
+                (target_view.shape[1], target_view.shape[0]),
+                dst=target_view,
+                interpolation=cv2.INTER_AREA,
+            )
 
-                image[:, tgt_vid_left, :] = plot_image[:, tgt_vid_left, :]
-                image[:, tgt_vid_center, :] = src_image[:, source_video_half, :]
-                image[:, tgt_vid_right, :] = plot_image[:, plot_center:, :]
 
-            writer.write(image)
-        writer.release()
+def _render_segment(
+    renderer: VideoRenderer, start: int, stop: Optional[int], path: str
+) -> str:
+    """
+    Render the frames [start, stop) of the video losslessly into the file at path.
+    Runs in a worker process on an unpickled copy of the renderer, which builds its own figure.
+    """
+    renderer.video_provider.seek(start)
+    # noinspection PyProtectedMember
+    writer = renderer._create_intermediate_writer(path)
+    frame_count = None if stop is None else stop - start
+    # noinspection PyProtectedMember
+    renderer._render_frames(writer, frame_count)
+    writer.release()
+    return path
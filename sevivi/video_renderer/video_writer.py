@@ -0,0 +1,166 @@
+"""VideoWriters encode the rendered frames into the target video file"""
+import subprocess
+import tempfile
+from typing import List
+
+import cv2
+import numpy as np
+
+from sevivi.config import FfmpegConfig, RenderConfig, VideoWriterBackend
+from sevivi.image_provider import Dimensions
+from sevivi.log import logger
+
+logger = logger.getChild("video_writer")
+
+X264_STYLE_CODECS = ("libx264", "libx264rgb", "libx265")
+"""ffmpeg encoders that accept the -preset and -crf options of FfmpegConfig"""
+
+
+class VideoWriter:
+    """VideoWriters encode the rendered frames into the target video file"""
+
+    def write(self, image: np.ndarray):
+        """Append a BGR image with the dimensions given on creation to the video"""
+        raise NotImplementedError(
+            "write must be implemented by VideoWriter subclasses!"
+        )
+
+    def release(self):
+        """Finish the video file. No images may be written afterwards."""
+        raise NotImplementedError(
+            "release must be implemented by VideoWriter subclasses!"
+        )
+
+
+class OpenCvVideoWriter(VideoWriter):
+    """Encodes frames with cv2.VideoWriter using a fourcc codec"""
+
+    def __init__(
+        self, path: str, fourcc_codec: str, fps: float, dimensions: Dimensions
+    ):
+        self.__writer = cv2.VideoWriter(
+            path, cv2.VideoWriter_fourcc(*fourcc_codec), fps, tuple(dimensions)
+        )
+        if not self.__writer.isOpened():
+            raise RuntimeError(
+                f"OpenCV could not open {path} for writing with codec {fourcc_codec}"
+            )
+
+    def write(self, image: np.ndarray):
+        """Append a BGR image with the dimensions given on creation to the video"""
+        self.__writer.write(image)
+
+    def release(self):
+        """Finish the video file. No images may be written afterwards."""
+        self.__writer.release()
+
+
+class FfmpegVideoWriter(VideoWriter):
+    """Encodes frames by piping them as raw BGR video to a local ffmpeg process"""
+
+    def __init__(
+        self, path: str, fps: float, dimensions: Dimensions, config: FfmpegConfig
+    ):
+        command = get_ffmpeg_command(path, fps, dimensions, config)
+        logger.debug(f"Starting {' '.join(command)}")
+        # a pipe that is only read after ffmpeg exits could fill up and block ffmpeg, and with it write()
+        self.__stderr = tempfile.TemporaryFile()
+        try:
+            self.__process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=self.__stderr,
+            )
+        except FileNotFoundError as e:
+            self.__stderr.close()
+            raise FileNotFoundError(
+                f"Could not run ffmpeg executable '{config.executable}'. "
+                "Install ffmpeg, configure its path, or use the opencv video writer."
+            ) from e
+
+    def write(self, image: np.ndarray):
+        """Append a BGR image with the dimensions given on creation to the video"""
+        try:
+            # passing the buffer of the image avoids copying it into a bytes object
+            self.__process.stdin.write(np.ascontiguousarray(image).data)
+        except BrokenPipeError:
+            self.__raise_ffmpeg_error()
+
+    def release(self):
+        """Finish the video file. No images may be written afterwards."""
+        try:
+            self.__process.stdin.close()
+        except BrokenPipeError:
+            pass
+        if self.__process.wait() != 0:
+            self.__raise_ffmpeg_error()
+        self.__stderr.close()
+
+    def __raise_ffmpeg_error(self):
+        self.__process.wait()
+        self.__stderr.seek(0)
+        error = self.__stderr.read().decode(errors="replace")
+        self.__stderr.close()
+        raise RuntimeError(
+            f"ffmpeg failed with exit code {self.__process.returncode}: {error}"
+        )
+
+
+def get_ffmpeg_command(
+    path: str, fps: float, dimensions: Dimensions, config: FfmpegConfig
+) -> List[str]:
+    """
+    Get the command line of an ffmpeg process encoding raw BGR frames from stdin into the given file.
+    The preset and crf are only passed if they are configured and the codec is one of X264_STYLE_CODECS.
+    """
+    encoder_options = []
+    for option, value in (("-preset", config.preset), ("-crf", config.crf)):
+        if value is None:
+            continue
+        if config.codec not in X264_STYLE_CODECS:
+            logger.warning(
+                f"Ignoring {option} {value}, which the ffmpeg encoder {config.codec} does not accept"
+            )
+            continue
+        encoder_options += [option, str(value)]
+
+    return [
+        config.executable,
+        "-y",
+        "-loglevel",
+        "error",
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "bgr24",
+        "-s",
+        f"{dimensions.w}x{dimensions.h}",
+        "-r",
+        str(fps),
+        "-i",
+        "-",
+        "-an",
+        "-c:v",
+        config.codec,
+        *encoder_options,
+        "-pix_fmt",
+        config.pixel_format,
+        "-threads",
+        str(config.threads),
+        path,
+    ]
+
+
+def create_video_writer(
+    render_config: RenderConfig, path: str, fps: float, dimensions: Dimensions
+) -> VideoWriter:
+    """Create a VideoWriter for the backend selected in the RenderConfig"""
+    if render_config.video_writer_backend == VideoWriterBackend.FFMPEG:
+        return FfmpegVideoWriter(path, fps, dimensions, render_config.ffmpeg_config)
+    elif render_config.video_writer_backend == VideoWriterBackend.OPENCV:
+        return OpenCvVideoWriter(path, render_config.fourcc_codec, fps, dimensions)
+    else:
+        raise ValueError(
+            f"Unknown video writer backend {render_config.video_writer_backend}"
+        )
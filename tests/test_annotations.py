@@ -0,0 +1,122 @@
+from datetime import datetime
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from sevivi.config import SensorConfig, PlottingMethod
+from sevivi.image_provider import (
+    AnnotationImageProvider,
+    AnnotationTrack,
+    GraphImageProvider,
+)
+from sevivi.image_provider.annotation_provider import IntervalIndex
+from sevivi.image_provider.graph_provider.raster_figure import create_raster_subplots
+from sevivi.image_provider.graph_provider.utils import get_pixel_bounds, to_bgr
+from sevivi.video_renderer.instantiation_helpers import read_annotation_csv
+
+
+def test_interval_index_matches_scan():
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, 1000, 500)
+    ends = starts + rng.integers(0, 50, 500)
+    # a long interval that keeps later intervals as candidates
+    ends[0] = starts[0] + 800
+    index = IntervalIndex(starts, ends)
+    for time in range(-10, 1100, 7):
+        expected = np.flatnonzero((starts <= time) & (time < ends))
+        assert np.array_equal(np.sort(index.get_active(time)), expected)
+
+    assert len(IntervalIndex(np.empty(0), np.empty(0)).get_active(3)) == 0
+
+
+def test_label_strip(run_in_repo_root):
+    track = read_annotation_csv("test_files/annotations/repetitions.csv", "exercise")
+    assert list(track.labels) == ["squat", "squat", "jump", "artefact"]
+    annotation_provider = AnnotationImageProvider([track])
+    assert annotation_provider.get_strip_height() == 24
+    assert annotation_provider.get_strip_height(0.5) == 12
+
+    def paint(seconds: float) -> np.ndarray:
+        strip = np.zeros((24, 400, 3), dtype=np.uint8)
+        annotation_provider.paint_strip(strip, pd.to_datetime(seconds, unit="s"))
+        return strip
+
+    def has_color(strip: np.ndarray, label: str) -> bool:
+        color = to_bgr(annotation_provider.get_label_color(label))
+        return bool(np.all(strip == color, axis=2).any())
+
+    empty = paint(0.5)
+    assert not has_color(empty, "squat")
+    assert has_color(paint(1.0), "squat") and not has_color(paint(2.5), "squat")
+    both = paint(5.6)
+    assert has_color(both, "jump") and has_color(both, "artefact")
+    # the same labels paint the same strip
+    assert np.array_equal(paint(4.0), paint(1.5))
+    assert np.array_equal(paint(2.7), empty)
+
+
+def _graph_provider_with_spans(plotting_method: PlottingMethod) -> GraphImageProvider:
+    dti = pd.date_range(datetime(1970, 1, 1), periods=1000, freq="10ms")
+    df = pd.DataFrame(data={"A": np.sin(np.arange(1000) / 30)}, index=dti)
+    graph_image_provider = GraphImageProvider(
+        df, SensorConfig(), plotting_method, scrolling_window_seconds=2
+    )
+    # a red span from 2 to 4 seconds
+    graph_image_provider.set_annotation_spans(
+        np.array([2 * 10**9]), np.array([4 * 10**9]), ["red"]
+    )
+    return graph_image_provider
+
+
+def _reddish_columns(image: np.ndarray, bounds) -> np.ndarray:
+    left, top, right, bottom = bounds
+    interior = image[top + 5 : bottom - 5, left:right].astype(int)
+    # the white face color is shaded towards red in BGR
+    reddish = (interior[..., 2] > 200) & (interior[..., 1] < 230)
+    return np.flatnonzero(reddish.mean(axis=0) > 0.5) + left
+
+
+def test_spans_are_part_of_the_background():
+    for create_subplots in (
+        lambda: plt.subplots(1, 1, figsize=(4, 2), dpi=100, squeeze=False),
+        lambda: create_raster_subplots(1, 1, 400, 200, 100),
+    ):
+        graph_image_provider = _graph_provider_with_spans(
+            PlottingMethod.MOVING_VERTICAL_LINE
+        )
+        fig, axs = create_subplots()
+        graph_image_provider.set_axs(fig, axs.ravel())
+        background = np.asarray(fig.canvas.buffer_rgba())[..., 2::-1]
+        bounds = get_pixel_bounds(axs[0, 0], 200)
+        columns = _reddish_columns(background, bounds)
+        plt.close("all")
+
+        left, _, right, _ = bounds
+        # the span covers a fifth of the 10 seconds shown in the axis
+        expected = (right - left) / 5
+        assert abs(len(columns) - expected) <= 3
+        assert abs(columns[0] - (left + (right - left) / 5)) <= 2
+
+
+def test_spans_scroll_with_the_window():
+    graph_image_provider = _graph_provider_with_spans(PlottingMethod.SCROLLING_WINDOW)
+    fig, axs = create_raster_subplots(1, 1, 400, 200, 100)
+    graph_image_provider.set_axs(fig, axs.ravel())
+    background = np.asarray(fig.canvas.buffer_rgba())[..., 2::-1].copy()
+    graph_image_provider.prepare_raster(fig)
+    bounds = get_pixel_bounds(axs[0, 0], 200)
+    left, _, right, _ = bounds
+    center = (left + right) / 2
+
+    width = right - left
+    # the window shows 4 seconds, so the span covers half of it or its first second a quarter
+    for seconds, span_left, span_width in (
+        (3, center - width / 4, width / 2),
+        (1, center + width / 4, width / 4),
+    ):
+        image = background.copy()
+        graph_image_provider.paint_graph_axes(image, pd.to_datetime(seconds, unit="s"))
+        columns = _reddish_columns(image, bounds)
+        assert abs(columns[0] - span_left) <= 2
+        assert abs(len(columns) - span_width) <= 4
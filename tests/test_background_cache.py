@@ -0,0 +1,108 @@
+import os
+import pickle
+import time
+
+import cv2
+import numpy as np
+
+from sevivi import read_configs, video_renderer_from_csv_files
+from sevivi.config import PlottingMethod
+from sevivi.video_renderer.background_cache import BackgroundCache
+
+
+def test_background_cache_evicts_least_recently_used(tmp_path):
+    cache = BackgroundCache(str(tmp_path), max_bytes=4000)
+    assert cache.get("a") is None
+
+    cache.put("a", np.zeros(1000, dtype=np.uint8))
+    time.sleep(0.01)
+    cache.put("b", np.ones(1000, dtype=np.uint8))
+    time.sleep(0.01)
+    # using a makes b the least recently used entry
+    assert np.all(cache.get("a") == 0)
+    time.sleep(0.01)
+    cache.put("c", np.ones(1000, dtype=np.uint8))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_background_cache_ignores_broken_files(tmp_path):
+    cache = BackgroundCache(str(tmp_path), max_bytes=10000)
+    with open(os.path.join(tmp_path, "a.npz"), "wb") as f:
+        f.write(b"broken")
+    assert cache.get("a") is None
+
+
+class _Exploit:
+    def __reduce__(self):
+        return os.mkdir, (self.directory,)
+
+
+def test_background_cache_does_not_unpickle(tmp_path):
+    cache = BackgroundCache(str(tmp_path), max_bytes=10000)
+    _Exploit.directory = str(tmp_path / "exploited")
+    # a pickled object in place of the stored array runs code when it is unpickled
+    np.savez(
+        tmp_path / "a.npz",
+        metadata=np.array('{"__array__": 0}'),
+        array_count=np.array(1),
+        array_0=np.array([_Exploit()], dtype=object),
+    )
+    with open(tmp_path / "b.npz", "wb") as f:
+        pickle.dump(_Exploit(), f)
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert not os.path.exists(tmp_path / "exploited")
+
+
+def test_background_cache_restores_values(tmp_path):
+    cache = BackgroundCache(str(tmp_path), max_bytes=10000)
+    value = {
+        "background": np.arange(6, dtype=np.uint8).reshape(2, 3),
+        "states": [{"bounds": (1, 2), "scale": 0.5, "color": None, "name": "acc"}],
+    }
+    cache.put("a", value)
+    restored = cache.get("a")
+    assert np.array_equal(restored["background"], value["background"])
+    assert restored["background"].dtype == np.uint8
+    assert restored["states"] == value["states"]
+
+
+def test_background_cache_survives_unwritable_directory(tmp_path):
+    # a directory cannot be created below a regular file
+    (tmp_path / "file").write_bytes(b"")
+    cache = BackgroundCache(str(tmp_path / "file" / "cache"), max_bytes=10000)
+    cache.put("a", np.zeros(10))
+    assert cache.get("a") is None
+
+
+def test_cached_render_matches_drawn_render(run_in_repo_root, tmp_path):
+    frames = []
+    for plotting_method in (
+        PlottingMethod.MOVING_VERTICAL_LINE,
+        PlottingMethod.SCROLLING_WINDOW,
+    ):
+        for run in range(2):
+            config = read_configs(("test_files/test-data-configs/imu_sync.toml",))
+            config.render_config.plotting_method = plotting_method
+            config.render_config.value_readout = True
+            config.render_config.background_cache_dir = str(tmp_path / "cache")
+            config.render_config.time_ranges = [(5.0, 5.5)]
+            config.render_config.fourcc_codec = "FFV1"
+            config.render_config.target_file_path = str(tmp_path / f"{run}.avi")
+            video_renderer = video_renderer_from_csv_files(config)
+            # the second render restores the cached background instead of drawing a figure
+            assert (video_renderer._fig is None) == (run == 1)
+            video_renderer.render_video()
+
+            result = cv2.VideoCapture(config.render_config.target_file_path)
+            frames.append([result.read()[1] for _ in range(15)])
+
+        assert len(os.listdir(tmp_path / "cache")) == 1 + (
+            plotting_method == PlottingMethod.SCROLLING_WINDOW
+        )
+        drawn, cached = frames[-2:]
+        for drawn_frame, cached_frame in zip(drawn, cached):
+            assert np.array_equal(drawn_frame, cached_frame)
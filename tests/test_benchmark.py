@@ -0,0 +1,52 @@
+import json
+
+from sevivi.benchmark import BenchmarkConfig, run_benchmark, run, parse_arguments
+from sevivi.config import StackingDirection
+
+
+def test_run_benchmark(tmp_path):
+    config = BenchmarkConfig(
+        duration_seconds=1, width=160, height=120, sensor_rate=50, graph_count=4
+    )
+    result = run_benchmark(config, str(tmp_path))
+
+    assert result.frame_count == 30
+    assert result.frames_per_second > 0
+    assert 0 < result.graph_provider_setup_seconds < result.setup_seconds
+    assert set(result.stage_seconds) == {"decode", "plot", "composite", "encode"}
+    assert all(seconds > 0 for seconds in result.stage_seconds.values())
+
+
+def test_parse_arguments():
+    config, output, repeat = parse_arguments(
+        ["--graphs", "3", "--stacking-direction", "vertical", "--repeat", "2"]
+    )
+    assert config.graph_count == 3
+    assert config.stacking_direction == StackingDirection.VERTICAL
+    assert output is None
+    assert repeat == 2
+
+
+def test_json_output(tmp_path):
+    output = tmp_path / "results.json"
+    run(
+        [
+            "--duration",
+            "0.5",
+            "--width",
+            "160",
+            "--height",
+            "120",
+            "--graphs",
+            "2",
+            "--output",
+            str(output),
+        ]
+    )
+
+    with open(output) as f:
+        results = json.load(f)
+    assert len(results) == 1
+    assert results[0]["config"]["graph_count"] == 2
+    assert results[0]["config"]["stacking_direction"] == "HORIZONTAL"
+    assert results[0]["frame_count"] == 15
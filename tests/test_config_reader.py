@@ -2,7 +2,17 @@ from typing import Dict
 
 import pandas as pd
 import pytest
-from sevivi.config import config_reader, PlottingMethod, StackingDirection, VideoConfig
+from sevivi.config import (
+    config_reader,
+    PlottingMethod,
+    StackingDirection,
+    VideoConfig,
+    VideoWriterBackend,
+    PlotBackend,
+    PanelType,
+    DerivedOperation,
+    SkeletonPanelConfig,
+)
 from sevivi.config.config_reader import deep_update
 from sevivi.config.config_types.sensor_config import (
     SensorConfig,
@@ -88,6 +98,183 @@ def test_stack_direction(run_in_repo_root):
         config_reader.get_stacking_direction(_conf_dict("bad_stacking"))
 
 
+def test_process_count(run_in_repo_root):
+    config = _conf_dict("basic_config")
+    assert "process_count" not in config
+
+    config = _conf_dict("basic_config", "process_count")
+    assert config_reader.get_process_count(config) == 2
+
+    with pytest.raises(ValueError):
+        config_reader.get_process_count({"process_count": 0})
+
+
+def test_pipeline_queue_size(run_in_repo_root):
+    config = _conf_dict("basic_config", "pipeline_queue_size")
+    assert config_reader.get_pipeline_queue_size(config) == 4
+
+    with pytest.raises(ValueError):
+        config_reader.get_pipeline_queue_size({"pipeline_queue_size": -1})
+
+
+def test_background_cache(run_in_repo_root):
+    config = config_reader.read_configs(
+        (
+            "test_files/test-data-configs/imu_sync.toml",
+            "test_files/configs/background_cache.toml",
+        )
+    )
+    assert config.render_config.background_cache_dir == "sevivi_cache"
+    assert config.render_config.background_cache_max_mb == 64.0
+
+    with pytest.raises(ValueError):
+        config_reader.get_background_cache_max_mb({"background_cache_max_mb": 0})
+
+
+def test_target_fps(run_in_repo_root):
+    config = _conf_dict("basic_config", "target_fps")
+    assert config_reader.get_target_fps(config) == 15.0
+
+    with pytest.raises(ValueError):
+        config_reader.get_target_fps({"target_fps": 0})
+    with pytest.raises(ValueError):
+        config_reader.get_target_fps({"target_fps": "fast"})
+
+
+def test_preview(run_in_repo_root):
+    config = config_reader.read_configs(
+        (
+            "test_files/test-data-configs/imu_sync.toml",
+            "test_files/configs/preview.toml",
+        )
+    )
+    assert config.render_config.preview
+    assert config.render_config.preview_scale == 0.5
+    assert config.render_config.preview_frame_step == 2
+
+    with pytest.raises(ValueError):
+        config_reader.get_preview_scale({"preview_scale": 2})
+    with pytest.raises(ValueError):
+        config_reader.get_preview_frame_step({"preview_frame_step": 0})
+
+
+def test_time_ranges(run_in_repo_root):
+    config = _conf_dict("basic_config", "time_ranges")
+    assert config_reader.get_time_ranges(config) == [(10.0, 30.0), (62.5, 80.0)]
+
+    with pytest.raises(ValueError):
+        config_reader.get_time_ranges({"time_ranges": [10, 30]})
+    with pytest.raises(ValueError):
+        config_reader.get_time_ranges({"time_ranges": [[30, 10]]})
+
+
+def test_push_in_window_seconds():
+    assert (
+        config_reader.get_push_in_window_seconds({"push_in_window_seconds": 5}) == 5.0
+    )
+    with pytest.raises(ValueError):
+        config_reader.get_push_in_window_seconds({"push_in_window_seconds": -1})
+
+
+def test_scrolling_window_seconds():
+    assert (
+        config_reader.get_scrolling_window_seconds({"scrolling_window_seconds": 2})
+        == 2.0
+    )
+    with pytest.raises(ValueError):
+        config_reader.get_scrolling_window_seconds({"scrolling_window_seconds": 0})
+
+
+def test_spectrogram_window_seconds():
+    assert (
+        config_reader.get_spectrogram_window_seconds(
+            {"spectrogram_window_seconds": 0.25}
+        )
+        == 0.25
+    )
+    with pytest.raises(ValueError):
+        config_reader.get_spectrogram_window_seconds({"spectrogram_window_seconds": 0})
+
+
+def test_annotations(run_in_repo_root):
+    config = config_reader.read_configs(
+        (
+            "test_files/test-data-configs/imu_sync.toml",
+            "test_files/configs/annotations.toml",
+        )
+    )
+    assert len(config.annotation_configs) == 1
+    assert config.annotation_configs[0].path == "test_files/annotations/repetitions.csv"
+    assert config.annotation_configs[0].name == "exercise"
+    assert config.get_missing_files() == []
+
+    with pytest.raises(KeyError):
+        config_reader.get_annotation_configs({"annotation": [{"name": "a"}]})
+
+
+def test_skeleton_panel(run_in_repo_root):
+    assert (
+        config_reader.read_configs(
+            ("test_files/test-data-configs/kinect_sync_walking.toml",)
+        ).render_config.skeleton_panel_config
+        is None
+    )
+
+    config = _conf_dict("basic_config", "skeleton_panel")
+    panel_config = config_reader.get_skeleton_panel_config(config)
+    assert panel_config.azimuth_degrees == 90
+    assert panel_config.elevation_degrees == 20
+    assert config_reader.get_skeleton_panel_config({"skeleton_panel": {}}) == (
+        SkeletonPanelConfig()
+    )
+
+    with pytest.raises(KeyError):
+        config_reader.get_skeleton_panel_config({"skeleton_panel": {"zoom": 2}})
+    with pytest.raises(ValueError):
+        config_reader.get_skeleton_panel_config(
+            {"skeleton_panel": {"azimuth_degrees": "left"}}
+        )
+
+
+def test_value_readout(run_in_repo_root):
+    config = config_reader.read_configs(
+        (
+            "test_files/test-data-configs/imu_sync.toml",
+            "test_files/configs/value_readout.toml",
+        )
+    )
+    assert config.render_config.value_readout
+
+
+def test_plot_backend(run_in_repo_root):
+    config = config_reader.read_configs(
+        (
+            "test_files/test-data-configs/imu_sync.toml",
+            "test_files/configs/opencv_plot_backend.toml",
+        )
+    )
+    assert config.render_config.plot_backend == PlotBackend.OPENCV
+
+    with pytest.raises(KeyError):
+        config_reader.get_plot_backend({"plot_backend": "svg"})
+
+
+def test_video_writer(run_in_repo_root):
+    config = _conf_dict("basic_config", "ffmpeg_video_writer")
+    assert config_reader.get_video_writer_backend(config) == VideoWriterBackend.FFMPEG
+    ffmpeg_config = config_reader.get_ffmpeg_config(config)
+    assert ffmpeg_config.codec == "libx264"
+    assert ffmpeg_config.crf == 28
+    assert ffmpeg_config.preset == "veryfast"
+    assert ffmpeg_config.threads == 4
+    assert ffmpeg_config.pixel_format == "yuv420p"
+
+    with pytest.raises(KeyError):
+        config_reader.get_video_writer_backend(_conf_dict("bad_video_writer"))
+    with pytest.raises(KeyError):
+        config_reader.get_ffmpeg_config({"ffmpeg": {"bitrate": "5M"}})
+
+
 def test_read_imu_video_config(run_in_repo_root):
     imu_conf = _vid_conf("imu")
     assert imu_conf.path == "test_files/videos/imu_sync.mp4"
@@ -190,6 +377,50 @@ def test_sensor_with_start_and_end_time(run_in_repo_root):
     assert isinstance(conf.end_time, pd.Timestamp)
 
 
+def test_sensor_with_plotting_method(run_in_repo_root):
+    conf = _sensor_conf("spectrogram")["0"]
+    assert conf.plotting_method == PlottingMethod.SPECTROGRAM
+    assert _sensor_conf("start_time")["0"].plotting_method is None
+
+
+def test_sensor_with_panel_type(run_in_repo_root):
+    assert _sensor_conf("stacked")["0"].panel_type == PanelType.STACKED
+    assert _sensor_conf("start_time")["0"].panel_type == PanelType.LINES
+    assert config_reader.get_panel_type({"panel_type": "heatmap"}) == PanelType.HEATMAP
+    with pytest.raises(KeyError):
+        config_reader.get_panel_type({"panel_type": "bars"})
+
+
+def test_sensor_with_derived_channels(run_in_repo_root):
+    conf = _sensor_conf("derived")["0"]
+    assert conf.derived_cache
+    assert [channel.operation for channel in conf.derived] == [
+        DerivedOperation.MAGNITUDE,
+        DerivedOperation.LOWPASS,
+        DerivedOperation.RMS,
+        DerivedOperation.GRADIENT,
+    ]
+    assert conf.derived[0].columns == ["AccX", "AccY", "AccZ"]
+    assert conf.derived[1].columns == "Acc"
+    assert conf.derived[1].cutoff_hz == 5 and conf.derived[1].order == 2
+    assert conf.derived[2].window_seconds == 0.5
+    assert _sensor_conf("start_time")["0"].derived == []
+
+    def derived(**channel):
+        return config_reader.get_derived_channels(
+            {"derived": [{"name": "A", "columns": "A", **channel}]}
+        )
+
+    with pytest.raises(KeyError):
+        derived(operation="median")
+    with pytest.raises(KeyError):
+        derived(operation="magnitude", window="1s")
+    with pytest.raises(ValueError):
+        derived(operation="lowpass")
+    with pytest.raises(ValueError):
+        derived(operation="rms", window_seconds=0)
+
+
 def test_sensor_missing_attributes(run_in_repo_root):
     with pytest.raises(KeyError):
         _sensor_conf("missing_attributes")
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from sevivi.config import SensorConfig
+from sevivi.image_provider import GraphImageProvider
+from sevivi.image_provider.graph_provider.decimation import get_decimated_indices
+
+
+def test_decimated_indices_keep_extremes():
+    times = np.arange(100, dtype=np.int64)
+    values = np.column_stack([np.sin(times / 3), np.cos(times / 5)])
+    values[42, 0] = np.nan
+
+    # ten samples per pixel
+    kept = get_decimated_indices(times, values, (0.1, 0.0))
+
+    assert np.all(np.diff(kept) > 0)
+    assert len(kept) < len(times)
+    assert 42 in kept
+    for pixel in range(10):
+        bucket = np.arange(pixel * 10, pixel * 10 + 10)
+        assert bucket[0] in kept
+        assert bucket[-1] in kept
+        for column in values[bucket].T:
+            assert bucket[np.nanargmin(column)] in kept
+            assert bucket[np.nanargmax(column)] in kept
+
+
+def test_decimated_indices_keep_sparse_data():
+    times = np.arange(10, dtype=np.int64)
+    kept = get_decimated_indices(times, np.zeros(10), (1.0, 0.0))
+    assert np.array_equal(kept, times)
+
+
+def test_decimated_lines_look_the_same():
+    rng = np.random.default_rng(0)
+    dti = pd.date_range(datetime(2018, 1, 1), periods=200_000, freq="1ms")
+    df = pd.DataFrame(
+        data={
+            "acc_x": np.cumsum(rng.normal(size=len(dti))),
+            "acc_y": rng.normal(size=len(dti)),
+        },
+        index=dti,
+    )
+
+    def draw(fig) -> np.ndarray:
+        fig.canvas.draw()
+        image = np.asarray(fig.canvas.buffer_rgba()).copy()
+        plt.close(fig)
+        return image
+
+    graph_image_provider = GraphImageProvider(df, SensorConfig(graph_groups=["acc"]))
+    fig, axs = plt.subplots(1, 1, figsize=(4, 2), dpi=100, squeeze=False)
+    graph_image_provider.set_axs(fig, axs.ravel())
+    assert len(axs[0, 0].get_lines()[0].get_xdata()) < len(df) / 10
+    decimated = draw(fig)
+
+    # plot all samples into the same layout
+    fig, axs = plt.subplots(1, 1, figsize=(4, 2), dpi=100, squeeze=False)
+    ax = axs[0, 0]
+    ax.set_ylim(df.min().min(), df.max().max())
+    ax.set_title("acc")
+    ax.set_xlim(df.index[0], df.index[-1])
+    ax.plot(df.index, df["acc_x"], color="C0")
+    ax.plot(df.index, df["acc_y"], color="C1")
+    expected = draw(fig)
+
+    # antialiasing may differ on the edges of the lines, like with the path simplification of matplotlib
+    different = np.abs(decimated.astype(int) - expected.astype(int)).max(axis=2) > 128
+    assert different.mean() < 0.01
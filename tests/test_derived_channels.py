@@ -0,0 +1,155 @@
+import os
+import pickle
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sevivi.config import SensorConfig, DerivedChannelConfig, DerivedOperation
+from sevivi.image_provider import GraphImageProvider
+from sevivi.image_provider.graph_provider import derived_channels
+from sevivi.image_provider.graph_provider.derived_channels import (
+    compute_derived_channels,
+    add_derived_channels,
+    get_derived_cache_path,
+    rolling_rms,
+)
+
+
+def _imu() -> pd.DataFrame:
+    dti = pd.date_range(datetime(2018, 1, 1), periods=2000, freq="10ms")
+    t = np.arange(2000) / 100
+    return pd.DataFrame(
+        data={
+            "AccX": np.sin(2 * np.pi * t) + 0.5 * np.sin(2 * np.pi * 30 * t),
+            "AccY": np.full(2000, 3.0),
+            "AccZ": np.full(2000, 4.0),
+        },
+        index=dti,
+    )
+
+
+def test_derived_channels():
+    df = _imu()
+    df.iloc[100, 0] = np.nan
+    derived = compute_derived_channels(
+        df,
+        [
+            DerivedChannelConfig("mag", DerivedOperation.MAGNITUDE, ["AccY", "AccZ"]),
+            DerivedChannelConfig("lp", DerivedOperation.LOWPASS, "Acc", cutoff_hz=5),
+            DerivedChannelConfig("jerk", DerivedOperation.GRADIENT, ["AccY_lp"]),
+            DerivedChannelConfig("rms", DerivedOperation.RMS, "mag", window_seconds=1),
+        ],
+    )
+    assert list(derived.columns) == [
+        "mag",
+        "AccX_lp",
+        "AccY_lp",
+        "AccZ_lp",
+        "jerk",
+        "rms",
+    ]
+    assert np.allclose(derived["mag"], 5)
+    assert np.allclose(derived["rms"], 5)
+    assert np.allclose(derived["jerk"], 0)
+    # the 30 Hz component is removed without shifting the 1 Hz component
+    slow = np.sin(2 * np.pi * np.arange(2000) / 100)
+    lowpass = derived["AccX_lp"].to_numpy()
+    assert np.isnan(lowpass[100])
+    assert np.nanmax(np.abs(lowpass - slow)[100:-100]) < 0.02
+
+    with pytest.raises(ValueError):
+        compute_derived_channels(
+            df, [DerivedChannelConfig("AccX", DerivedOperation.GRADIENT, ["AccY"])]
+        )
+    with pytest.raises(ValueError):
+        compute_derived_channels(
+            df,
+            [DerivedChannelConfig("lp", DerivedOperation.LOWPASS, "Gyr", cutoff_hz=1)],
+        )
+    with pytest.raises(ValueError):
+        compute_derived_channels(
+            df,
+            [DerivedChannelConfig("lp", DerivedOperation.LOWPASS, "Acc", cutoff_hz=60)],
+        )
+
+
+def test_rolling_rms():
+    times_ns = np.array([0, 1, 2, 4, 8]) * 10**9
+    values = np.array([[1.0], [np.nan], [3.0], [4.0], [2.0]])
+    rms = rolling_rms(times_ns, values, 2.5)[:, 0]
+    expected = [1, 1, np.sqrt(5), np.sqrt(12.5), 2]
+    assert np.allclose(rms, expected)
+
+
+def test_graph_provider_plots_derived_channels():
+    sensor_config = SensorConfig(
+        derived=[
+            DerivedChannelConfig(
+                "AccMag", DerivedOperation.MAGNITUDE, ["AccX", "AccY", "AccZ"]
+            )
+        ],
+        graph_groups=["Acc"],
+    )
+    graph_image_provider = GraphImageProvider(_imu(), sensor_config)
+    assert graph_image_provider._graph_groups == {
+        "Acc": ["AccX", "AccY", "AccZ", "AccMag"]
+    }
+
+
+def test_derived_channel_cache(tmp_path, monkeypatch):
+    path = str(tmp_path / "imu.csv")
+    df = _imu()
+    df.to_csv(path)
+    sensor_config = SensorConfig(
+        path=path,
+        derived=[DerivedChannelConfig("jerk", DerivedOperation.GRADIENT, "AccX")],
+        derived_cache=True,
+    )
+    derived = add_derived_channels(df, sensor_config)
+    assert os.path.isfile(get_derived_cache_path(path))
+
+    def fail(*args):
+        raise AssertionError("derived channels were computed again")
+
+    monkeypatch.setattr(derived_channels, "compute_derived_channels", fail)
+    assert derived.equals(add_derived_channels(df, sensor_config))
+
+    # other configs or data are computed again
+    with pytest.raises(AssertionError):
+        add_derived_channels(df.iloc[:100], sensor_config)
+    sensor_config.derived[0].name = "AccX jerk"
+    with pytest.raises(AssertionError):
+        add_derived_channels(df, sensor_config)
+
+
+class _RunsOnUnpickling:
+    loaded = False
+
+    def __reduce__(self):
+        return _mark_loaded, ()
+
+
+def _mark_loaded():
+    _RunsOnUnpickling.loaded = True
+
+
+def test_derived_channel_cache_is_not_unpickled(tmp_path):
+    path = str(tmp_path / "imu.csv")
+    df = _imu()
+    df.to_csv(path)
+    sensor_config = SensorConfig(
+        path=path,
+        derived=[DerivedChannelConfig("jerk", DerivedOperation.GRADIENT, "AccX")],
+        derived_cache=True,
+    )
+    with open(get_derived_cache_path(path), "wb") as f:
+        pickle.dump(_RunsOnUnpickling(), f)
+
+    # the unreadable cache file is computed again and replaced
+    derived = add_derived_channels(df, sensor_config)
+    assert not _RunsOnUnpickling.loaded
+    assert list(derived.columns) == ["AccX", "AccY", "AccZ", "jerk"]
+    with np.load(get_derived_cache_path(path), allow_pickle=False) as cached:
+        assert cached["columns"].tolist() == ["jerk"]
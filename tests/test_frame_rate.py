@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from sevivi.video_renderer.frame_rate import resample_frames
+
+
+def _frames(fps: float, count: int):
+    for i in range(count):
+        yield pd.to_datetime(i * 1e9 / fps, unit="ns"), np.full((1, 1), i)
+
+
+def _written_frames(output):
+    return [image[0, 0] for _, image, count in output for _ in range(count)]
+
+
+def test_same_frame_rate_keeps_all_frames():
+    output = list(resample_frames(_frames(30, 60), 30, 30))
+    assert [count for _, _, count in output] == [1] * 60
+
+
+def test_lower_frame_rate_drops_frames():
+    written = _written_frames(resample_frames(_frames(120, 120), 30, 120))
+    assert written == list(range(0, 120, 4))
+
+
+def test_higher_frame_rate_repeats_frames():
+    written = _written_frames(resample_frames(_frames(30, 30), 60, 30))
+    assert written == [i for i in range(30) for _ in range(2)]
+
+
+def test_non_integer_frame_rate_ratio():
+    written = _written_frames(resample_frames(_frames(30, 300), 24, 30))
+    assert len(written) == 240
+    assert np.all(np.diff(written) >= 1)
+
+
+def test_empty_input():
+    assert list(resample_frames([], 30, 30)) == []
@@ -1,7 +1,9 @@
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 import pytest
+from matplotlib import pyplot as plt
 
 from sevivi.config import (
     RenderConfig,
@@ -12,8 +14,16 @@ from sevivi.config import (
     find_matching_columns,
     get_graph_groups,
     PlottingMethod,
+    PanelType,
 )
 from sevivi.image_provider import GraphImageProvider
+from sevivi.image_provider.graph_provider.utils import (
+    calculate_index,
+    calculate_indices,
+    SampleRingBuffer,
+    render_panorama,
+)
+from sevivi.image_provider.graph_provider import utils
 
 
 def test_graph_count():
@@ -91,6 +101,264 @@ def test_render_graph_axes():
     graph_image_provider.render_graph_axes(None, None)
 
 
+def test_set_axs_draws_figure_once(monkeypatch):
+    dti = pd.date_range(datetime(2018, 1, 1), periods=100, freq="10ms")
+    df = pd.DataFrame(
+        data={f"{axis}_{i}": np.arange(100) * i for axis in "ab" for i in range(3)},
+        index=dti,
+    )
+    graph_image_provider = GraphImageProvider(df, SensorConfig(graph_groups=["a", "b"]))
+    fig, axs = plt.subplots(2, 1, figsize=(4, 4), dpi=100, squeeze=False)
+    draw_count = 0
+    draw = fig.canvas.draw
+
+    def counting_draw():
+        nonlocal draw_count
+        draw_count += 1
+        draw()
+
+    monkeypatch.setattr(fig.canvas, "draw", counting_draw)
+    graph_image_provider.set_axs(fig, axs.ravel())
+    assert draw_count == 1
+    assert all(len(ax.get_lines()) == 4 for ax in axs.ravel())
+
+    # rendering a frame restores the background of the previous frame
+    graph_image_provider.render_graph_axes(fig, pd.to_datetime(0.2, unit="s"))
+    expected = np.asarray(fig.canvas.buffer_rgba()).copy()
+    graph_image_provider.render_graph_axes(fig, pd.to_datetime(0.9, unit="s"))
+    assert not np.array_equal(np.asarray(fig.canvas.buffer_rgba()), expected)
+    graph_image_provider.render_graph_axes(fig, pd.to_datetime(0.2, unit="s"))
+    rendered = np.asarray(fig.canvas.buffer_rgba())
+    assert np.array_equal(rendered, expected)
+    plt.close(fig)
+
+
+def test_paint_graph_axes_matches_render_graph_axes():
+    dti = pd.date_range(datetime(2018, 1, 1), periods=100, freq="10ms")
+    df = pd.DataFrame(data={"A": np.sin(np.arange(100) / 10)}, index=dti)
+    graph_image_provider = GraphImageProvider(df, SensorConfig())
+    fig, axs = plt.subplots(1, 1, figsize=(4, 2), dpi=100, squeeze=False)
+    graph_image_provider.set_axs(fig, axs.ravel())
+    fig.canvas.draw()
+    background = np.asarray(fig.canvas.buffer_rgba())[..., 2::-1].copy()
+    assert graph_image_provider.supports_raster_rendering()
+    graph_image_provider.prepare_raster(fig)
+
+    ts = pd.to_datetime(0.5, unit="s")
+    painted = background.copy()
+    graph_image_provider.paint_graph_axes(painted, ts)
+    graph_image_provider.render_graph_axes(fig, ts)
+    rendered = np.asarray(fig.canvas.buffer_rgba())[..., 2::-1]
+    plt.close(fig)
+
+    def changed_columns(image):
+        diff = np.abs(image.astype(int) - background.astype(int)).max(axis=2)
+        return np.where((diff > 30).any(axis=0))[0]
+
+    painted_columns, rendered_columns = changed_columns(painted), changed_columns(
+        rendered
+    )
+    assert len(painted_columns) > 0
+    assert abs(painted_columns.mean() - rendered_columns.mean()) <= 1
+
+
+def test_calculate_indices():
+    timestamps = pd.to_datetime([0, 10, 20, 30], unit="ms")
+    targets = pd.to_datetime([-5, 0, 5, 10, 29, 30, 31, 1000], unit="ms")
+    assert calculate_indices(targets.asi8, timestamps).tolist() == [
+        0,
+        0,
+        1,
+        1,
+        3,
+        3,
+        3,
+        3,
+    ]
+    for target in targets:
+        # first value at or after the target, or the last value
+        expected = timestamps[timestamps >= target]
+        expected = expected[0] if len(expected) > 0 else timestamps[-1]
+        assert calculate_index(target, timestamps) == expected
+
+
+def test_frame_timestamp_lookup():
+    dti = pd.to_datetime(np.cumsum(np.random.randint(1, 20, 500)), unit="ms")
+    df = pd.DataFrame(data={"A": np.arange(500)}, index=dti)
+    graph_image_provider = GraphImageProvider(df, SensorConfig())
+    frame_timestamps = pd.to_datetime(np.arange(0, 6000, 33), unit="ms")
+    graph_image_provider.set_frame_timestamps(frame_timestamps)
+
+    in_order = list(frame_timestamps)
+    shuffled = [
+        frame_timestamps[i] for i in np.random.permutation(len(frame_timestamps))
+    ]
+    unexpected = list(pd.to_datetime(np.arange(1, 6000, 77), unit="ms"))
+    for ts in in_order + shuffled + unexpected:
+        # noinspection PyProtectedMember
+        position = graph_image_provider._get_data_index(ts)
+        assert df.index[position] == calculate_index(ts, df.index)
+
+
+def test_sample_ring_buffer():
+    buffer = SampleRingBuffer(4, 2)
+    times = np.arange(20)
+    values = np.column_stack([times, -times])
+
+    buffer.append(times[:3], values[:3])
+    assert buffer.times.tolist() == [0, 1, 2]
+    buffer.drop_oldest(1)
+    assert buffer.times.tolist() == [1, 2]
+    # exceeding the capacity drops the oldest samples
+    buffer.append(times[3:6], values[3:6])
+    assert buffer.times.tolist() == [2, 3, 4, 5]
+    # reaching the end of the storage moves the samples to the front
+    for i in range(6, 20):
+        buffer.append(times[i : i + 1], values[i : i + 1])
+        assert buffer.times.tolist() == list(range(i - 3, i + 1))
+        assert buffer.values[:, 1].tolist() == [-t for t in range(i - 3, i + 1)]
+    buffer.append(times, values)
+    assert buffer.times.tolist() == [16, 17, 18, 19]
+    buffer.clear()
+    assert len(buffer) == 0
+
+
+def test_push_in_lines_show_window():
+    dti = pd.to_datetime(np.cumsum(np.random.randint(1, 20, 1000)), unit="ms")
+    df = pd.DataFrame(data={"A": np.arange(1000), "B": -np.arange(1000)}, index=dti)
+    graph_image_provider = GraphImageProvider(
+        df, SensorConfig(graph_groups=["A", "B"]), PlottingMethod.PUSH_IN, 1.5
+    )
+    assert not graph_image_provider.supports_raster_rendering()
+    fig, axs = plt.subplots(1, 2, figsize=(4, 2), dpi=100, squeeze=False)
+    graph_image_provider.set_axs(fig, axs.ravel())
+    frame_timestamps = pd.to_datetime(np.arange(0, 10000, 33), unit="ms")
+    graph_image_provider.set_frame_timestamps(frame_timestamps)
+
+    seek = list(frame_timestamps[100:120])
+    unexpected = list(pd.to_datetime(np.arange(1, 10000, 777), unit="ms"))
+    for ts in list(frame_timestamps) + seek + unexpected:
+        graph_image_provider.render_graph_axes(fig, ts)
+        shown = calculate_indices(np.array([ts.value]), df.index)[0]
+        window = (df.index <= df.index[shown]) & (
+            df.index >= ts - pd.Timedelta(seconds=1.5)
+        )
+        for ax, col in zip(axs.ravel(), ["A", "B"]):
+            x, y = ax.lines[0].get_data()
+            assert np.array_equal(y, df[col][window])
+            assert np.allclose(x, (df.index[window] - ts).total_seconds())
+    plt.close(fig)
+
+
+def test_stacked_panel():
+    dti = pd.date_range(datetime(2018, 1, 1), periods=2000, freq="10ms")
+    df = pd.DataFrame(
+        data={
+            f"EEG{i}": (i + 1) * np.sin(np.arange(2000) / (i + 5)) for i in range(16)
+        },
+        index=dti,
+    )
+    sensor_config = SensorConfig(panel_type=PanelType.STACKED)
+    graph_image_provider = GraphImageProvider(df, sensor_config)
+    assert graph_image_provider.get_graph_count() == 1
+    fig, axs = plt.subplots(1, 1, figsize=(4, 4), dpi=100, squeeze=False)
+    graph_image_provider.set_axs(fig, axs.ravel())
+    ax = axs[0, 0]
+    plt.close(fig)
+
+    # one artist for all traces, each in its own lane
+    assert ax.get_ylim() == (-0.5, 15.5)
+    assert len(ax.collections) == 1 and len(ax.get_lines()) == 1
+    segments = ax.collections[0].get_segments()
+    assert len(segments) == 16
+    for lane, segment in zip(range(15, -1, -1), segments):
+        assert np.all(np.abs(segment[:, 1] - lane) <= 0.4 + 1e-9)
+        assert len(segment) < len(df)
+    labels = {
+        label.get_text(): label.get_position()[1] for label in ax.get_yticklabels()
+    }
+    assert labels["EEG0"] == 15 and labels["EEG15"] == 0
+
+    # push in lines are drawn into the same lanes
+    graph_image_provider = GraphImageProvider(
+        df, sensor_config, PlottingMethod.PUSH_IN, 2
+    )
+    fig, axs = plt.subplots(1, 1, figsize=(4, 4), dpi=100, squeeze=False)
+    graph_image_provider.set_axs(fig, axs.ravel())
+    graph_image_provider.render_graph_axes(fig, pd.to_datetime(10, unit="s"))
+    plt.close(fig)
+    for lane, line in zip(range(15, -1, -1), axs[0, 0].get_lines()):
+        assert np.all(np.abs(line.get_ydata() - lane) <= 0.4 + 1e-9)
+
+
+def test_scrolling_window_matches_matplotlib():
+    dti = pd.date_range(datetime(2018, 1, 1), periods=3000, freq="10ms")
+    df = pd.DataFrame(data={"A": np.sin(np.arange(3000) / 30)}, index=dti)
+    graph_image_provider = GraphImageProvider(
+        df, SensorConfig(), PlottingMethod.SCROLLING_WINDOW, scrolling_window_seconds=2
+    )
+    assert graph_image_provider.supports_raster_rendering()
+    fig, axs = plt.subplots(1, 1, figsize=(4, 2), dpi=100, squeeze=False)
+    graph_image_provider.set_axs(fig, axs.ravel())
+    fig.canvas.draw()
+    background = np.asarray(fig.canvas.buffer_rgba())[..., 2::-1].copy()
+    graph_image_provider.prepare_raster(fig)
+
+    ts = pd.to_datetime(12.345, unit="s")
+    painted = background.copy()
+    graph_image_provider.paint_graph_axes(painted, ts)
+
+    # plot the same window with matplotlib
+    ax = axs[0, 0]
+    ax.plot((df.index - ts).total_seconds(), df["A"], color="C0")
+    ax.axvline(0, color="grey")
+    fig.canvas.draw()
+    expected = np.asarray(fig.canvas.buffer_rgba())[..., 2::-1]
+    plt.close(fig)
+
+    changed = np.abs(painted.astype(int) - background.astype(int)).max(axis=2) > 100
+    expected_changed = (
+        np.abs(expected.astype(int) - background.astype(int)).max(axis=2) > 100
+    )
+    # the lines may be off by about a pixel
+    assert changed.sum() > 0
+    assert abs(changed.sum() - expected_changed.sum()) < 0.05 * expected_changed.sum()
+    assert (
+        np.abs(
+            np.argwhere(changed).mean(axis=0)
+            - np.argwhere(expected_changed).mean(axis=0)
+        ).max()
+        < 2
+    )
+
+    # outside of the data, only the vline is painted
+    painted = background.copy()
+    graph_image_provider.paint_graph_axes(painted, pd.to_datetime(-100, unit="s"))
+    changed_columns = np.where((painted != background).any(axis=(0, 2)))[0]
+    assert len(changed_columns) <= 2
+
+
+def test_tiled_panorama_matches_single_tile(monkeypatch):
+    times = pd.date_range(datetime(2018, 1, 1), periods=500, freq="10ms").asi8
+    values = np.column_stack([np.sin(np.arange(500) / 10), np.cos(np.arange(500) / 7)])
+    fig, ax = plt.subplots(1, 1)
+    ax.set_ylim(-1, 1)
+
+    def render():
+        return render_panorama(
+            ax, times, values, ["C0", "C1"], 50, 1e-7, times[0], times[-1], 100
+        )
+
+    single_tile = render()
+    monkeypatch.setattr(utils, "PANORAMA_TILE_WIDTH", 64)
+    tiled = render()
+    plt.close(fig)
+
+    assert tiled.shape == single_tile.shape == (50, 499, 3)
+    different = np.abs(tiled.astype(int) - single_tile.astype(int)).max(axis=2) > 50
+    assert different.mean() < 0.01
+
+
 def test_set_offset_positive():
     dti = pd.to_datetime([datetime(2018, 1, 2), datetime(2018, 1, 3)])
     df = pd.DataFrame(data={"A": [1, 3]}, index=dti)
@@ -130,6 +398,9 @@ def test_get_graph_groups():
     }
     assert get_graph_groups(df, ["_"]) == {"_": ["A_x", "A_y", "A_z", "G_x"]}
     assert get_graph_groups(df, ["A_x"]) == {"A_x": ["A_x"]}
+    assert get_graph_groups(df, None, single_group=True) == {
+        "all columns": ["A_x", "A_y", "A_z", "G_x"]
+    }
 
 
 def test_find_matching_columns():
@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from sevivi.config import SensorConfig, PlottingMethod, PanelType
+from sevivi.image_provider import GraphImageProvider
+from sevivi.image_provider.graph_provider.heatmap import compute_heatmap_image
+from sevivi.image_provider.graph_provider.raster_figure import create_raster_subplots
+from sevivi.image_provider.graph_provider.utils import get_pixel_bounds
+
+
+def _ramps(row_count: int = 8) -> pd.DataFrame:
+    dti = pd.date_range(datetime(2018, 1, 1), periods=1000, freq="10ms")
+    return pd.DataFrame(
+        data={
+            f"P{row}": np.linspace(0, 1, 1000) * (row + 1) for row in range(row_count)
+        },
+        index=dti,
+    )
+
+
+def test_heatmap_image():
+    times_ns = np.arange(10) * 10**9
+    values = np.column_stack([np.arange(10), np.full(10, np.nan), -np.arange(10)])
+    # two pixel columns per sample, so that every other column has no samples
+    image = compute_heatmap_image(times_ns, values, (2e-9, 0.0), 0, 20, 6)
+    assert image.shape == (6, 20, 3)
+    # a row of two pixels per column of the values, with the highest value on the right of the first row
+    assert np.array_equal(image[0], image[1])
+    brightness = image.astype(int).sum(axis=2)
+    assert brightness[0].argmax() >= 18 and brightness[4].argmin() >= 18
+    # columns without samples show their neighbor
+    assert np.array_equal(image[:, 0], image[:, 1])
+
+    samples = np.column_stack([[0.0, 2.0, 10.0], [0.0, 0.0, 0.0]])
+    # the first two samples are averaged into the first pixel column
+    image = compute_heatmap_image(np.array([0, 1, 10]), samples, (0.2, 0.0), 0, 3, 2)
+    reference = compute_heatmap_image(
+        np.array([0, 10]), np.array([[1.0, 0.0], [10.0, 0.0]]), (0.2, 0.0), 0, 3, 2
+    )
+    assert np.array_equal(image, reference)
+
+
+def test_heatmap_panel():
+    df = _ramps()
+    sensor_config = SensorConfig(panel_type=PanelType.HEATMAP)
+    with pytest.raises(ValueError):
+        GraphImageProvider(df, sensor_config, PlottingMethod.PUSH_IN)
+
+    graph_image_provider = GraphImageProvider(df, sensor_config, value_readout=True)
+    assert graph_image_provider.get_graph_count() == 1
+    assert not graph_image_provider.value_readout
+    fig, axs = plt.subplots(1, 1, figsize=(4, 3), dpi=100, squeeze=False)
+    graph_image_provider.set_axs(fig, axs.ravel())
+    ax = axs[0, 0]
+    assert ax.get_ylim() == (-0.5, 7.5)
+    assert len(ax.get_images()) == 1 and len(ax.get_lines()) == 1
+    plt.close(fig)
+
+
+def test_scrolling_heatmap_matches_vline_heatmap():
+    df = _ramps()
+    sensor_config = SensorConfig(panel_type=PanelType.HEATMAP)
+    images = []
+    for plotting_method in (
+        PlottingMethod.MOVING_VERTICAL_LINE,
+        PlottingMethod.SCROLLING_WINDOW,
+    ):
+        # the scrolling window shows the whole data at the scale of the vline axis
+        graph_image_provider = GraphImageProvider(
+            df, sensor_config, plotting_method, scrolling_window_seconds=5
+        )
+        fig, axs = create_raster_subplots(1, 1, 400, 200, 100)
+        graph_image_provider.set_axs(fig, axs.ravel())
+        image = np.asarray(fig.canvas.buffer_rgba())[..., 2::-1].copy()
+        graph_image_provider.prepare_raster(fig)
+        graph_image_provider.paint_graph_axes(image, df.index[500])
+        left, top, right, bottom = get_pixel_bounds(axs[0, 0], 200)
+        center = (left + right) // 2
+        images.append(image[top + 5 : bottom - 5, center - 100 : center - 5])
+
+    different = np.abs(images[0].astype(int) - images[1].astype(int)).max(axis=2) > 30
+    assert different.mean() < 0.05
@@ -1,3 +1,4 @@
+import pandas as pd
 import pytest
 
 from sevivi.config import config_reader, RenderConfig
@@ -19,11 +20,12 @@ from sevivi.image_provider import (
     ImuCameraImageProvider,
     VideoImuCaptureAppImageProvider,
 )
-from sevivi.video_renderer import VideoRenderer
+from sevivi.video_renderer import VideoRenderer, instantiation_helpers
 from sevivi.video_renderer.instantiation_helpers import (
     instantiate_video_provider,
     instantiate_graph_providers,
     video_renderer_from_csv_files,
+    read_sensor_csv,
 )
 
 
@@ -97,6 +99,25 @@ def test_instantiate_graph_providers(run_in_repo_root):
     assert len(result) == 3
 
 
+def test_read_sensor_csv_time_range(run_in_repo_root, monkeypatch):
+    path = "test_files/sensors/imu_synchronization/LF.csv.gz"
+    full = read_sensor_csv(path)
+    start, end = full.index[100], full.index[500]
+
+    monkeypatch.setattr(instantiation_helpers, "CSV_CHUNK_ROWS", 64)
+    result = read_sensor_csv(path, start, end)
+    pd.testing.assert_frame_equal(result, full.loc[start:end])
+
+    # times without timezone are interpreted in the timezone of the sensor data
+    result = read_sensor_csv(path, start.tz_localize(None))
+    pd.testing.assert_frame_equal(result, full.loc[start:])
+    result = read_sensor_csv(path, end_time=end.tz_localize(None))
+    pd.testing.assert_frame_equal(result, full.loc[:end])
+
+    with pytest.raises(ValueError):
+        read_sensor_csv(path, full.index[-1] + pd.Timedelta(seconds=1))
+
+
 def test_video_renderer_from_csv_files(run_in_repo_root):
     config = config_reader.read_configs(
         (
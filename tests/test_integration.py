@@ -1,7 +1,12 @@
 from sevivi import video_renderer_from_csv_files, read_configs
+from sevivi.image_provider.graph_provider.utils import to_bgr
 
+from math import ceil
 from sys import platform as sys_pf
+
+import cv2
 import matplotlib
+import numpy as np
 
 if sys_pf == "darwin":
     matplotlib.use("TkAgg")
@@ -31,3 +36,165 @@ def test_camera_imu_render(run_in_repo_root):
     config = read_configs(("test_files/test-data-configs/imu_sync.toml",))
     video_renderer = video_renderer_from_csv_files(config)
     video_renderer.render_video()
+
+
+def test_parallel_render(run_in_repo_root, tmp_path):
+    config = read_configs(("test_files/test-data-configs/imu_sync.toml",))
+    config.render_config.process_count = 2
+    config.render_config.target_file_path = str(tmp_path / "parallel_sevivi.avi")
+    video_renderer = video_renderer_from_csv_files(config)
+    video_renderer.render_video()
+
+    source = cv2.VideoCapture("test_files/videos/imu_sync.mp4")
+    result = cv2.VideoCapture(config.render_config.target_file_path)
+    assert result.get(cv2.CAP_PROP_FRAME_COUNT) == source.get(cv2.CAP_PROP_FRAME_COUNT)
+
+
+def test_pipelined_render(run_in_repo_root, tmp_path):
+    config = read_configs(("test_files/test-data-configs/imu_sync.toml",))
+    config.render_config.pipeline_queue_size = 4
+    config.render_config.target_file_path = str(tmp_path / "pipelined_sevivi.avi")
+    video_renderer = video_renderer_from_csv_files(config)
+    video_renderer.render_video()
+
+    stats = video_renderer.pipeline_statistics
+    assert [s.name for s in stats] == ["decode", "plot", "encode"]
+    source_frame_count = cv2.VideoCapture("test_files/videos/imu_sync.mp4").get(
+        cv2.CAP_PROP_FRAME_COUNT
+    )
+    assert all(s.frames == source_frame_count for s in stats)
+
+
+def test_target_fps_render(run_in_repo_root, tmp_path):
+    config = read_configs(("test_files/test-data-configs/imu_sync.toml",))
+    config.render_config.target_fps = 15
+    config.render_config.target_file_path = str(tmp_path / "target_fps_sevivi.avi")
+    video_renderer = video_renderer_from_csv_files(config)
+    video_renderer.render_video()
+
+    source = cv2.VideoCapture("test_files/videos/imu_sync.mp4")
+    result = cv2.VideoCapture(config.render_config.target_file_path)
+    assert result.get(cv2.CAP_PROP_FPS) == 15
+    source_duration = source.get(cv2.CAP_PROP_FRAME_COUNT) / source.get(
+        cv2.CAP_PROP_FPS
+    )
+    assert abs(result.get(cv2.CAP_PROP_FRAME_COUNT) - source_duration * 15) <= 1
+
+
+def test_preview_render(run_in_repo_root, tmp_path):
+    config = read_configs(("test_files/test-data-configs/imu_sync.toml",))
+    config.render_config.preview = True
+    config.render_config.target_file_path = str(tmp_path / "preview_sevivi.avi")
+    video_renderer = video_renderer_from_csv_files(config)
+    video_renderer.render_video()
+
+    source = cv2.VideoCapture("test_files/videos/imu_sync.mp4")
+    result = cv2.VideoCapture(config.render_config.target_file_path)
+    assert (
+        result.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        == source.get(cv2.CAP_PROP_FRAME_HEIGHT) * config.render_config.preview_scale
+    )
+    assert result.get(cv2.CAP_PROP_FPS) == source.get(cv2.CAP_PROP_FPS) / 4
+    assert result.get(cv2.CAP_PROP_FRAME_COUNT) == ceil(
+        source.get(cv2.CAP_PROP_FRAME_COUNT) / 4
+    )
+
+
+def test_time_range_render(run_in_repo_root, tmp_path):
+    config = read_configs(("test_files/test-data-configs/imu_sync.toml",))
+    config.render_config.time_ranges = [(1.0, 2.0), (10.0, 11.5)]
+    config.render_config.target_file_path = str(tmp_path / "range_sevivi.avi")
+    video_renderer = video_renderer_from_csv_files(config)
+    video_renderer.render_video()
+
+    result = cv2.VideoCapture(config.render_config.target_file_path)
+    assert result.get(cv2.CAP_PROP_FRAME_COUNT) == 30 + 45
+
+    config.render_config.split_time_ranges = True
+    video_renderer.render_video()
+
+    for i, frame_count in enumerate([30, 45]):
+        result = cv2.VideoCapture(str(tmp_path / f"range_sevivi_{i}.avi"))
+        assert result.get(cv2.CAP_PROP_FRAME_COUNT) == frame_count
+
+
+def test_push_in_render(run_in_repo_root, tmp_path):
+    config = read_configs(
+        (
+            "test_files/test-data-configs/imu_sync.toml",
+            "test_files/configs/push_in_plotting_method.toml",
+        )
+    )
+    config.render_config.time_ranges = [(5.0, 7.0)]
+    config.render_config.target_file_path = str(tmp_path / "push_in_sevivi.avi")
+    video_renderer = video_renderer_from_csv_files(config)
+    video_renderer.render_video()
+
+    result = cv2.VideoCapture(config.render_config.target_file_path)
+    assert result.get(cv2.CAP_PROP_FRAME_COUNT) == 60
+
+
+def test_scrolling_window_render(run_in_repo_root, tmp_path):
+    config = read_configs(
+        (
+            "test_files/test-data-configs/imu_sync.toml",
+            "test_files/configs/scrolling_window_plotting_method.toml",
+        )
+    )
+    config.render_config.time_ranges = [(5.0, 7.0)]
+    config.render_config.target_file_path = str(tmp_path / "scrolling_sevivi.avi")
+    video_renderer = video_renderer_from_csv_files(config)
+    video_renderer.render_video()
+
+    result = cv2.VideoCapture(config.render_config.target_file_path)
+    assert result.get(cv2.CAP_PROP_FRAME_COUNT) == 60
+
+
+def test_opencv_plot_backend_render(run_in_repo_root, tmp_path):
+    config = read_configs(
+        (
+            "test_files/test-data-configs/imu_sync.toml",
+            "test_files/configs/opencv_plot_backend.toml",
+        )
+    )
+    config.render_config.time_ranges = [(5.0, 6.0)]
+    config.render_config.target_file_path = str(tmp_path / "opencv_sevivi.avi")
+    video_renderer = video_renderer_from_csv_files(config)
+    video_renderer.render_video()
+
+    result = cv2.VideoCapture(config.render_config.target_file_path)
+    assert result.get(cv2.CAP_PROP_FRAME_COUNT) == 30
+
+
+def test_annotation_render(run_in_repo_root, tmp_path):
+    config = read_configs(
+        (
+            "test_files/test-data-configs/imu_sync.toml",
+            "test_files/configs/annotations.toml",
+        )
+    )
+    config.render_config.time_ranges = [(5.0, 6.0)]
+    config.render_config.fourcc_codec = "FFV1"
+    config.render_config.target_file_path = str(tmp_path / "annotated_sevivi.avi")
+    video_renderer = video_renderer_from_csv_files(config)
+    video_renderer.render_video()
+
+    result = cv2.VideoCapture(config.render_config.target_file_path)
+    video = cv2.VideoCapture("test_files/videos/imu_sync.mp4")
+    # the label strip goes above the video
+    assert (
+        result.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        == video.get(cv2.CAP_PROP_FRAME_HEIGHT) + 24
+    )
+    frames = [result.read()[1] for _ in range(30)]
+    colors = [
+        to_bgr(video_renderer.annotation_provider.get_label_color(label)).astype(int)
+        for label in ("jump", "artefact")
+    ]
+
+    def shows(frame, color) -> bool:
+        return bool((np.abs(frame[:24].astype(int) - color).max(axis=2) < 8).any())
+
+    # no labels are active at 5 seconds, the jump and artefact labels at 5.6 seconds
+    assert not any(shows(frames[0], color) for color in colors)
+    assert all(shows(frames[18], color) for color in colors)
@@ -28,3 +28,38 @@ def test_parse_arguments_multiple(run_in_repo_root):
         ),
         Config,
     )
+
+
+def test_parse_arguments_processes(run_in_repo_root):
+    config = parse_arguments(
+        ["--processes", "3", "test_files/test-data-configs/imu_sync.toml"]
+    )
+    assert config.render_config.process_count == 3
+    with pytest.raises(ValueError):
+        parse_arguments(
+            ["--processes", "0", "test_files/test-data-configs/imu_sync.toml"]
+        )
+
+
+def test_parse_arguments_preview(run_in_repo_root):
+    config = parse_arguments(["test_files/test-data-configs/imu_sync.toml"])
+    assert not config.render_config.preview
+    config = parse_arguments(
+        ["--preview", "test_files/test-data-configs/imu_sync.toml"]
+    )
+    assert config.render_config.preview
+
+
+def test_parse_arguments_ranges(run_in_repo_root):
+    config = parse_arguments(
+        [
+            "--range",
+            "1",
+            "2.5",
+            "--range",
+            "10",
+            "20",
+            "test_files/test-data-configs/imu_sync.toml",
+        ]
+    )
+    assert config.render_config.time_ranges == [(1.0, 2.5), (10.0, 20.0)]
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sevivi.video_renderer.pipeline import run_render_pipeline
+
+
+def _images(count: int):
+    for i in range(count):
+        yield pd.to_datetime(i, unit="s"), np.full((2, 2), i, dtype=np.int64), 1
+
+
+def _compose(image: np.ndarray, ts: pd.Timestamp, src_image: np.ndarray):
+    image[:] = src_image * 2
+
+
+def test_pipeline_keeps_frame_order():
+    written = []
+    buffers = [np.empty((2, 2), dtype=np.int64) for _ in range(4)]
+
+    stats = run_render_pipeline(
+        _images(50), _compose, lambda img: written.append(img[0, 0]), buffers, 2
+    )
+
+    assert written == [2 * i for i in range(50)]
+    assert [s.name for s in stats] == ["decode", "plot", "encode"]
+    assert all(s.frames == 50 for s in stats)
+
+
+def test_pipeline_repeats_frames():
+    written = []
+    buffers = [np.empty((2, 2), dtype=np.int64) for _ in range(3)]
+    frames = [(ts, image, i % 3) for i, (ts, image, _) in enumerate(_images(10))]
+
+    run_render_pipeline(
+        frames, _compose, lambda img: written.append(img[0, 0]), buffers, 1
+    )
+
+    assert written == [2 * i for i in range(10) for _ in range(i % 3)]
+
+
+def test_pipeline_raises_encoder_errors():
+    def write(_):
+        raise IOError("disk full")
+
+    buffers = [np.empty((2, 2), dtype=np.int64) for _ in range(3)]
+    with pytest.raises(IOError):
+        run_render_pipeline(_images(50), _compose, write, buffers, 1)
+
+
+def test_pipeline_raises_decoder_errors():
+    def images():
+        yield from _images(5)
+        raise RuntimeError("broken video")
+
+    buffers = [np.empty((2, 2), dtype=np.int64) for _ in range(3)]
+    with pytest.raises(RuntimeError):
+        run_render_pipeline(images(), _compose, lambda _: None, buffers, 1)
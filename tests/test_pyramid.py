@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from sevivi.config import SensorConfig, PlottingMethod
+from sevivi.image_provider import GraphImageProvider
+from sevivi.image_provider.graph_provider.pyramid import MinMaxPyramid
+
+
+def _values() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(1000, 2))
+    values[17:40, 1] = np.nan
+    return values
+
+
+def test_pyramid_levels():
+    values = _values()
+    pyramid = MinMaxPyramid(values)
+
+    # computed from level 2 instead of the raw values
+    pyramid.get_level(2)
+    for level in (2, 5, 3):
+        minima, maxima = pyramid.get_level(level)
+        size = 2**level
+        assert minima.shape == maxima.shape == (-(-len(values) // size), 2)
+        for bucket in range(len(minima)):
+            bucket_values = values[bucket * size : (bucket + 1) * size]
+            for column in range(2):
+                if np.all(np.isnan(bucket_values[:, column])):
+                    continue
+                assert values[minima[bucket, column], column] == np.nanmin(
+                    bucket_values[:, column]
+                )
+                assert values[maxima[bucket, column], column] == np.nanmax(
+                    bucket_values[:, column]
+                )
+
+
+def test_pyramid_indices():
+    values = _values()
+    pyramid = MinMaxPyramid(values)
+
+    indices = pyramid.get_indices(3, 990, 10)
+    assert np.all(np.diff(indices) > 0)
+    assert indices[0] == 3 and indices[-1] == 989
+    # buckets of 8 samples with two positions per column
+    assert len(indices) <= 4 * 987 // 8 + 16
+    # the extremes of the window are always included
+    assert values[3:990, 0].argmin() + 3 in indices
+    assert values[3:990, 0].argmax() + 3 in indices
+
+    assert np.array_equal(pyramid.get_indices(3, 990, 1), np.arange(3, 990))
+
+
+def test_pyramid_column_indices():
+    values = _values()
+    pyramid = MinMaxPyramid(values)
+
+    indices = pyramid.get_indices(3, 990, 10, column=0)
+    # only the extremes of the first column are kept
+    assert len(indices) <= 2 * 987 // 8 + 16
+    assert values[3:990, 0].argmin() + 3 in indices
+    assert values[3:990, 0].argmax() + 3 in indices
+    assert len(indices) < len(pyramid.get_indices(3, 990, 10))
+
+
+def test_push_in_uses_pyramid_for_dense_data():
+    dti = pd.date_range(datetime(2018, 1, 1), periods=100_000, freq="1ms")
+    df = pd.DataFrame(data={"A": np.sin(np.arange(len(dti)) / 1000)}, index=dti)
+    graph_image_provider = GraphImageProvider(
+        df, SensorConfig(), PlottingMethod.PUSH_IN, push_in_window_seconds=10
+    )
+    fig, axs = plt.subplots(1, 1, figsize=(4, 2), dpi=100, squeeze=False)
+    graph_image_provider.set_axs(fig, axs.ravel())
+
+    ts = pd.to_datetime(50, unit="s")
+    graph_image_provider.render_graph_axes(fig, ts)
+    line = axs[0, 0].get_lines()[0]
+    plt.close(fig)
+
+    x, y = line.get_xdata(), line.get_ydata()
+    assert len(x) < 10_000 / 10
+    assert x[0] >= -10 and x[-1] == 0
+    assert np.isclose(y.min(), df["A"][40_000:50_001].min())
+    assert np.isclose(y.max(), df["A"][40_000:50_001].max())
@@ -0,0 +1,97 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from sevivi.config import SensorConfig, PlottingMethod
+from sevivi.image_provider import GraphImageProvider
+from sevivi.image_provider.graph_provider.raster_figure import (
+    create_raster_subplots,
+    get_ticks,
+    format_ticks,
+    format_time_ticks,
+)
+from sevivi.image_provider.graph_provider.utils import (
+    get_pixel_bounds,
+    get_x_transform,
+    get_y_transform,
+)
+
+
+def test_ticks():
+    ticks, step = get_ticks(-2.3, 3.1, 5)
+    assert step == 2.0
+    assert np.allclose(ticks, [-2, 0, 2])
+    assert format_ticks(np.array([-0.25, 0, 0.25]), 0.25) == ["-0.25", "0.00", "0.25"]
+
+    ticks, step = get_ticks(0, 50, 4, (1, 2, 5, 10, 15, 30))
+    assert step == 15
+    assert format_time_ticks(np.array([0, 15e9]), 15e9) == ["00:00:00", "00:00:15"]
+    assert format_time_ticks(np.array([0, 5e8]), 5e8) == ["00:00:00.0", "00:00:00.5"]
+
+
+def test_raster_lines_follow_axis_transforms():
+    fig, axs = create_raster_subplots(2, 1, 400, 300, 100)
+    ax = axs[1, 0]
+    dti = pd.date_range(datetime(1970, 1, 1), periods=11, freq="1s")
+    ax.set_xlim(dti[0], dti[-1])
+    ax.set_ylim(-1, 1)
+    ax.plot(dti, np.full(11, 0.5), color="red")
+    vline = ax.axvline(dti[4], color="blue", animated=True)
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba())
+
+    left, top, right, bottom = get_pixel_bounds(ax, 300)
+    assert top > 150 and bottom < 300 and left > 0 and right < 400
+    # the spines surround the interior
+    assert np.all(image[top, left + 1 : right - 1, :3] == 0)
+
+    y_scale, y_offset = get_y_transform(ax, 300)
+    row = int(round(y_scale * 0.5 + y_offset))
+    red = (image[..., 0] > 200) & (image[..., 1] < 100)
+    assert red[row - 1 : row + 1, left + 2 : right - 2].any(axis=0).all()
+    assert not red[:top].any() and not red[bottom:].any()
+
+    # animated lines are only drawn with draw_artist
+    blue = (image[..., 2] > 200) & (image[..., 0] < 100)
+    assert not blue.any()
+    ax.draw_artist(vline)
+    blue = (image[..., 2] > 200) & (image[..., 0] < 100)
+    scale, offset = get_x_transform(ax)
+    column = int(round(scale * dti[4].value + offset))
+    columns = np.flatnonzero(blue.any(axis=0))
+    assert columns.min() >= column - 2 and columns.max() <= column + 1
+    assert np.flatnonzero(blue.any(axis=1)).min() >= top
+
+
+def test_graph_provider_draws_to_raster_figure():
+    dti = pd.date_range(datetime(2018, 1, 1), periods=1000, freq="10ms")
+    df = pd.DataFrame(
+        data={"A": np.sin(np.arange(1000) / 50), "B": np.cos(np.arange(1000) / 50)},
+        index=dti,
+    )
+    for plotting_method in PlottingMethod:
+        graph_image_provider = GraphImageProvider(
+            df.copy(), SensorConfig(), plotting_method, push_in_window_seconds=2
+        )
+        fig, axs = create_raster_subplots(2, 1, 400, 400, 100)
+        graph_image_provider.set_axs(fig, axs.ravel())
+        background = np.asarray(fig.canvas.buffer_rgba()).copy()
+
+        frames = []
+        for seconds in (3, 6):
+            graph_image_provider.render_graph_axes(
+                fig, pd.to_datetime(seconds, unit="s")
+            )
+            frames.append(np.asarray(fig.canvas.buffer_rgba()).copy())
+
+        changed = (frames[0] != frames[1]).any(axis=2)
+        assert changed.any(), plotting_method
+        for ax in axs.ravel():
+            left, top, right, bottom = get_pixel_bounds(ax, 400)
+            changed[top:bottom, left:right] = False
+            assert (
+                frames[0][top:bottom, left:right] != background[top:bottom, left:right]
+            ).any()
+        # only the axis interiors change between frames
+        assert not changed.any(), plotting_method
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from sevivi.config import SensorConfig, PlottingMethod
+from sevivi.image_provider import GraphImageProvider
+from sevivi.image_provider.graph_provider.readout import GlyphCache, paint_readout
+
+
+def test_paint_readout_stays_in_bounds():
+    glyphs = GlyphCache()
+    image = np.full((60, 100, 3), 255, dtype=np.uint8)
+    bounds = (10, 10, 90, 50)
+    color = np.array([255, 0, 0], dtype=np.uint8)
+
+    # the label does not fit right of the marker, so it is painted left of it
+    left, right = paint_readout(
+        image,
+        glyphs,
+        85,
+        np.array([12.0, np.nan]),
+        np.array([-1.5, np.nan]),
+        [color, color],
+        np.array([255, 255, 255], dtype=np.uint8),
+        bounds,
+    )
+    changed = (image != 255).any(axis=2)
+    assert changed.any()
+    assert not changed[:10].any() and not changed[50:].any()
+    assert not changed[:, :10].any() and not changed[:, 90:].any()
+    columns = np.where(changed.any(axis=0))[0]
+    assert left <= columns.min() and columns.max() < right <= 90
+    assert columns.min() < 85 - glyphs.marker_radius
+
+
+def test_value_readout_is_painted_and_restored():
+    dti = pd.date_range(datetime(2018, 1, 1), periods=100, freq="10ms")
+    df = pd.DataFrame(data={"A": np.linspace(0, 1, 100)}, index=dti)
+    graph_image_provider = GraphImageProvider(
+        df, SensorConfig(), PlottingMethod.MOVING_VERTICAL_LINE, value_readout=True
+    )
+    fig, axs = plt.subplots(1, 1, figsize=(4, 2), dpi=100, squeeze=False)
+    graph_image_provider.set_axs(fig, axs.ravel())
+    background = np.asarray(fig.canvas.buffer_rgba())[..., 2::-1].copy()
+    graph_image_provider.prepare_raster(fig)
+    timestamps = pd.to_datetime(np.arange(0, 1, 0.1), unit="s")
+    graph_image_provider.set_frame_timestamps(timestamps)
+
+    image = background.copy()
+    graph_image_provider.paint_graph_axes(image, timestamps[5])
+    changed = (image != background).any(axis=2)
+    rows, columns = np.where(changed)
+    # the marker is on the line at 0.5 and the label next to the vline
+    ax_center = fig.bbox.height - (axs[0, 0].bbox.y0 + axs[0, 0].bbox.y1) / 2
+    assert abs(np.median(rows) - ax_center) < 10
+    assert columns.max() - columns.min() > 10
+
+    expected = image.copy()
+    graph_image_provider.restore_graph_axes(image, background)
+    assert np.array_equal(image, background)
+
+    # timestamps that are not expected are computed on the fly
+    graph_image_provider.paint_graph_axes(image, pd.to_datetime(0.495, unit="s"))
+    assert np.array_equal(image, expected)
+
+    graph_image_provider.render_graph_axes(fig, timestamps[5])
+    rendered = np.asarray(fig.canvas.buffer_rgba())[..., 2::-1]
+    plt.close(fig)
+    assert np.abs(rendered.astype(int) - expected.astype(int)).max(axis=2).mean() < 1
+
+
+def test_scrolling_window_readout_without_frame_timestamps():
+    dti = pd.date_range(datetime(1970, 1, 1), periods=1000, freq="10ms")
+    df = pd.DataFrame(data={"A": np.linspace(0, 1, 1000)}, index=dti)
+    graph_image_provider = GraphImageProvider(
+        df, SensorConfig(), PlottingMethod.SCROLLING_WINDOW, value_readout=True
+    )
+    fig, axs = plt.subplots(1, 1, figsize=(4, 2), dpi=100, squeeze=False)
+    graph_image_provider.set_axs(fig, axs.ravel())
+    background = np.asarray(fig.canvas.buffer_rgba())[..., 2::-1].copy()
+    graph_image_provider.prepare_raster(fig)
+    plt.close(fig)
+
+    # no frame timestamps are set, so the readout is computed on the fly
+    image = background.copy()
+    graph_image_provider.paint_graph_axes(image, pd.to_datetime(5, unit="s"))
+    changed = (image != background).any(axis=2)
+    columns = np.where(changed.any(axis=0))[0]
+    # the marker is at the vline in the center of the axis
+    ax_center = (axs[0, 0].bbox.x0 + axs[0, 0].bbox.x1) / 2
+    assert columns.min() - 10 < ax_center < columns.max()
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sevivi import read_configs
+from sevivi.config import StackingDirection
+from sevivi.image_provider import AzureProvider, SkeletonImageProvider
+from sevivi.image_provider.skeleton_provider import get_view_matrix
+from sevivi.video_renderer import VideoRenderer
+from sevivi.video_renderer.instantiation_helpers import (
+    instantiate_graph_providers,
+    instantiate_video_provider,
+    instantiate_skeleton_provider,
+)
+
+WALKING_3D = "test_files/skeletons/joint_synchronization_walking/positions_3d.csv.gz"
+
+
+def _upright_skeleton(head_z: float = 2000.0) -> pd.DataFrame:
+    """Two skeletons of a head above a neck above the chest, one second apart"""
+    positions = {
+        "HEAD": [0, -600, head_z],
+        "NECK": [0, -400, 2000],
+        "SPINE_CHEST": [0, 0, 2000],
+    }
+    row = {f"{j} ({a})": v for j, p in positions.items() for a, v in zip("xyz", p)}
+    return pd.DataFrame(
+        [row, {**row, "HEAD (x)": 300}], index=pd.to_datetime([0, 1], unit="s")
+    )
+
+
+def _painted(image: np.ndarray) -> np.ndarray:
+    return (image != 255).any(axis=2)
+
+
+def test_view_matrix():
+    assert np.allclose(get_view_matrix(0, 0), [[1, 0, 0], [0, 1, 0]])
+    # from the right of the camera, points further away from the camera are further right
+    assert np.allclose(get_view_matrix(90, 0), [[0, 0, 1], [0, 1, 0]])
+    # from above, points further away from the camera are further up
+    assert np.allclose(get_view_matrix(0, 90), [[1, 0, 0], [0, 0, -1]])
+
+
+def test_skeleton_panel_projection():
+    skeleton_provider = SkeletonImageProvider(_upright_skeleton())
+    assert skeleton_provider.bones == [(0, 1), (1, 2)]
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    skeleton_provider.paint_panel(image, pd.to_datetime(0, unit="s"))
+    rows, columns = np.nonzero(_painted(image))
+    # the spine is vertical and spans the panel but its padding
+    assert columns.max() - columns.min() <= 4
+    assert rows.min() <= 6 and rows.max() >= 93
+    # the head moves to the right in the second skeleton
+    skeleton_provider.paint_panel(image, pd.to_datetime(1, unit="s"))
+    assert np.nonzero(_painted(image[:10]))[1].max() > columns.max() + 10
+
+    # from above, the neck and chest are a point, and the bone to the head leaning towards the camera spans the panel
+    skeleton_provider = SkeletonImageProvider(_upright_skeleton(1800).iloc[:1], 0, 90)
+    skeleton_provider.paint_panel(image, pd.to_datetime(0, unit="s"))
+    rows, columns = np.nonzero(_painted(image))
+    assert columns.max() - columns.min() <= 4
+    assert rows.min() <= 6 and rows.max() >= 93
+
+
+def test_skeleton_panel_skips_missing_joints():
+    data = _upright_skeleton()
+    data.loc[data.index[0], "HEAD (y)"] = np.nan
+    skeleton_provider = SkeletonImageProvider(data)
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    skeleton_provider.paint_panel(image, pd.to_datetime(0, unit="s"))
+    # only the bone from the neck to the chest is drawn
+    rows = np.nonzero(_painted(image))[0]
+    assert rows.min() > 30
+
+
+def test_kinect_skeleton_panel(run_in_repo_root):
+    joints_3d = AzureProvider.read_joint_csv(WALKING_3D)
+    skeleton_provider = SkeletonImageProvider(joints_3d, 90, 20)
+    assert len(skeleton_provider.bones) == 26
+
+    image = np.zeros((120, 200, 3), dtype=np.uint8)
+    skeleton_provider.paint_panel(image, joints_3d.index[0])
+    first = image.copy()
+    columns = np.nonzero(_painted(first))[1]
+    # the panel is wider than high, so the skeletons are centered in a square of the panel height
+    assert columns.min() >= 40 and columns.max() < 160
+    skeleton_provider.paint_panel(image, joints_3d.index[300])
+    assert not np.array_equal(image, first)
+    # timestamps before the recording show the first skeleton
+    skeleton_provider.paint_panel(image, pd.to_datetime(0))
+    assert np.array_equal(image, first)
+
+
+@pytest.mark.parametrize("stacking_direction", list(StackingDirection))
+def test_skeleton_panel_layout(run_in_repo_root, stacking_direction):
+    config = read_configs(("test_files/test-data-configs/imu_sync.toml",))
+    config.render_config.stacking_direction = stacking_direction
+    video_provider = instantiate_video_provider(config.video_config)
+    with pytest.raises(ValueError):
+        config.render_config.skeleton_panel_config = True
+        instantiate_skeleton_provider(config.render_config, video_provider)
+
+    config.render_config.skeleton_panel_config = None
+    plain_renderer = VideoRenderer(
+        config.render_config,
+        video_provider,
+        instantiate_graph_providers(config.sensor_configs, config.render_config),
+    )
+    skeleton_provider = SkeletonImageProvider(AzureProvider.read_joint_csv(WALKING_3D))
+    renderer = VideoRenderer(
+        config.render_config,
+        video_provider,
+        instantiate_graph_providers(config.sensor_configs, config.render_config),
+        skeleton_provider=skeleton_provider,
+    )
+    plain_image = plain_renderer._create_target_image()
+    image = renderer._create_target_image()
+    video_height = video_provider.get_dimensions().h
+    assert image.shape[0] == plain_image.shape[0]
+    assert image.shape[1] == plain_image.shape[1] + video_height
+
+    ts, src_image = next(video_provider.images())
+    plain_renderer._compose_frame(plain_image, ts, src_image)
+    renderer._compose_frame(image, ts, src_image)
+    # the panel is added to the right without changing the video and the graphs
+    assert np.array_equal(image[:, : plain_image.shape[1]], plain_image)
+    panel = image[:video_height, plain_image.shape[1] :]
+    assert _painted(panel).any()
+    assert not _painted(image[video_height:, plain_image.shape[1] :]).any()
@@ -0,0 +1,76 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from sevivi.config import SensorConfig, PlottingMethod
+from sevivi.image_provider import GraphImageProvider
+from sevivi.image_provider.graph_provider import spectrogram
+from sevivi.image_provider.graph_provider.spectrogram import compute_spectrogram_image
+
+
+def _sine(frequency: float, seconds: float = 20, fs: float = 1000) -> pd.DataFrame:
+    t = np.arange(0, seconds, 1 / fs)
+    return pd.DataFrame(
+        data={"A": np.sin(2 * np.pi * frequency * t)},
+        index=pd.to_datetime(t, unit="s"),
+    )
+
+
+def test_spectrogram_shows_frequency():
+    data = _sine(100)
+    times_ns = data.index.asi8
+    # 200 pixel columns for the 20 seconds
+    x_transform = (200 / times_ns[-1], 10.0)
+    image, max_frequency = compute_spectrogram_image(
+        times_ns, data.to_numpy(), 10**9 // 2, x_transform, 10, 200, 100
+    )
+    assert image.shape == (100, 200, 3)
+    assert max_frequency == 500
+
+    # the brightest row is 100 Hz, a fifth of the way up from the bottom
+    brightness = image.astype(int).sum(axis=2)
+    assert np.all(np.abs(brightness.argmax(axis=0) - 80) <= 1)
+
+
+def test_chunked_spectrogram_matches(monkeypatch):
+    data = _sine(50)
+    data["A"] += np.random.default_rng(0).normal(size=len(data))
+    arguments = (
+        data.index.asi8,
+        data.to_numpy(),
+        10**8,
+        (300 / data.index.asi8[-1], 0.0),
+        0,
+        300,
+        80,
+    )
+    image, _ = compute_spectrogram_image(*arguments)
+    # a few segments per chunk
+    monkeypatch.setattr(spectrogram, "STFT_CHUNK_VALUES", 500)
+    chunked_image, _ = compute_spectrogram_image(*arguments)
+    assert np.array_equal(image, chunked_image)
+
+
+def test_spectrogram_plotting_method():
+    graph_image_provider = GraphImageProvider(
+        _sine(100), SensorConfig(), PlottingMethod.SPECTROGRAM, value_readout=True
+    )
+    assert graph_image_provider.supports_raster_rendering()
+    assert not graph_image_provider.value_readout
+    fig, axs = plt.subplots(1, 1, figsize=(4, 2), dpi=100, squeeze=False)
+    graph_image_provider.set_axs(fig, axs.ravel())
+    assert axs[0, 0].get_ylim() == (0, 500)
+
+    background = np.asarray(fig.canvas.buffer_rgba())[..., 2::-1].copy()
+    graph_image_provider.prepare_raster(fig)
+    plt.close(fig)
+    image = background.copy()
+    graph_image_provider.paint_graph_axes(image, pd.to_datetime(10, unit="s"))
+    changed = (image != background).any(axis=2)
+    columns = np.flatnonzero(changed.any(axis=0))
+    assert 0 < len(columns) <= 3
+    # the vline is in the center of the axis
+    left, top, right, bottom = graph_image_provider.get_raster_state()["axes"][0][
+        "pixel_bounds"
+    ]
+    assert abs(columns[0] - (left + right) / 2) <= 2
@@ -0,0 +1,100 @@
+import tracemalloc
+
+import matplotlib.pyplot as plt
+import pytest
+
+from sevivi import video_renderer_from_csv_files, read_configs
+from sevivi.config import StackingDirection
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    """Close the figures of the renderers created by each test"""
+    yield
+    plt.close("all")
+
+
+@pytest.mark.parametrize("stacking_direction", list(StackingDirection))
+@pytest.mark.parametrize("use_raster", [True, False])
+def test_compose_frame_does_not_allocate(
+    run_in_repo_root, stacking_direction, use_raster
+):
+    config = read_configs(("test_files/test-data-configs/imu_sync.toml",))
+    config.render_config.stacking_direction = stacking_direction
+    renderer = video_renderer_from_csv_files(config)
+    if not use_raster:
+        # fall back to rendering the graphs with matplotlib
+        renderer._plot_background = None
+
+    images = renderer.video_provider.images()
+    frames = [next(images) for _ in range(20)]
+    image = renderer._create_target_image()
+    for ts, src_image in frames[:5]:
+        renderer._compose_frame(image, ts, src_image)
+
+    tracemalloc.start()
+    for ts, src_image in frames[5:]:
+        renderer._compose_frame(image, ts, src_image)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # only small python objects like array views may be allocated, never an image or a plot-sized temporary.
+    # matplotlib allocates a few more python objects when blitting
+    assert peak < (16 if use_raster else 128) * 1024
+
+
+def test_frame_spans(run_in_repo_root):
+    config = read_configs(("test_files/test-data-configs/imu_sync.toml",))
+    renderer = video_renderer_from_csv_files(config)
+    assert renderer._get_frame_spans() == [(0, None)]
+
+    # the video has 635 frames at 30 fps
+    config.render_config.time_ranges = [(1.0, 2.5), (20.0, 100.0)]
+    assert renderer._get_frame_spans() == [(30, 75), (600, None)]
+
+    config.render_config.process_count = 4
+    assert renderer._get_segments([(30, 75), (600, None)]) == [
+        (30, 52),
+        (52, 75),
+        (600, 617),
+        (617, None),
+    ]
+
+    config.render_config.time_ranges = [(100.0, 200.0)]
+    with pytest.raises(ValueError):
+        renderer._get_frame_spans()
+
+
+class _CountingWriter:
+    def __init__(self):
+        self.frame_count = 0
+
+    def write(self, image):
+        self.frame_count += 1
+
+    def release(self):
+        pass
+
+
+def _render_with_image_count(renderer, image_count: int) -> int:
+    """Render with a video provider that reports the given image count and return the number of written frames"""
+    writer = _CountingWriter()
+    renderer.video_provider.get_image_count = lambda: image_count
+    renderer._create_writer = lambda path: writer
+    renderer.render_video()
+    return writer.frame_count
+
+
+def test_render_until_video_ends(run_in_repo_root):
+    config = read_configs(("test_files/test-data-configs/imu_sync.toml",))
+    renderer = video_renderer_from_csv_files(config)
+    # OpenCV may under-report the frame count, but all 635 frames of the video are rendered
+    assert _render_with_image_count(renderer, 100) == 635
+
+
+def test_render_time_range_until_video_ends(run_in_repo_root):
+    config = read_configs(("test_files/test-data-configs/imu_sync.toml",))
+    config.render_config.time_ranges = [(20.0, 100.0)]
+    renderer = video_renderer_from_csv_files(config)
+    # the range reaches beyond the reported 610 frames, so it renders frames 600 to 634 of the video
+    assert _render_with_image_count(renderer, 610) == 35
@@ -0,0 +1,112 @@
+import os
+import shutil
+import stat
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from sevivi.config import FfmpegConfig, RenderConfig, VideoWriterBackend
+from sevivi.image_provider import Dimensions
+from sevivi.video_renderer.video_writer import (
+    FfmpegVideoWriter,
+    OpenCvVideoWriter,
+    create_video_writer,
+    get_ffmpeg_command,
+)
+
+
+def _write_frames(writer, count: int = 10):
+    for i in range(count):
+        writer.write(np.full((48, 64, 3), i * 20, dtype=np.uint8))
+    writer.release()
+
+
+def _frame_count(path: str) -> int:
+    capture = cv2.VideoCapture(path)
+    count = 0
+    while capture.read()[0]:
+        count += 1
+    return count
+
+
+def test_opencv_video_writer(tmp_path):
+    path = str(tmp_path / "out.avi")
+    _write_frames(OpenCvVideoWriter(path, "MJPG", 30, Dimensions(64, 48)))
+    assert _frame_count(path) == 10
+
+
+def test_get_ffmpeg_command():
+    config = FfmpegConfig(codec="libx265", crf=30, preset="fast", threads=4)
+    command = get_ffmpeg_command("out.mp4", 25, Dimensions(64, 48), config)
+    assert command[0] == "ffmpeg"
+    assert command[-1] == "out.mp4"
+    assert command[command.index("-s") + 1] == "64x48"
+
+    output_options = command[command.index("-i") :]
+    for option, value in [
+        ("-c:v", "libx265"),
+        ("-crf", "30"),
+        ("-preset", "fast"),
+        ("-threads", "4"),
+        ("-pix_fmt", "yuv420p"),
+    ]:
+        assert output_options[output_options.index(option) + 1] == value
+
+
+def test_ffmpeg_encoder_options():
+    output_options = get_ffmpeg_command(
+        "out.mp4", 25, Dimensions(64, 48), FfmpegConfig()
+    )
+    # the encoder defaults are used if preset and crf are not configured
+    assert "-preset" not in output_options and "-crf" not in output_options
+
+    config = FfmpegConfig(codec="libvpx-vp9", crf=30, preset="fast")
+    output_options = get_ffmpeg_command("out.webm", 25, Dimensions(64, 48), config)
+    assert "-preset" not in output_options and "-crf" not in output_options
+
+
+def test_missing_ffmpeg_executable(tmp_path):
+    config = FfmpegConfig(executable="not-an-ffmpeg-executable")
+    with pytest.raises(FileNotFoundError):
+        FfmpegVideoWriter(str(tmp_path / "out.mp4"), 30, Dimensions(64, 48), config)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_ffmpeg_video_writer(tmp_path):
+    path = str(tmp_path / "out.mp4")
+    render_config = RenderConfig(video_writer_backend=VideoWriterBackend.FFMPEG)
+    render_config.ffmpeg_config.preset = "ultrafast"
+    writer = create_video_writer(render_config, path, 30, Dimensions(64, 48))
+    assert isinstance(writer, FfmpegVideoWriter)
+    _write_frames(writer)
+    assert _frame_count(path) == 10
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_ffmpeg_video_writer_error(tmp_path):
+    config = FfmpegConfig(codec="not-a-codec")
+    writer = FfmpegVideoWriter(
+        str(tmp_path / "out.mp4"), 30, Dimensions(64, 48), config
+    )
+    with pytest.raises(RuntimeError):
+        _write_frames(writer, 100)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="the fake ffmpeg is a shell script")
+def test_ffmpeg_stderr_does_not_block_writing(tmp_path):
+    executable = tmp_path / "noisy_ffmpeg"
+    # far more errors than a pipe holds, before reading any frame
+    executable.write_text("#!/bin/sh\nhead -c 1000000 /dev/zero >&2\ncat > /dev/null\n")
+    executable.chmod(executable.stat().st_mode | stat.S_IEXEC)
+    writer = FfmpegVideoWriter(
+        str(tmp_path / "out.mp4"),
+        30,
+        Dimensions(64, 48),
+        FfmpegConfig(executable=str(executable)),
+    )
+    thread = threading.Thread(target=_write_frames, args=(writer, 200), daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+    assert not thread.is_alive()